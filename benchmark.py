@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the Toastmaster Timer App hot paths
+
+Measures record storage (JSON Lines and SQLite), timer screen rendering, tick scheduling,
+signal server fan-out and daemon command latency, and writes the results as JSON. With --compare, results are checked against a
+saved baseline and any metric that got slower than the threshold allows is
+reported as a regression (exit code 1).
+
+Usage:
+    python benchmark.py                              # all suites
+    python benchmark.py --suite records --sizes 1000,10000
+    python benchmark.py --suite fanout --subscribers 1000,5000
+    python benchmark.py --output baseline.json
+    python benchmark.py --compare baseline.json --threshold 0.25
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import selectors
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.clock import ScaledClock
+from src.display_manager import DisplayManager
+from src.record_manager import RecordManager
+from src.record_storage import JsonLinesStorage
+from src.signal_server import SignalServer
+from src.sqlite_store import SqliteRecordStorage
+from src.speech_types import SpeechType, TimerColor
+from src.terminal import NullTerminal
+from src.timer_daemon import DaemonClient, TimerDaemon
+from src.timer_engine import TimerEngine, TimerUpdate
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+SPEAKERS = [f"Speaker {n}" for n in range(200)]
+SPEECH_TYPES = list(SpeechType)
+
+
+def _timeit(func, repeat: int = 1) -> float:
+    """Best-of-N wall time of ``func()`` in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _synthetic_records(count: int):
+    """Yield ``count`` synthetic record dictionaries, one minute apart"""
+    base = datetime(2020, 1, 1)
+    for n in range(count):
+        duration = 60 + (n * 37) % 480
+        yield {
+            "timestamp": (base + timedelta(minutes=n)).isoformat(),
+            "speech_type": SPEECH_TYPES[n % len(SPEECH_TYPES)].value,
+            "speaker_name": SPEAKERS[n % len(SPEAKERS)],
+            "duration_seconds": duration,
+            "duration_formatted": f"{duration // 60:02d}:{duration % 60:02d}"
+        }
+
+
+def _populate(filename: str, count: int):
+    """Write ``count`` synthetic records straight to a JSON Lines file"""
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.writelines(JsonLinesStorage.encode(record) for record in _synthetic_records(count))
+
+
+def bench_records(args) -> dict:
+    """RecordManager add/read/filter cost at several archive sizes"""
+    results = {}
+    workdir = tempfile.mkdtemp(prefix="toastmaster-bench-")
+    try:
+        for size in args.sizes:
+            filename = os.path.join(workdir, f"records_{size}.json")
+            _populate(filename, size)
+
+            rm = RecordManager(filename)
+            adds = 50
+            elapsed = _timeit(lambda: [rm.add_record(SpeechType.TEST, "Bench", 60) for _ in range(adds)])
+            results[f"records.add_record.{size}"] = (elapsed / adds * 1e6, "us")
+
+            # Cold reads parse the file; warm reads hit the record cache
+            cold = RecordManager(filename)
+            results[f"records.get_all_records.cold.{size}"] = (_timeit(cold.get_all_records) * 1e3, "ms")
+            results[f"records.get_all_records.warm.{size}"] = (_timeit(cold.get_all_records, 5) * 1e3, "ms")
+
+            cold = RecordManager(filename)
+            speaker = SPEAKERS[7]
+            results[f"records.get_records_by_speaker.cold.{size}"] = (
+                _timeit(lambda: cold.get_records_by_speaker(speaker)) * 1e3, "ms")
+            results[f"records.get_records_by_speaker.warm.{size}"] = (
+                _timeit(lambda: cold.get_records_by_speaker(speaker), 5) * 1e3, "ms")
+            rm.close()
+            cold.close()
+            print(f"  records: {size:,} done")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def bench_sqlite(args) -> dict:
+    """SQLite backend insert and query cost as the table grows"""
+    results = {}
+    workdir = tempfile.mkdtemp(prefix="toastmaster-bench-")
+    try:
+        for size in args.sizes:
+            filename = os.path.join(workdir, f"records_{size}.db")
+            storage = SqliteRecordStorage(filename)
+            storage.ensure_exists()
+            storage.append_many(_synthetic_records(size))
+            storage.close()
+
+            # Inserts should cost the same at every table size
+            rm = RecordManager(filename, backend="sqlite")
+            adds = 50
+            elapsed = _timeit(lambda: [rm.add_record(SpeechType.TEST, "Bench", 60) for _ in range(adds)])
+            results[f"sqlite.add_record.{size}"] = (elapsed / adds * 1e6, "us")
+            batch = [(SpeechType.TEST, "Bench", 60)] * 1000
+            results[f"sqlite.add_records.1000.{size}"] = (_timeit(lambda: rm.add_records(batch)) * 1e3, "ms")
+
+            speaker = SPEAKERS[7]
+            results[f"sqlite.get_records_by_speaker.{size}"] = (
+                _timeit(lambda: rm.get_records_by_speaker(speaker), 3) * 1e3, "ms")
+            day = datetime(2020, 1, 2)
+            results[f"sqlite.get_records_between.1day.{size}"] = (
+                _timeit(lambda: rm.get_records_between(day, day + timedelta(days=1)), 3) * 1e3, "ms")
+            results[f"sqlite.get_records_count.{size}"] = (_timeit(rm.get_records_count, 3) * 1e3, "ms")
+            rm.close()
+            print(f"  sqlite: {size:,} done")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def bench_render(args) -> dict:
+    """DisplayManager.show_timer_info cost with output discarded"""
+    DisplayManager.set_terminal(NullTerminal())
+    frames = args.frames
+    colors = [TimerColor.BLANK, TimerColor.GREEN, TimerColor.YELLOW, TimerColor.RED]
+
+    def diffed():
+        for n in range(frames):
+            DisplayManager.show_timer_info(SpeechType.PREPARED, n % 480, TimerColor.GREEN)
+
+    def full():
+        for n in range(frames):
+            DisplayManager.clear_screen()
+            DisplayManager.show_timer_info(SpeechType.PREPARED, n % 480, colors[n % 4])
+
+    return {
+        "render.show_timer_info.diff": (_timeit(diffed, 3) / frames * 1e6, "us"),
+        "render.show_timer_info.full": (_timeit(full, 3) / frames * 1e6, "us"),
+    }
+
+
+def bench_ticks(args) -> dict:
+    """TimerEngine tick jitter over a simulated hour on a sped-up clock"""
+    DisplayManager.set_terminal(NullTerminal())
+    clock = ScaledClock(args.speed)
+    engine = TimerEngine(clock=clock)
+    engine.run_for(SpeechType.PREPARED, args.ticks_seconds)
+    stats = engine.tick_stats
+    # Lateness is measured in clock time; convert back to real milliseconds
+    return {
+        "ticks.count": (stats.ticks, "ticks"),
+        "ticks.jitter.mean": (stats.total / max(1, stats.ticks) / args.speed * 1e3, "ms"),
+        "ticks.jitter.max": (stats.max / args.speed * 1e3, "ms"),
+    }
+
+
+def _raise_file_limit(needed: int):
+    """Allow enough open sockets for both ends of every subscriber (POSIX only)"""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        limit = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (limit, hard))
+
+
+def _percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def bench_fanout(args) -> dict:
+    """SignalServer propagation delay from publish() to every loopback subscriber"""
+    results = {}
+    for count in args.subscribers:
+        _raise_file_limit(2 * count + 256)
+        server = SignalServer("127.0.0.1", 0)
+        port = server.start()
+        selector = selectors.DefaultSelector()
+        sockets = []
+        try:
+            for _ in range(count):
+                sock = socket.create_connection(("127.0.0.1", port))
+                sock.sendall(b"SUBSCRIBE\n")
+                sock.setblocking(False)
+                selector.register(sock, selectors.EVENT_READ)
+                sockets.append(sock)
+            while server.subscriber_count < count:
+                time.sleep(0.01)
+
+            delays, slowest = [], []
+            for n in range(args.fanout_frames):
+                update = TimerUpdate("tick", SpeechType.PREPARED, n, TimerColor.GREEN)
+                pending = count
+                started = time.perf_counter()
+                server.publish(update)
+                while pending:
+                    ready = selector.select(5.0)
+                    if not ready:
+                        raise RuntimeError(f"{pending} of {count} subscribers never received frame {n}")
+                    for key, _ in ready:
+                        data = key.fileobj.recv(65536)
+                        delays.append(time.perf_counter() - started)
+                        # Keep-alives are bare newlines; frames end with "}\n"
+                        pending -= data.count(b"}\n")
+                slowest.append(delays[-1])
+                time.sleep(0.02)
+        finally:
+            selector.close()
+            for sock in sockets:
+                sock.close()
+            server.stop()
+        results[f"fanout.delay.p50.{count}"] = (_percentile(delays, 0.50) * 1e3, "ms")
+        results[f"fanout.delay.p99.{count}"] = (_percentile(delays, 0.99) * 1e3, "ms")
+        results[f"fanout.delay.last_subscriber.{count}"] = (sum(slowest) / len(slowest) * 1e3, "ms")
+        print(f"  fanout: {count:,} subscribers done")
+    return results
+
+
+def bench_daemon(args) -> dict:
+    """TimerDaemon command round trips over its Unix socket"""
+    if not hasattr(socket, 'AF_UNIX'):
+        print("  daemon: skipped (no Unix domain sockets)")
+        return {}
+    workdir = tempfile.mkdtemp(prefix="toastmaster-bench-")
+    socket_path = os.path.join(workdir, "timer.sock")
+    filename = os.path.join(workdir, "records.json")
+    _populate(filename, 10000)
+    daemon = TimerDaemon(socket_path, RecordManager(filename))
+    ready = threading.Event()
+    thread = threading.Thread(target=lambda: asyncio.run(daemon.serve(ready.set)), daemon=True)
+    thread.start()
+    ready.wait()
+    rounds = 500
+    try:
+        with DaemonClient(socket_path) as client:
+            def start_stop():
+                client.request("start", type="prepared")
+                client.request("stop")
+
+            client.request("records", limit=20)  # Warm the record cache
+            results = {
+                "daemon.status": (_timeit(lambda: [client.request("status") for _ in range(rounds)], 3)
+                                  / rounds * 1e6, "us"),
+                "daemon.start_stop": (_timeit(lambda: [start_stop() for _ in range(rounds // 5)], 3)
+                                      / (rounds // 5) * 1e6, "us"),
+                "daemon.records.20": (_timeit(lambda: client.request("records", limit=20), 3) * 1e3, "ms"),
+            }
+            client.request("shutdown")
+        thread.join()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def bench_summary(args) -> dict:
+    """Record counts and statistics from the persisted summary versus a full scan"""
+    results = {}
+    workdir = tempfile.mkdtemp(prefix="toastmaster-bench-")
+    try:
+        for size in args.sizes:
+            filename = os.path.join(workdir, f"records_{size}.json")
+            _populate(filename, size)
+
+            scan = RecordManager(filename)
+            results[f"summary.scan_count.{size}"] = (_timeit(lambda: len(scan.get_record_batch())) * 1e3, "ms")
+            scan.close()
+
+            rm = RecordManager(filename)
+            results[f"summary.build.{size}"] = (_timeit(rm.get_records_count) * 1e3, "ms")
+            rm.close()
+
+            rm = RecordManager(filename)
+            results[f"summary.count.reopened.{size}"] = (_timeit(rm.get_records_count) * 1e3, "ms")
+            adds = 50
+            elapsed = _timeit(lambda: [rm.add_record(SpeechType.TEST, "Bench", 60) for _ in range(adds)])
+            results[f"summary.add_record.{size}"] = (elapsed / adds * 1e6, "us")
+            results[f"summary.get_summary.{size}"] = (_timeit(rm.get_summary, 5) * 1e3, "ms")
+            rm.close()
+            print(f"  summary: {size:,} done")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+SUITES = {
+    "records": bench_records,
+    "summary": bench_summary,
+    "sqlite": bench_sqlite,
+    "render": bench_render,
+    "ticks": bench_ticks,
+    "fanout": bench_fanout,
+    "daemon": bench_daemon,
+}
+
+# Metrics where a larger number is not a regression
+NOT_TIMINGS = {"ticks.count"}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """List metrics that are slower than the baseline by more than ``threshold``"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None or name in NOT_TIMINGS or previous["value"] <= 0:
+            continue
+        change = current["value"] / previous["value"] - 1
+        if change > threshold:
+            regressions.append(f"{name}: {previous['value']:.3f} -> {current['value']:.3f} "
+                               f"{current['unit']} (+{change:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Toastmaster Timer App hot paths")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES),
+                        help="suite to run (repeatable; default: all)")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="record archive sizes, comma separated")
+    parser.add_argument("--frames", type=int, default=2000, help="frames per render measurement")
+    parser.add_argument("--speed", type=float, default=200.0, help="clock speed-up for the tick suite")
+    parser.add_argument("--ticks-seconds", type=float, default=3600.0, help="simulated seconds for the tick suite")
+    parser.add_argument("--subscribers", default="100,1000,5000",
+                        help="signal server subscriber counts for the fanout suite, comma separated")
+    parser.add_argument("--fanout-frames", type=int, default=50, help="frames published per fanout measurement")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write JSON results")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before flagging a regression (0.25 = 25%%)")
+    args = parser.parse_args()
+    args.sizes = [int(size) for size in args.sizes.split(",") if size]
+    args.subscribers = [int(count) for count in args.subscribers.split(",") if count]
+
+    results = {}
+    for name in args.suite or list(SUITES):
+        print(f"Running {name} benchmarks...")
+        for metric, (value, unit) in SUITES[name](args).items():
+            results[metric] = {"value": value, "unit": unit}
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n{'Metric':<52} {'Value':>14}")
+    print("-" * 68)
+    for name, result in results.items():
+        print(f"{name:<52} {result['value']:>11.3f} {result['unit']}")
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.compare}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\n✅ No regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,26 +6,43 @@ by changing terminal background colors (green, yellow, red) at specified interva
 """
 
 import time
-from typing import Dict
+_IMPORTS_STARTED = time.perf_counter()
+
+import argparse
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, Optional
 from src.speech_types import SpeechType, SpeechConfig, TimerColor
 from src.timer_engine import TimerController
-from src.record_manager import RecordManager
+from src.timing_schedule import get_schedule
+from src.record_manager import RecordManager, BACKENDS, DEFAULT_FILES
 from src.display_manager import DisplayManager
+from src.metrics import metrics
+
+_IMPORTS_DONE = time.perf_counter()
 
 
 class ToastmasterTimerApp:
     """Main application class that coordinates all components"""
     
-    def __init__(self):
+    def __init__(self, records_file: Optional[str] = None, records_backend: str = "jsonl"):
         self.timer_controller = TimerController()
-        self.record_manager = RecordManager()
-        self.speech_type_map = {
-            '1': SpeechType.ICE_BREAKER,
-            '2': SpeechType.PREPARED,
-            '3': SpeechType.EVALUATION,
-            '4': SpeechType.TABLE_TOPIC,
-            '5': SpeechType.TEST
-        }
+        self._timer_registry = None
+        self.record_manager = RecordManager(records_file, backend=records_backend)
+    
+    @property
+    def timer_registry(self):
+        """Contest room timers, created (and their module loaded) on first use"""
+        if self._timer_registry is None:
+            from src.timer_registry import TimerRegistry
+            self._timer_registry = TimerRegistry()
+        return self._timer_registry
+    
+    @property
+    def speech_type_map(self) -> Dict[str, SpeechType]:
+        """Menu numbers for the current speech types; follows edits to the definitions file"""
+        from src.speech_registry import get_registry
+        return get_registry().menu()
     
     def run(self):
         """Main application loop"""
@@ -35,7 +52,8 @@ class ToastmasterTimerApp:
         
         while True:
             try:
-                self._show_menu_and_handle_choice()
+                if not self._show_menu_and_handle_choice():
+                    break
                     
             except KeyboardInterrupt:
                 self._handle_keyboard_interrupt()
@@ -46,16 +64,22 @@ class ToastmasterTimerApp:
     
     def _show_menu_and_handle_choice(self):
         """Show menu and handle user choice"""
-        # Ensure colors are always reset before showing menu
-        DisplayManager.set_background_color(TimerColor.BLANK)
-        DisplayManager.show_main_menu()
-        choice = input("\nEnter your choice (1-7): ").strip()
+        # One snapshot, so a reload can't renumber the menu under the user
+        speech_type_map = self.speech_type_map
+        actions = len(speech_type_map)
+        # show_main_menu resets the colors before drawing
+        DisplayManager.show_main_menu(list(speech_type_map.values()))
+        choice = input(f"\nEnter your choice (1-{actions + 4}): ").strip()
         
-        if choice in self.speech_type_map:
-            self._handle_speech_selection(choice)
-        elif choice == '6':
+        if choice in speech_type_map:
+            self._handle_speech_selection(speech_type_map[choice])
+        elif choice == str(actions + 1):
             self._handle_view_records()
-        elif choice == '7':
+        elif choice == str(actions + 2):
+            self._handle_statistics()
+        elif choice == str(actions + 3):
+            self._handle_contest_mode()
+        elif choice == str(actions + 4):
             self._handle_exit()
             return False
         else:
@@ -63,9 +87,8 @@ class ToastmasterTimerApp:
         
         return True
     
-    def _handle_speech_selection(self, choice: str):
+    def _handle_speech_selection(self, speech_type: SpeechType):
         """Handle speech type selection and timer execution"""
-        speech_type = self.speech_type_map[choice]
         config = SpeechConfig.get_config(speech_type)
         
         print(f"\nSelected: {config['name']} ({config['duration_range']})")
@@ -110,8 +133,111 @@ class ToastmasterTimerApp:
         input("\nPress Enter to continue...")
     
     def _handle_view_records(self):
-        """Handle viewing speech records"""
-        self.record_manager.display_records()
+        """Page through speech records with filters and sorting"""
+        from src.records_viewer import RecordPager
+        pager = RecordPager(self.record_manager)
+        page = pager.first_page()
+        sort_modes = [("date", True), ("date", False), ("duration", True), ("duration", False)]
+        hint = "[n]ext  [p]revious  [f]ilter  [s]ort  [q]uit"
+        
+        while True:
+            DisplayManager.show_records_page(page, pager.record_filter.describe(), pager.describe_sort(), hint)
+            command = input("\nrecords> ").strip().lower()
+            
+            if command in ('q', 'quit', 'back'):
+                return
+            elif command in ('n', ''):
+                page = pager.next_page()
+            elif command == 'p':
+                page = pager.previous_page()
+            elif command == 'f':
+                record_filter = self._prompt_record_filter()
+                if record_filter is not None:
+                    page = pager.set_filter(record_filter)
+            elif command == 's':
+                mode = sort_modes.index((pager.sort, pager.descending))
+                page = pager.set_sort(*sort_modes[(mode + 1) % len(sort_modes)])
+            else:
+                DisplayManager.show_invalid_choice()
+                time.sleep(1)
+    
+    def _handle_statistics(self):
+        """Show duration statistics from the persisted records summary"""
+        DisplayManager.show_statistics(self.record_manager.get_summary())
+        input("\nPress Enter to continue...")
+    
+    def _prompt_record_filter(self):
+        """Ask for speaker, speech type and date range; blank answers match everything"""
+        from src.records_viewer import RecordFilter
+        speaker = input("Speaker (blank for all): ").strip() or None
+        speech_type_map = self.speech_type_map
+        choice = input(f"Speech type 1-{len(speech_type_map)} (blank for all): ").strip()
+        speech_type = speech_type_map[choice].value if choice in speech_type_map else None
+        try:
+            start = input("From date YYYY-MM-DD (blank for any): ").strip()
+            end = input("To date YYYY-MM-DD, inclusive (blank for any): ").strip()
+            start = datetime.strptime(start, "%Y-%m-%d") if start else None
+            end = datetime.strptime(end, "%Y-%m-%d") + timedelta(days=1) if end else None
+        except ValueError:
+            DisplayManager.show_error_message("Dates must look like 2024-05-31")
+            time.sleep(1)
+            return None
+        return RecordFilter(speaker, speech_type, start, end)
+    
+    def _handle_contest_mode(self):
+        """Run several named room timers at once and manage them from a command prompt"""
+        commands = f"add <room> | start <room> <1-{len(self.speech_type_map)}> | stop <room> | remove <room> | watch | back"
+        
+        while True:
+            DisplayManager.clear_screen()
+            DisplayManager.show_dashboard(self.timer_registry.get_all_status(), commands)
+            parts = input("\ncontest> ").strip().split()
+            if not parts:
+                continue
+            command, args = parts[0].lower(), parts[1:]
+            
+            if command == 'back':
+                return
+            elif command == 'add' and len(args) == 1:
+                self.timer_registry.add_timer(args[0])
+            elif command == 'start' and len(args) == 2 and args[1] in self.speech_type_map:
+                self.timer_registry.start(args[0], self.speech_type_map[args[1]])
+            elif command == 'stop' and len(args) == 1 and self.timer_registry.is_running(args[0]):
+                self._handle_room_stop(args[0])
+            elif command == 'remove' and len(args) == 1:
+                self.timer_registry.remove_timer(args[0])
+            elif command == 'watch':
+                self._watch_dashboard()
+            else:
+                DisplayManager.show_invalid_choice()
+                time.sleep(1)
+    
+    def _watch_dashboard(self):
+        """Refresh the contest dashboard every second until Ctrl+C"""
+        DisplayManager.clear_screen()
+        try:
+            while True:
+                DisplayManager.show_dashboard(
+                    self.timer_registry.get_all_status(),
+                    "Press Ctrl+C to return to the command prompt"
+                )
+                time.sleep(1 - time.monotonic() % 1)
+        except KeyboardInterrupt:
+            pass
+    
+    def _handle_room_stop(self, room: str):
+        """Stop a room's timer and record the speech"""
+        speech_type = self.timer_registry.get_status(room)['speech_type']
+        elapsed = self.timer_registry.stop(room)
+        config = SpeechConfig.get_config(speech_type)
+        print(f"\n{room}: timer stopped at {elapsed // 60:02d}:{elapsed % 60:02d}")
+        speaker_name = input("Enter speaker name: ").strip()
+        
+        if speaker_name:
+            record = self.record_manager.add_record(speech_type, speaker_name, elapsed)
+            DisplayManager.show_speech_recorded(speaker_name, config['name'], record.duration_formatted)
+        else:
+            print("No speaker name provided. Speech not recorded.")
         input("\nPress Enter to continue...")
     
     def _handle_exit(self):
@@ -133,18 +259,229 @@ class ToastmasterTimerApp:
         print("\n\nExiting application...")
     
     def get_app_statistics(self) -> Dict:
-        """Get application statistics"""
+        """Get application statistics (record figures come from the summary, not a scan)"""
+        summary = self.record_manager.get_summary()
+        totals = summary.totals()
         return {
-            "total_records": self.record_manager.get_records_count(),
+            "total_records": summary.records,
+            "speakers": len(summary.speakers),
+            "average_duration": round(totals.mean, 1),
+            "records_by_type": {speech_type: stats.count for speech_type, stats in summary.by_type().items()},
             "timer_running": self.timer_controller.is_timer_running(),
-            "available_speech_types": len(SpeechConfig.get_all_configs())
+            "contest_rooms": len(self.timer_registry.names()),
+            "available_speech_types": len(SpeechConfig.get_all_configs()),
+            "metrics": metrics.snapshot() if metrics.enabled else None
         }
 
 
+def open_records(record_manager: RecordManager):
+    """Open the records store up front and exit if it cannot be opened, rather than lose every save"""
+    try:
+        record_manager.open()
+    except Exception as e:
+        print(f"Error: Could not open {record_manager.backend} records {record_manager.filename} - {e}")
+        sys.exit(1)
+
+
+def run_summary_check(args, repair: bool):
+    """Verify (and with ``repair`` rebuild) the records summary against the raw records"""
+    record_manager = RecordManager(args.records_file, backend=args.records_backend)
+    open_records(record_manager)
+    try:
+        differences = record_manager.rebuild_summary(repair)
+    except (OSError, ValueError) as e:
+        DisplayManager.show_error_message(str(e))
+        sys.exit(1)
+    finally:
+        record_manager.close()
+    if not differences:
+        print(f"Summary of {args.records_file} matches its records")
+        return
+    print(f"Summary of {args.records_file} did not match its records:")
+    for difference in differences:
+        print(f"  {difference}")
+    if repair:
+        print(f"Rebuilt {record_manager.summary_filename}")
+    else:
+        sys.exit(1)
+
+
+def run_transfer(args):
+    """Run the bulk import/export command line options with console progress"""
+    from src.record_io import format_progress
+    record_manager = RecordManager(args.records_file, backend=args.records_backend)
+    open_records(record_manager)
+    progress = lambda stats: print(f"\r  {format_progress(stats)}", end="", flush=True)
+    try:
+        if args.import_records:
+            print(f"Importing {args.import_records} into {args.records_file}...")
+            stats = record_manager.import_records(args.import_records, progress=progress)
+            print(f"\r  {format_progress(stats)}")
+        if args.export_records:
+            print(f"Exporting {args.records_file} to {args.export_records}...")
+            stats = record_manager.export_records(args.export_records, progress=progress)
+            print(f"\r  {stats.written:,} records written ({stats.bytes_total:,} bytes)")
+    except (OSError, ValueError) as e:
+        DisplayManager.show_error_message(str(e))
+    finally:
+        record_manager.close()
+
+
+def run_daemon(args):
+    """Run the headless timer daemon until it is told to shut down"""
+    # asyncio takes longer to import than the rest of the app; only load it when needed
+    from src.timer_daemon import TimerDaemon
+    # Remote screens need a tick every second even though nothing is drawn here
+    record_manager = RecordManager(args.records_file, backend=args.records_backend)
+    open_records(record_manager)
+    daemon = TimerDaemon(args.socket, record_manager, TimerController(headless=True, ticks=bool(args.signal_server)))
+    signal_server = None
+    if args.signal_server:
+        signal_server = start_signal_server(daemon, args.signal_server)
+        if signal_server is None:
+            return
+    try:
+        daemon.run()
+    except OSError as e:
+        DisplayManager.show_error_message(str(e))
+    finally:
+        if signal_server is not None:
+            signal_server.stop()
+
+
+def start_signal_server(app, address: str):
+    """Serve an app's (or daemon's) timer and contest rooms to remote screens; None if it cannot start"""
+    from src.signal_server import SignalServer, parse_address
+    try:
+        host, port = parse_address(address)
+        server = SignalServer(host, port)
+        server.attach(app.timer_controller)
+        if hasattr(app, 'timer_registry'):
+            server.attach_registry(app.timer_registry)
+        server.start()
+    except (OSError, ValueError) as e:
+        DisplayManager.show_error_message(f"Cannot start signal server: {e}")
+        return None
+    if host in ("127.0.0.1", "localhost", "::1"):
+        print(f"Signal server listening on {host}:{server.port} (this machine only; "
+              f"use --signal-server 0.0.0.0:{server.port} to serve other machines)")
+    else:
+        print(f"Signal server listening on {host}:{server.port} "
+              f"(open http://<this machine>:{server.port}/ on the speaker's screen)")
+    return server
+
+
+def profile_startup(args):
+    """Time each start-up step up to the first menu, then print the report and exit"""
+    timings = [("import main.py modules", _IMPORTS_DONE - _IMPORTS_STARTED)]
+
+    def step(name, func):
+        started = time.perf_counter()
+        result = func()
+        timings.append((name, time.perf_counter() - started))
+        return result
+
+    app = step("create ToastmasterTimerApp", lambda: ToastmasterTimerApp(args.records_file, args.records_backend))
+    step("create terminal backend", DisplayManager.get_terminal)
+    step("first menu (reset colors, clear, draw)", DisplayManager.show_main_menu)
+    to_menu = time.perf_counter() - _IMPORTS_STARTED
+    modules_at_menu = len(sys.modules)
+    # Deferred until first used, so not part of start-up
+    step("first records access (deferred)", app.record_manager.get_records_count)
+    step("first timer schedule (deferred)", lambda: get_schedule(SpeechType.PREPARED))
+    app.record_manager.close()
+
+    print(f"\n{'Start-up step':<44} {'ms':>9}")
+    print("-" * 54)
+    for name, seconds in timings:
+        print(f"{name:<44} {seconds * 1e3:>9.2f}")
+    print("-" * 54)
+    print(f"{'main.py imports to first menu':<44} {to_menu * 1e3:>9.2f}")
+    print(f"\nModules loaded at first menu: {modules_at_menu}")
+    print("Interpreter start-up is not included; for a per-module breakdown run")
+    print("  python -X importtime main.py --profile-startup")
+
+
 def main():
     """Main entry point"""
-    app = ToastmasterTimerApp()
-    app.run()
+    parser = argparse.ArgumentParser(description="Toastmaster Timer App")
+    parser.add_argument("--metrics-file", help="collect hot-path metrics and write them "
+                                               "to this Prometheus text file on exit")
+    parser.add_argument("--records-file",
+                        help="records file, or directory for the binary backend (default: speech_records.json, "
+                             "speech_records.tmr for binary, speech_records.db for sqlite)")
+    parser.add_argument("--records-backend", choices=BACKENDS, default="jsonl",
+                        help="record storage format (default: jsonl)")
+    parser.add_argument("--import-records", metavar="FILE",
+                        help="bulk import a .csv or .jsonl file (optionally .gz), skipping duplicates, and exit")
+    parser.add_argument("--export-records", metavar="FILE",
+                        help="export all records to a .csv or .jsonl file (optionally .gz) and exit")
+    parser.add_argument("--signal-server", metavar="[HOST:]PORT",
+                        help="publish timer signals to remote screens (browser or "
+                             "'python -m src.signal_server watch') on this address; "
+                             "a bare PORT listens on 127.0.0.1 only, use 0.0.0.0:PORT for the network")
+    parser.add_argument("--daemon", action="store_true",
+                        help="run headless, taking commands on a Unix socket "
+                             "(see 'python -m src.timer_daemon --help')")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="report how long each start-up step takes up to the first menu, then exit")
+    parser.add_argument("--socket", help="control socket for --daemon (default: per-user file in the temp directory)")
+    parser.add_argument("--verify-summary", action="store_true",
+                        help="check the records summary against the records and exit (status 1 if it differs)")
+    parser.add_argument("--rebuild-summary", action="store_true",
+                        help="rebuild the records summary from the records, reporting any differences, and exit")
+    parser.add_argument("--speech-types", metavar="FILE",
+                        help="load speech types from this .toml or .json file, reloading it when it changes "
+                             "(default: speech_types.toml or speech_types.json if present)")
+    args = parser.parse_args()
+    args.records_file = args.records_file or DEFAULT_FILES[args.records_backend]
+    
+    if args.speech_types:
+        from src.speech_registry import load_registry, set_definitions_file
+        # Refuse a broken file up front; later edits that fail keep the last good definitions
+        try:
+            load_registry(args.speech_types)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not load speech types - {e}")
+            sys.exit(1)
+        set_definitions_file(args.speech_types)
+    if args.profile_startup:
+        profile_startup(args)
+        return
+    if args.verify_summary or args.rebuild_summary:
+        run_summary_check(args, repair=args.rebuild_summary)
+        return
+    if args.import_records or args.export_records:
+        run_transfer(args)
+        return
+    
+    if args.metrics_file:
+        metrics.enable()
+    if args.daemon:
+        try:
+            run_daemon(args)
+        finally:
+            if args.metrics_file:
+                metrics.write_prometheus(args.metrics_file)
+        return
+    signal_server = None
+    app = None
+    try:
+        app = ToastmasterTimerApp(args.records_file, args.records_backend)
+        open_records(app.record_manager)
+        if args.signal_server:
+            signal_server = start_signal_server(app, args.signal_server)
+            if signal_server is None:
+                return
+        app.run()
+    finally:
+        if signal_server is not None:
+            signal_server.stop()
+        if app is not None:
+            # Checkpoints the records and saves the summary
+            app.record_manager.close()
+        if args.metrics_file:
+            metrics.write_prometheus(args.metrics_file)
 
 
 if __name__ == "__main__":
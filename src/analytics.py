@@ -0,0 +1,377 @@
+"""
+Speech archive analytics for the Toastmaster Timer App
+"""
+
+from array import array
+from bisect import bisect_right
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from .record_batch import RecordBatch, MISSING_TIMESTAMP
+from .speech_registry import get_definition, get_registry
+from .timing_schedule import TimingEventType
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the array kernel covers everything
+    np = None
+
+# Outcome codes, indexing OUTCOMES
+UNDER_MINIMUM, GREEN, YELLOW, RED, OVER_GRACE, UNCLASSIFIED = range(6)
+OUTCOMES = ("under_minimum", "green", "yellow", "red", "over_grace", "unclassified")
+QUALIFIED = (GREEN, YELLOW, RED)
+
+DEFAULT_PERCENTILES = (10, 25, 75, 90)
+WINDOWS = ("day", "week", "month", "year")
+
+_MICROS_PER_DAY = 86400 * 1000000
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_COLOR_OUTCOMES = {
+    TimingEventType.GREEN: GREEN,
+    TimingEventType.YELLOW: YELLOW,
+    TimingEventType.RED: RED,
+}
+
+
+class DurationStats(NamedTuple):
+    """Duration distribution and signal outcomes for a group of speeches"""
+    count: int
+    mean: float
+    median: float
+    minimum: int
+    maximum: int
+    percentiles: Dict[int, float]
+    outcomes: Dict[str, float]
+    qualification_rate: float
+
+
+def outcome_bounds(speech_type: str) -> Optional[Tuple[Tuple[int, ...], Tuple[int, ...]]]:
+    """Duration thresholds and the outcome code each interval maps to.
+
+    A duration ``d`` has outcome ``codes[bisect_right(bounds, d)]``: below
+    the first signal it is under the minimum, then green, yellow and red
+    as on the timer, and more than the grace period past red it is over
+    grace. Returns None for speech types without a configuration.
+    """
+    definition = get_definition(speech_type)
+    if definition is None:
+        return None
+    schedule = definition.schedule
+    bounds, codes = [], [UNDER_MINIMUM]
+    for event in schedule.events:
+        outcome = _COLOR_OUTCOMES.get(event.event_type)
+        if outcome is not None:
+            bounds.append(event.at)
+            codes.append(outcome)
+    if not bounds:
+        return None
+    if schedule.grace_period > 0:
+        # Finishing exactly at the end of the grace period still qualifies
+        bounds.append(schedule.grace_end_time + 1)
+        codes.append(OVER_GRACE)
+    return tuple(bounds), tuple(codes)
+
+
+def percentile(sorted_values: Sequence, q: float) -> float:
+    """Linearly interpolated percentile of already sorted values (NumPy's default method)"""
+    if not len(sorted_values):
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return float(sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low))
+
+
+def _stats(sorted_durations: Sequence, total: float, outcome_counts: Sequence[int],
+           percentiles: Sequence[int]) -> DurationStats:
+    count = len(sorted_durations)
+    classified = count - outcome_counts[UNCLASSIFIED]
+    return DurationStats(
+        count=count,
+        mean=total / count,
+        median=percentile(sorted_durations, 50),
+        minimum=int(sorted_durations[0]),
+        maximum=int(sorted_durations[-1]),
+        percentiles={q: percentile(sorted_durations, q) for q in percentiles},
+        outcomes={name: int(outcome_counts[code]) / count for code, name in enumerate(OUTCOMES)},
+        qualification_rate=(sum(int(outcome_counts[code]) for code in QUALIFIED) / classified
+                            if classified else 0.0),
+    )
+
+
+class ArrayKernel:
+    """Pure-stdlib kernel working on ``array`` columns"""
+
+    name = "array"
+
+    def columns(self, batch: RecordBatch):
+        """Duration, type id, speaker id and timestamp columns"""
+        return batch.durations, batch.type_ids, batch.speaker_ids, batch.timestamps
+
+    def classify(self, durations, type_ids, bounds: List) -> array:
+        """Outcome code of every duration, in one pass"""
+        codes = array('B')
+        for duration, type_id in zip(durations, type_ids):
+            entry = bounds[type_id]
+            codes.append(UNCLASSIFIED if entry is None else entry[1][bisect_right(entry[0], duration)])
+        return codes
+
+    def concat(self, first, second):
+        return first + second
+
+    def zeros(self, length: int) -> array:
+        return array('l', bytes(length * array('l').itemsize))
+
+    def remap(self, ids, mapping: Sequence[int]) -> array:
+        return array('l', [mapping[value] for value in ids])
+
+    def lookup(self, values, mapping: Dict[int, int]) -> array:
+        """Map each value through a dict, -1 where it is absent"""
+        return array('l', [mapping.get(value, -1) for value in values])
+
+    def unique(self, values) -> List[int]:
+        return sorted(set(values))
+
+    def bincount(self, values, length: int) -> List[int]:
+        counts = [0] * length
+        for value in values:
+            counts[value] += 1
+        return counts
+
+    def combine(self, major, minor, minor_count: int) -> array:
+        return array('l', [a * minor_count + b for a, b in zip(major, minor)])
+
+    def days(self, timestamps):
+        """Day number of each timestamp, or -1 where it is missing"""
+        return array('l', [-1 if micros == MISSING_TIMESTAMP else micros // _MICROS_PER_DAY
+                           for micros in timestamps])
+
+    def summarize(self, durations, codes, group_ids, group_count: int,
+                  percentiles: Sequence[int]) -> List[Optional[DurationStats]]:
+        """Statistics for every group id in ``range(group_count)``"""
+        values = [array('l') for _ in range(group_count)]
+        outcome_counts = [[0] * len(OUTCOMES) for _ in range(group_count)]
+        for duration, code, group in zip(durations, codes, group_ids):
+            if group >= 0:
+                values[group].append(duration)
+                outcome_counts[group][code] += 1
+        results = []
+        for group_values, counts in zip(values, outcome_counts):
+            if not group_values:
+                results.append(None)
+                continue
+            results.append(_stats(sorted(group_values), sum(group_values), counts, percentiles))
+        return results
+
+
+class NumpyKernel:
+    """Kernel doing the per-record work as NumPy array operations"""
+
+    name = "numpy"
+
+    def columns(self, batch: RecordBatch):
+        # Zero-copy views over the batch's arrays
+        return (np.frombuffer(batch.durations, dtype=np.dtype(batch.durations.typecode)),
+                np.frombuffer(batch.type_ids, dtype=np.uint32),
+                np.frombuffer(batch.speaker_ids, dtype=np.uint32),
+                np.frombuffer(batch.timestamps, dtype=np.int64))
+
+    def classify(self, durations, type_ids, bounds: List):
+        codes = np.full(len(durations), UNCLASSIFIED, dtype=np.uint8)
+        for type_id, entry in enumerate(bounds):
+            if entry is None:
+                continue
+            mask = type_ids == type_id
+            if mask.any():
+                positions = np.searchsorted(np.asarray(entry[0]), durations[mask], side='right')
+                codes[mask] = np.asarray(entry[1], dtype=np.uint8)[positions]
+        return codes
+
+    def concat(self, first, second):
+        return np.concatenate((first, second))
+
+    def zeros(self, length: int):
+        return np.zeros(length, dtype=np.int64)
+
+    def remap(self, ids, mapping: Sequence[int]):
+        return np.asarray(mapping, dtype=np.int64)[ids]
+
+    def lookup(self, values, mapping: Dict[int, int]):
+        unique, inverse = np.unique(values, return_inverse=True)
+        return np.asarray([mapping.get(int(value), -1) for value in unique], dtype=np.int64)[inverse]
+
+    def unique(self, values) -> List[int]:
+        return np.unique(values).tolist()
+
+    def bincount(self, values, length: int) -> List[int]:
+        return np.bincount(values, minlength=length).tolist()
+
+    def combine(self, major, minor, minor_count: int):
+        return major.astype(np.int64) * minor_count + minor
+
+    def days(self, timestamps):
+        return np.where(timestamps == MISSING_TIMESTAMP, -1, timestamps // _MICROS_PER_DAY)
+
+    def summarize(self, durations, codes, group_ids, group_count: int,
+                  percentiles: Sequence[int]) -> List[Optional[DurationStats]]:
+        keep = group_ids >= 0
+        durations, codes, group_ids = durations[keep], codes[keep], group_ids[keep]
+        order = np.lexsort((durations, group_ids))
+        sorted_durations = durations[order]
+        starts = np.searchsorted(group_ids[order], np.arange(group_count + 1))
+        totals = np.bincount(group_ids, weights=durations, minlength=group_count)
+        outcome_counts = np.bincount(group_ids * len(OUTCOMES) + codes,
+                                     minlength=group_count * len(OUTCOMES)).reshape(group_count, len(OUTCOMES))
+        results = []
+        for group in range(group_count):
+            start, end = starts[group], starts[group + 1]
+            if start == end:
+                results.append(None)
+                continue
+            results.append(_stats(sorted_durations[start:end], float(totals[group]),
+                                  outcome_counts[group], percentiles))
+        return results
+
+
+def get_kernel(use_numpy: Optional[bool] = None):
+    """NumPy kernel if requested (or available when ``use_numpy`` is None), else the array kernel"""
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy and np is None:
+        raise ImportError("NumPy is not installed")
+    return NumpyKernel() if use_numpy else ArrayKernel()
+
+
+def _window_key(day: int, window: str) -> str:
+    moment = date.fromordinal(_EPOCH_ORDINAL + day)
+    if window == "day":
+        return moment.isoformat()
+    if window == "week":
+        year, week, _ = moment.isocalendar()
+        return f"{year}-W{week:02d}"
+    if window == "month":
+        return f"{moment.year}-{moment.month:02d}"
+    return str(moment.year)
+
+
+class ArchiveAnalytics:
+    """Duration statistics over a RecordManager's archive.
+
+    Works on the manager's columnar ``RecordBatch``, so the records file is
+    parsed only when it has changed. Every duration is classified against
+    its speech type's timing schedule once; later calls only classify rows
+    appended since.
+    """
+
+    def __init__(self, record_manager, use_numpy: Optional[bool] = None,
+                 percentiles: Sequence[int] = DEFAULT_PERCENTILES):
+        self.record_manager = record_manager
+        self.kernel = get_kernel(use_numpy)
+        self.percentiles = tuple(percentiles)
+        self._batch: Optional[RecordBatch] = None
+        self._codes = None
+        self._registry = None
+
+    def _columns(self):
+        """Current batch columns plus the outcome code of every row"""
+        batch = self.record_manager.get_record_batch()
+        durations, type_ids, speaker_ids, timestamps = self.kernel.columns(batch)
+        # Edited speech types change the outcome of every row
+        registry = get_registry()
+        fresh = batch is self._batch and registry is self._registry and self._codes is not None
+        done = len(self._codes) if fresh else 0
+        self._registry = registry
+        if done < len(batch):
+            bounds = [outcome_bounds(speech_type) for speech_type in batch.types]
+            new_codes = self.kernel.classify(durations[done:], type_ids[done:], bounds)
+            self._codes = self.kernel.concat(self._codes, new_codes) if done else new_codes
+        elif done > len(batch):
+            self._codes = self._codes[:len(batch)]
+        self._batch = batch
+        return batch, durations, type_ids, speaker_ids, timestamps, self._codes
+
+    def _speaker_groups(self, batch: RecordBatch):
+        """Map speaker ids to case-insensitive groups; returns (mapping, labels)"""
+        mapping, labels, seen = [], [], {}
+        for name in batch.speakers:
+            key = name.casefold()
+            if key not in seen:
+                seen[key] = len(labels)
+                labels.append(name)
+            mapping.append(seen[key])
+        return mapping, labels
+
+    def _group(self, batch: RecordBatch, type_ids, speaker_ids, group_by: str):
+        """Group id per row and the label of each group"""
+        if group_by == "type":
+            return type_ids, list(batch.types)
+        if group_by == "speaker":
+            mapping, labels = self._speaker_groups(batch)
+            return self.kernel.remap(speaker_ids, mapping), labels
+        raise ValueError(f"Unknown grouping: {group_by!r} (expected 'type' or 'speaker')")
+
+    def overall(self) -> Optional[DurationStats]:
+        """Statistics across the whole archive (None if it is empty)"""
+        batch, durations, _, _, _, codes = self._columns()
+        if not len(batch):
+            return None
+        return self.kernel.summarize(durations, codes, self.kernel.zeros(len(batch)), 1, self.percentiles)[0]
+
+    def by_type(self) -> Dict[str, DurationStats]:
+        """Statistics per speech type value"""
+        return self.grouped("type")
+
+    def by_speaker(self) -> Dict[str, DurationStats]:
+        """Statistics per speaker (names compared case-insensitively)"""
+        return self.grouped("speaker")
+
+    def grouped(self, group_by: str) -> Dict[str, DurationStats]:
+        """Statistics per group, where ``group_by`` is 'type' or 'speaker'"""
+        batch, durations, type_ids, speaker_ids, _, codes = self._columns()
+        group_ids, labels = self._group(batch, type_ids, speaker_ids, group_by)
+        stats = self.kernel.summarize(durations, codes, group_ids, len(labels), self.percentiles)
+        return {label: result for label, result in zip(labels, stats) if result is not None}
+
+    def trends(self, window: str = "month", group_by: Optional[str] = None) -> Dict[str, object]:
+        """Statistics per time window, oldest first.
+
+        ``window`` is one of 'day', 'week' (ISO), 'month' or 'year'. With
+        ``group_by`` each window maps to a dict of per-group statistics.
+        Records without a readable timestamp are left out.
+        """
+        if window not in WINDOWS:
+            raise ValueError(f"Unknown window: {window!r} (expected one of {', '.join(WINDOWS)})")
+        batch, durations, type_ids, speaker_ids, timestamps, codes = self._columns()
+        days = self.kernel.days(timestamps)
+
+        # Few distinct days, so window keys are computed once per day
+        window_of_day: Dict[int, int] = {}
+        window_labels: List[str] = []
+        window_index: Dict[str, int] = {}
+        for day in self.kernel.unique(days):
+            if day < 0:
+                continue
+            key = _window_key(day, window)
+            if key not in window_index:
+                window_index[key] = len(window_labels)
+                window_labels.append(key)
+            window_of_day[day] = window_index[key]
+        window_ids = self.kernel.lookup(days, window_of_day)
+
+        if group_by is None:
+            stats = self.kernel.summarize(durations, codes, window_ids, len(window_labels), self.percentiles)
+            return {label: result for label, result in zip(window_labels, stats) if result is not None}
+
+        group_ids, labels = self._group(batch, type_ids, speaker_ids, group_by)
+        combined = self.kernel.combine(window_ids, group_ids, len(labels))
+        stats = self.kernel.summarize(durations, codes, combined, len(window_labels) * len(labels),
+                                      self.percentiles)
+        trends: Dict[str, Dict[str, DurationStats]] = {}
+        for window_id, window_label in enumerate(window_labels):
+            row = stats[window_id * len(labels):(window_id + 1) * len(labels)]
+            trends[window_label] = {label: result for label, result in zip(labels, row) if result is not None}
+        return trends
+
+    def outcome_counts(self) -> Dict[str, int]:
+        """Number of speeches with each outcome across the archive"""
+        codes = self._columns()[-1]
+        return dict(zip(OUTCOMES, self.kernel.bincount(codes, len(OUTCOMES))))
@@ -0,0 +1,227 @@
+"""
+asyncio timer engine and controller for the Toastmaster Timer App
+"""
+
+import asyncio
+from typing import AsyncIterator, List, Optional
+from .speech_types import SpeechType, TimerColor
+from .display_manager import DisplayManager
+from .timing_schedule import TimingEventType, TimingSchedule, get_schedule
+from .timer_engine import TickStats, TimerUpdate
+from .metrics import metrics
+
+
+class AsyncTimerEngine:
+    """Timer engine driven by event loop deadlines instead of a thread.
+
+    Each wake-up is a ``loop.call_at`` callback scheduled on an absolute
+    deadline from the start time, so any number of engines share the event
+    loop's single thread. By default engines are headless; pass
+    ``headless=False`` to draw the timer screen like ``TimerEngine``.
+    With ``ticks=False`` the engine wakes only at schedule events.
+    """
+
+    # Updates buffered per ``events()`` subscriber; a consumer that falls
+    # further behind loses its oldest updates rather than growing memory
+    EVENT_QUEUE_SIZE = 64
+
+    def __init__(self, headless: bool = True, ticks: bool = True):
+        self.headless = headless
+        self.ticks = ticks or not headless
+        self.current_speech_type: Optional[SpeechType] = None
+        self.start_time: Optional[float] = None
+        self.current_color = TimerColor.BLANK
+        self.grace_period_started = False
+        self.grace_period_ended = False
+        self.tick_stats = TickStats()
+        self.schedule: Optional[TimingSchedule] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._running = False
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._deadline = 0.0
+        # Whole second the pending deadline stands for, and the last one handled
+        self._due = 0
+        self._elapsed = 0
+        self._events_handled = 0
+        self._stopped: Optional[asyncio.Event] = None
+        self._subscribers: List[asyncio.Queue] = []
+
+    def start_timer(self, speech_type: SpeechType):
+        """Start timing for specified speech type (must be called on the event loop)"""
+        self.stop_timer()
+        self._loop = asyncio.get_running_loop()
+        self.current_speech_type = speech_type
+        self.schedule = get_schedule(speech_type)
+        self.current_color = TimerColor.BLANK
+        self.grace_period_started = False
+        self.grace_period_ended = False
+        self.tick_stats = TickStats()
+        self._events_handled = 0
+        self._stopped = asyncio.Event()
+
+        if not self.headless:
+            DisplayManager.set_background_color(TimerColor.BLANK)
+
+        self.start_time = self._loop.time()
+        self._deadline = self.start_time
+        self._due = 0
+        self._elapsed = 0
+        self._running = True
+        self._handle = self._loop.call_at(self._deadline, self._on_deadline)
+
+    def stop_timer(self) -> int:
+        """Stop the current timer and return elapsed time"""
+        if not self._running:
+            return 0
+        self._running = False
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        elapsed = self.get_elapsed_time()
+
+        if not self.headless:
+            DisplayManager.set_background_color(TimerColor.BLANK)
+            DisplayManager.clear_screen()
+
+        self._publish(TimerUpdate("stopped", self.current_speech_type, elapsed, self.current_color))
+        self._stopped.set()
+        return elapsed
+
+    def get_elapsed_time(self) -> int:
+        """Get current elapsed time in seconds"""
+        if self.start_time is None or self._loop is None:
+            return 0
+        return max(int(self._loop.time() - self.start_time), self._elapsed)
+
+    def is_running(self) -> bool:
+        """Check if timer is currently running"""
+        return self._running
+
+    def get_current_speech_type(self) -> Optional[SpeechType]:
+        """Get currently selected speech type"""
+        return self.current_speech_type
+
+    def get_current_color(self) -> TimerColor:
+        """Get current timer color"""
+        return self.current_color
+
+    async def wait_until_stopped(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the timer stops; returns False if the timeout expires first"""
+        if self._stopped is None or not self.is_running():
+            return True
+        try:
+            # wait_for cancels the inner wait on timeout, so nothing is left pending
+            await asyncio.wait_for(self._stopped.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def events(self) -> AsyncIterator[TimerUpdate]:
+        """Iterate over tick and transition updates until the timer stops.
+
+        A subscriber more than ``EVENT_QUEUE_SIZE`` updates behind skips
+        the oldest ones; the final "stopped" update is always delivered.
+        """
+        queue: asyncio.Queue = asyncio.Queue(self.EVENT_QUEUE_SIZE)
+        self._subscribers.append(queue)
+        try:
+            while True:
+                update = await queue.get()
+                yield update
+                if update.kind == "stopped":
+                    return
+        finally:
+            self._subscribers.remove(queue)
+
+    def _on_deadline(self):
+        """Event loop callback for one scheduled wake-up"""
+        loop = self._loop
+        now = loop.time()
+        self.tick_stats.record(max(0.0, now - self._deadline))
+        # The loop may run a callback up to its clock resolution early, so
+        # the deadline's own second is the lower bound, not the clock
+        elapsed = max(int(now - self.start_time), self._due)
+        self._elapsed = elapsed
+        schedule = self.schedule
+
+        color = schedule.color_at(elapsed)
+        if color != self.current_color:
+            self.current_color = color
+            if not self.headless:
+                DisplayManager.set_background_color(color)
+
+        reached = schedule.events_reached(elapsed)
+        for event in schedule.events[self._events_handled:reached]:
+            if event.event_type == TimingEventType.GRACE_START:
+                self.grace_period_started = True
+            elif event.event_type == TimingEventType.GRACE_END:
+                self.grace_period_ended = True
+            self._publish(TimerUpdate("transition", self.current_speech_type, event.at, event.color, event.event_type))
+        self._events_handled = reached
+
+        if self.ticks:
+            if not self.headless:
+                DisplayManager.show_timer_info(self.current_speech_type, elapsed, color)
+            self._publish(TimerUpdate("tick", self.current_speech_type, elapsed, color))
+            self._due = max(int(loop.time() - self.start_time), elapsed) + 1
+        else:
+            next_event = schedule.next_event_time(elapsed)
+            if next_event is None:
+                # Nothing left to happen; stay running until stopped
+                self._handle = None
+                return
+            self._due = next_event
+        self._deadline = self.start_time + self._due
+        self._handle = loop.call_at(self._deadline, self._on_deadline)
+
+    def _publish(self, update: TimerUpdate):
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+                metrics.inc("toastmaster_async_events_dropped_total",
+                            help_text="Timer updates dropped for slow event subscribers")
+            queue.put_nowait(update)
+
+
+class AsyncTimerController:
+    """asyncio counterpart of ``TimerController`` with the same method names"""
+
+    def __init__(self, headless: bool = True, ticks: bool = True):
+        self.engine = AsyncTimerEngine(headless=headless, ticks=ticks)
+
+    async def start_speech_timer(self, speech_type: SpeechType) -> bool:
+        """Start a timer for a specific speech type"""
+        try:
+            self.engine.start_timer(speech_type)
+            return True
+        except Exception as e:
+            print(f"Error starting timer: {e}")
+            return False
+
+    async def stop_speech_timer(self) -> int:
+        """Stop the current timer and return elapsed time"""
+        return self.engine.stop_timer()
+
+    def is_timer_running(self) -> bool:
+        """Check if timer is currently running"""
+        return self.engine.is_running()
+
+    def get_timer_status(self) -> dict:
+        """Get current timer status information"""
+        return {
+            "running": self.engine.is_running(),
+            "speech_type": self.engine.get_current_speech_type(),
+            "elapsed_time": self.engine.get_elapsed_time(),
+            "current_color": self.engine.get_current_color(),
+            "grace_period_started": self.engine.grace_period_started,
+            "grace_period_ended": self.engine.grace_period_ended,
+            "tick_jitter": self.engine.tick_stats.to_dict()
+        }
+
+    async def wait_for_timer_completion(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the timer is stopped; returns False on timeout"""
+        return await self.engine.wait_until_stopped(timeout)
+
+    def events(self) -> AsyncIterator[TimerUpdate]:
+        """Async iterator of tick/transition updates for the current timer"""
+        return self.engine.events()
@@ -0,0 +1,592 @@
+"""
+Binary segmented record storage for the Toastmaster Timer App
+"""
+
+import errno
+import heapq
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .file_lock import FileLock
+from .metrics import metrics
+from .record_batch import RecordBatch, timestamp_to_micros, micros_to_timestamp
+from .record_storage import RecordStorage, copy_records, export_json_lines, read_json_records
+from .record_wal import atomic_write_lines, fsync_directory
+
+# timestamp (epoch microseconds), duration, speaker id, type id, padding
+RECORD = struct.Struct('<qiIH2x')
+# magic, version, record count, min timestamp, max timestamp
+INDEX_HEADER = struct.Struct('=4sHxxIqq')
+INDEX_MAGIC = b'TMRI'
+INDEX_VERSION = 1
+DEFAULT_SEGMENT_SIZE = 65536
+
+
+def _posting(key: int, row: int) -> int:
+    """Pack an index key and a row number into one sortable integer"""
+    return (key << 32) | row
+
+
+def _format_duration(seconds: int) -> str:
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+class _MappedFile:
+    """Read-only memory map of a whole file (empty files map to b"")"""
+
+    __slots__ = ('file', 'map')
+
+    def __init__(self, filename: str):
+        self.file = open(filename, 'rb')
+        size = os.fstat(self.file.fileno()).st_size
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def close(self):
+        if isinstance(self.map, mmap.mmap):
+            self.map.close()
+        self.file.close()
+
+
+class SegmentIndex:
+    """Sidecar index of one sealed segment, read through a memory map.
+
+    Holds three sorted columns over the segment's rows: speaker postings
+    and type postings (``key << 32 | row``) and timestamps with their row
+    numbers. Lookups are binary searches, so only the pages around the
+    matching keys are read.
+    """
+
+    def __init__(self, filename: str):
+        self._mapped = _MappedFile(filename)
+        data = self._mapped.map
+        magic, version, count, self.ts_min, self.ts_max = INDEX_HEADER.unpack_from(data, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            self.close()
+            raise ValueError(f"Not a record index: {filename}")
+        self.count = count
+        view = self._view = memoryview(data)
+        offset = INDEX_HEADER.size
+        self.speakers = view[offset:offset + 8 * count].cast('Q')
+        offset += 8 * count
+        self.types = view[offset:offset + 8 * count].cast('Q')
+        offset += 8 * count
+        self.timestamps = view[offset:offset + 8 * count].cast('q')
+        offset += 8 * count
+        self.timestamp_rows = view[offset:offset + 4 * count].cast('I')
+
+    @staticmethod
+    def build(records: Iterable[Tuple]) -> bytes:
+        """Serialize the index for unpacked RECORD tuples in row order"""
+        speakers, types, by_time = array('Q'), array('Q'), []
+        for row, (timestamp, _, speaker_id, type_id) in enumerate(records):
+            speakers.append(_posting(speaker_id, row))
+            types.append(_posting(type_id, row))
+            by_time.append((timestamp, row))
+        speakers = array('Q', sorted(speakers))
+        types = array('Q', sorted(types))
+        by_time.sort()
+        timestamps = array('q', [timestamp for timestamp, _ in by_time])
+        rows = array('I', [row for _, row in by_time])
+        header = INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(rows),
+                                   timestamps[0] if timestamps else 0,
+                                   timestamps[-1] if timestamps else 0)
+        return b"".join((header, speakers.tobytes(), types.tobytes(), timestamps.tobytes(), rows.tobytes()))
+
+    @staticmethod
+    def _rows(postings, key: int) -> List[int]:
+        low = bisect_left(postings, _posting(key, 0))
+        high = bisect_left(postings, _posting(key + 1, 0))
+        return [posting & 0xFFFFFFFF for posting in postings[low:high].tolist()]
+
+    def speaker_rows(self, speaker_id: int) -> List[int]:
+        return self._rows(self.speakers, speaker_id)
+
+    def type_rows(self, type_id: int) -> List[int]:
+        return self._rows(self.types, type_id)
+
+    def rows_between(self, start: int, end: int) -> List[int]:
+        """Rows with ``start <= timestamp < end``"""
+        if self.count == 0 or end <= self.ts_min or start > self.ts_max:
+            return []
+        low = bisect_left(self.timestamps, start)
+        high = bisect_left(self.timestamps, end)
+        return self.timestamp_rows[low:high].tolist()
+
+    def close(self):
+        for name in ('speakers', 'types', 'timestamps', 'timestamp_rows', '_view'):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+        self._mapped.close()
+
+
+class _StringTable:
+    """Append-only table of strings, one JSON string per line; ids are line numbers"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.values: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self._offset = 0
+
+    def refresh(self):
+        """Load strings appended since the last refresh (possibly by other processes)"""
+        try:
+            with open(self.filename, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode('utf-8').splitlines():
+            value = json.loads(line)
+            self.ids.setdefault(value, len(self.values))
+            self.values.append(value)
+        self._offset += end
+
+    def add(self, values: Iterable[str]) -> bool:
+        """Append any new strings durably; caller holds the store lock"""
+        new = []
+        for value in values:
+            if value not in self.ids:
+                self.ids[value] = len(self.values)
+                self.values.append(value)
+                new.append(value)
+        if not new:
+            return False
+        data = "".join(json.dumps(value, ensure_ascii=False) + "\n" for value in new).encode('utf-8')
+        with open(self.filename, 'ab') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._offset += len(data)
+        return True
+
+
+class BinaryRecordStorage(RecordStorage):
+    """Fixed-width binary records in append-only segments.
+
+    The store is a directory holding:
+
+    - ``seg-<gen>-<n>.dat``: records packed as ``RECORD`` (20 bytes each),
+      ``segment_size`` per segment
+    - ``seg-<gen>-<n>.idx``: sidecar index of a full (sealed) segment, by
+      speaker, speech type and timestamp
+    - ``speakers-<gen>.txt`` / ``types-<gen>.txt``: string tables the
+      records refer to by id
+    - ``manifest.json``: segment size and current generation
+
+    Reads go through ``mmap``: counts come from file sizes alone, and
+    filters binary-search the sealed segments' indexes and decode only
+    the matching rows; just the open segment is scanned. ``clear`` starts
+    a new generation, so readers holding maps of the old files are never
+    confused by the new ones.
+    """
+
+    indexed = True
+
+    def __init__(self, directory: str, segment_size: int = DEFAULT_SEGMENT_SIZE):
+        self.directory = directory
+        self.segment_size = segment_size
+        self._manifest = os.path.join(directory, "manifest.json")
+        self._lock = FileLock(os.path.join(directory, "lock"))
+        self._manifest_signature = None
+        self.generation = 0
+        self._speakers: Optional[_StringTable] = None
+        self._types: Optional[_StringTable] = None
+        self._maps: Dict[str, object] = {}
+        self._batch: Optional[RecordBatch] = None
+
+    # -- layout ---------------------------------------------------------
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _segment_path(self, number: int, suffix: str = ".dat") -> str:
+        return self._path(f"seg-{self.generation}-{number:06d}{suffix}")
+
+    def _segment_count(self) -> int:
+        prefix = f"seg-{self.generation}-"
+        return sum(1 for name in os.listdir(self.directory)
+                   if name.startswith(prefix) and name.endswith(".dat"))
+
+    def _segment_records(self, number: int) -> int:
+        try:
+            return os.path.getsize(self._segment_path(number)) // RECORD.size
+        except FileNotFoundError:
+            return 0
+
+    def _refresh(self):
+        """Pick up a new generation or segment size written by any process"""
+        stat = os.stat(self._manifest)
+        signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if signature != self._manifest_signature:
+            with open(self._manifest, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest["generation"] != self.generation or self._speakers is None:
+                self._drop_maps()
+                self.generation = manifest["generation"]
+                self._speakers = _StringTable(self._path(f"speakers-{self.generation}.txt"))
+                self._types = _StringTable(self._path(f"types-{self.generation}.txt"))
+                self._batch = None
+            self.segment_size = manifest["segment_size"]
+            self._manifest_signature = signature
+        self._speakers.refresh()
+        self._types.refresh()
+
+    def _write_manifest(self, generation: int):
+        atomic_write_lines(self._manifest, [json.dumps({
+            "version": 1, "generation": generation, "segment_size": self.segment_size}) + "\n"])
+
+    # -- memory maps ----------------------------------------------------
+
+    def _sealed_map(self, number: int) -> _MappedFile:
+        """Cached map of a sealed (immutable) segment"""
+        path = self._segment_path(number)
+        mapped = self._maps.get(path)
+        if mapped is None:
+            mapped = self._maps[path] = _MappedFile(path)
+        return mapped
+
+    def _index(self, number: int) -> Optional[SegmentIndex]:
+        """Cached sidecar index of a sealed segment, None if it was never built"""
+        path = self._segment_path(number, ".idx")
+        index = self._maps.get(path)
+        if index is None:
+            try:
+                index = self._maps[path] = SegmentIndex(path)
+            except (FileNotFoundError, ValueError):
+                return None
+        return index
+
+    def _drop_maps(self):
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps.clear()
+
+    def _segments(self) -> Iterator[Tuple[int, object, bool]]:
+        """Yield (number, data, sealed) for every segment in order"""
+        count = self._segment_count()
+        for number in range(count):
+            sealed = number < count - 1 or self._segment_records(number) >= self.segment_size
+            if sealed:
+                yield number, self._sealed_map(number).map, True
+            else:
+                # The open segment is small and still growing, so it is read rather than mapped
+                with open(self._segment_path(number), 'rb') as f:
+                    data = f.read()
+                # Ignore a torn record a crashed writer may have left
+                yield number, data[:len(data) - len(data) % RECORD.size], False
+
+    # -- RecordStorage --------------------------------------------------
+
+    def ensure_exists(self):
+        """Create the store, drop files of old generations and repair the open segment"""
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            if not os.path.exists(self._manifest):
+                self._write_manifest(0)
+            self._refresh()
+            keep = (f"seg-{self.generation}-", f"speakers-{self.generation}.", f"types-{self.generation}.")
+            for name in os.listdir(self.directory):
+                stale = not name.startswith(keep) or ".tmp." in name
+                if name.startswith(("seg-", "speakers-", "types-")) and stale:
+                    try:
+                        os.remove(self._path(name))
+                    except OSError:
+                        pass  # still mapped by another process on Windows
+            count = self._segment_count()
+            if count:
+                last = self._segment_path(count - 1)
+                size = os.path.getsize(last)
+                if size % RECORD.size:
+                    with open(last, 'rb+') as f:
+                        f.truncate(size - size % RECORD.size)
+            for number in range(count):
+                if (self._segment_records(number) >= self.segment_size
+                        and not os.path.exists(self._segment_path(number, ".idx"))):
+                    self._seal(number)
+
+    def append(self, record: Dict):
+        """Append one record, durable on return"""
+        with metrics.timer("toastmaster_records_write_seconds", "Record append latency including WAL fsync"):
+            self.append_many([record])
+
+    def append_many(self, records: Iterable[Dict]) -> int:
+        """Append records with one fsync per segment written; returns how many were added"""
+        records = list(records)
+        if not records:
+            return 0
+        with self._lock:
+            self._refresh()
+            self._speakers.add(record.get("speaker_name", "") for record in records)
+            self._types.add(record.get("speech_type", "") for record in records)
+            packed = [RECORD.pack(timestamp_to_micros(record.get("timestamp", "")),
+                                  int(record.get("duration_seconds", 0)),
+                                  self._speakers.ids[record.get("speaker_name", "")],
+                                  self._types.ids[record.get("speech_type", "")])
+                      for record in records]
+            number = max(0, self._segment_count() - 1)
+            written = 0
+            while written < len(packed):
+                room = self.segment_size - self._segment_records(number)
+                if room <= 0:
+                    number += 1
+                    continue
+                chunk = packed[written:written + room]
+                new_file = not os.path.exists(self._segment_path(number))
+                with open(self._segment_path(number), 'ab') as f:
+                    f.write(b"".join(chunk))
+                    f.flush()
+                    os.fsync(f.fileno())
+                if new_file:
+                    fsync_directory(self._segment_path(number))
+                written += len(chunk)
+                if len(chunk) == room:
+                    self._seal(number)
+            return len(packed)
+
+    def _seal(self, number: int):
+        """Write the sidecar index of a full segment"""
+        with open(self._segment_path(number), 'rb') as f:
+            data = f.read(self.segment_size * RECORD.size)
+        index = SegmentIndex.build(RECORD.iter_unpack(data))
+        temp_filename = f"{self._segment_path(number, '.idx')}.tmp.{os.getpid()}"
+        with open(temp_filename, 'wb') as f:
+            f.write(index)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_filename, self._segment_path(number, ".idx"))
+        fsync_directory(self._segment_path(number, ".idx"))
+
+    def _to_dict(self, values: Tuple) -> Dict:
+        timestamp, duration, speaker_id, type_id = values
+        return {
+            "timestamp": micros_to_timestamp(timestamp),
+            "speech_type": self._types.values[type_id],
+            "speaker_name": self._speakers.values[speaker_id],
+            "duration_seconds": duration,
+            "duration_formatted": _format_duration(duration)
+        }
+
+    def iter_records(self) -> Iterator[Dict]:
+        """Yield every record in insertion order"""
+        self._refresh()
+        for _, data, _ in self._segments():
+            for values in RECORD.iter_unpack(data):
+                yield self._to_dict(values)
+
+    def read_since(self, position: Optional[List]) -> Optional[Iterator[Tuple[List[Dict], List]]]:
+        """Records after a position of ``[generation, record count]``, skipping whole segments"""
+        self._refresh()
+        generation = self.generation
+        skip = position[1] if position is not None else 0
+        if position is not None and (position[0] != generation or skip > self.count()):
+            return None
+
+        def chunks():
+            seen = 0
+            for number, data, _ in self._segments():
+                records = len(data) // RECORD.size
+                if seen + records > skip:
+                    start = max(0, skip - seen) * RECORD.size
+                    chunk = [self._to_dict(values) for values in RECORD.iter_unpack(data[start:])]
+                    yield chunk, [generation, seen + records]
+                seen += records
+        return chunks()
+
+    def count(self) -> int:
+        """Number of records, from segment sizes alone"""
+        self._refresh()
+        return sum(self._segment_records(number) for number in range(self._segment_count()))
+
+    def clear(self):
+        """Start an empty generation and delete the old one's files"""
+        with self._lock:
+            self._refresh()
+            old = self.generation
+            self._write_manifest(old + 1)
+            self._refresh()
+            for name in os.listdir(self.directory):
+                if name.startswith((f"seg-{old}-", f"speakers-{old}.", f"types-{old}.")):
+                    try:
+                        os.remove(self._path(name))
+                    except OSError:
+                        pass  # removed by ensure_exists later
+
+    def close(self):
+        self._drop_maps()
+        self._batch = None
+
+    # -- indexed queries ------------------------------------------------
+
+    def _find(self, matches, rows_of) -> List[Dict]:
+        """Records matching a predicate on unpacked values, using indexes where sealed"""
+        self._refresh()
+        found = []
+        for number, data, sealed in self._segments():
+            index = self._index(number) if sealed else None
+            if index is None:
+                found.extend(self._to_dict(values) for values in RECORD.iter_unpack(data) if matches(values))
+            else:
+                found.extend(self._to_dict(RECORD.unpack_from(data, row * RECORD.size))
+                             for row in sorted(rows_of(index)))
+        return found
+
+    def find_by_type(self, speech_type: str) -> List[Dict]:
+        """Records of one speech type value"""
+        self._refresh()
+        type_id = self._types.ids.get(speech_type)
+        if type_id is None:
+            return []
+        return self._find(lambda values: values[3] == type_id, lambda index: index.type_rows(type_id))
+
+    def find_by_speaker(self, speaker_name: str) -> List[Dict]:
+        """Records of a speaker, compared case-insensitively"""
+        self._refresh()
+        key = speaker_name.casefold()
+        ids = {speaker_id for speaker_id, name in enumerate(self._speakers.values) if name.casefold() == key}
+        if not ids:
+            return []
+        return self._find(lambda values: values[2] in ids,
+                          lambda index: [row for speaker_id in ids for row in index.speaker_rows(speaker_id)])
+
+    def find_between(self, start: int, end: int) -> List[Dict]:
+        """Records with ``start <= timestamp < end`` (epoch microseconds)"""
+        return self._find(lambda values: start <= values[0] < end,
+                          lambda index: index.rows_between(start, end))
+
+    def find_page(self, sort: str, descending: bool, after: Optional[Tuple[int, int]], limit: int,
+                  speaker: Optional[str] = None, speech_type: Optional[str] = None,
+                  start: Optional[int] = None, end: Optional[int] = None) -> Tuple[List[Tuple[Tuple, Dict]], int]:
+        """Up to ``limit`` matching records ordered by (sort column, row number) after the key ``after``.
+
+        Returns ``([(key, record), ...], number of matches)``. Candidate
+        rows come from the sealed segments' indexes and are unpacked one at
+        a time through a heap bounded by ``limit``; only the page is
+        turned into dicts.
+        """
+        self._refresh()
+        speaker_ids = type_id = None
+        if speaker:
+            key = speaker.casefold()
+            speaker_ids = {speaker_id for speaker_id, name in enumerate(self._speakers.values)
+                           if name.casefold() == key}
+            if not speaker_ids:
+                return [], 0
+        if speech_type:
+            type_id = self._types.ids.get(speech_type)
+            if type_id is None:
+                return [], 0
+        low = start if start is not None else -(1 << 63)
+        high = end if end is not None else (1 << 63) - 1
+        column = 0 if sort == "date" else 1
+        matches = 0
+
+        def rows_of(index: SegmentIndex) -> Iterable[int]:
+            if speaker_ids is not None:
+                return sorted(row for speaker_id in speaker_ids for row in index.speaker_rows(speaker_id))
+            if type_id is not None:
+                return index.type_rows(type_id)
+            if start is not None or end is not None:
+                return index.rows_between(low, high)
+            return range(index.count)
+
+        def candidates():
+            nonlocal matches
+            for number, data, sealed in self._segments():
+                first = number * self.segment_size
+                index = self._index(number) if sealed else None
+                rows = range(len(data) // RECORD.size) if index is None else rows_of(index)
+                for row in rows:
+                    values = RECORD.unpack_from(data, row * RECORD.size)
+                    if ((speaker_ids is not None and values[2] not in speaker_ids)
+                            or (type_id is not None and values[3] != type_id)
+                            or not low <= values[0] < high):
+                        continue
+                    matches += 1
+                    key = (values[column], first + row)
+                    if after is None or (key < after if descending else key > after):
+                        yield key, values
+
+        select = heapq.nlargest if descending else heapq.nsmallest
+        page = select(limit, candidates(), key=itemgetter(0))
+        return [(key, self._to_dict(values)) for key, values in page], matches
+
+    def load_batch(self) -> RecordBatch:
+        """All records as a RecordBatch, decoding only rows added since the last call"""
+        self._refresh()
+        batch = self._batch
+        if batch is None:
+            batch = self._batch = RecordBatch()
+        # Table ids match batch ids because both assign them in first-seen order
+        for name in self._speakers.values[len(batch.speakers):]:
+            batch.speaker_id(name)
+        for value in self._types.values[len(batch.types):]:
+            batch.type_id(value)
+        done = len(batch)
+        for number, data, _ in self._segments():
+            first = number * self.segment_size
+            records = len(data) // RECORD.size
+            if first + records <= done:
+                continue
+            start = max(0, done - first) * RECORD.size
+            for timestamp, duration, speaker_id, type_id in RECORD.iter_unpack(data[start:]):
+                batch.timestamps.append(timestamp)
+                batch.durations.append(duration)
+                batch.speaker_ids.append(speaker_id)
+                batch.type_ids.append(type_id)
+        return batch
+
+
+def import_json(json_filename: str, directory: str, batch_size: int = 10000) -> int:
+    """Copy records from a JSON records file into a binary store; returns the count"""
+    records = read_json_records(json_filename)
+    target = BinaryRecordStorage(directory)
+    target.ensure_exists()
+    try:
+        return copy_records(records, target, batch_size)
+    finally:
+        target.close()
+
+
+def export_json(directory: str, json_filename: str) -> int:
+    """Write a binary store's records as a JSON Lines records file; returns the count"""
+    if not os.path.isfile(os.path.join(directory, "manifest.json")):
+        raise FileNotFoundError(errno.ENOENT, "No binary record store", directory)
+    source = BinaryRecordStorage(directory)
+    source.ensure_exists()
+    try:
+        return export_json_lines(source, json_filename)
+    finally:
+        source.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line: ``python -m src.binary_store import|export <json file> <store dir>``"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Convert speech records between JSON and the binary store")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("json_file", help="JSON records file (e.g. speech_records.json)")
+    parser.add_argument("store", help="binary store directory")
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "import":
+            count = import_json(args.json_file, args.store)
+            print(f"Imported {count} records from {args.json_file} into {args.store}")
+        else:
+            count = export_json(args.store, args.json_file)
+            print(f"Exported {count} records from {args.store} to {args.json_file}")
+    except OSError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,78 @@
+"""
+Clocks for the Toastmaster Timer App timer engine
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class Clock:
+    """Time source and sleeper used by TimerEngine"""
+
+    def monotonic(self) -> float:
+        """Current time in seconds from an arbitrary, never-decreasing origin"""
+        raise NotImplementedError
+
+    def wait(self, event: threading.Event, timeout: Optional[float] = None) -> bool:
+        """Sleep up to ``timeout`` clock seconds or until ``event`` is set.
+
+        Returns True if the event was set.
+        """
+        raise NotImplementedError
+
+
+class SystemClock(Clock):
+    """Real time from ``time.monotonic()``"""
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def wait(self, event: threading.Event, timeout: Optional[float] = None) -> bool:
+        return event.wait(timeout)
+
+
+class ScaledClock(Clock):
+    """Real time sped up by a constant factor (e.g. 1000x for simulations)"""
+
+    def __init__(self, speed: float):
+        if speed <= 0:
+            raise ValueError("speed must be positive")
+        self.speed = speed
+        self._origin = time.monotonic()
+
+    def monotonic(self) -> float:
+        return (time.monotonic() - self._origin) * self.speed
+
+    def wait(self, event: threading.Event, timeout: Optional[float] = None) -> bool:
+        return event.wait(None if timeout is None else timeout / self.speed)
+
+
+class VirtualClock(Clock):
+    """Clock that only moves when waited on - sleeping jumps straight to the deadline.
+
+    Runs a whole speech in however long the work between wake-ups takes,
+    which makes timing behaviour testable without real waiting.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def wait(self, event: threading.Event, timeout: Optional[float] = None) -> bool:
+        if event.is_set():
+            return True
+        if timeout is None:
+            # Nothing scheduled: only an explicit stop can end this wait
+            return event.wait()
+        self.now += max(0.0, timeout)
+        return False
+
+    def advance(self, seconds: float):
+        """Move the clock forward"""
+        self.now += seconds
+
+
+SYSTEM_CLOCK = SystemClock()
@@ -2,37 +2,64 @@
 Display utilities for the Toastmaster Timer App
 """
 
-import os
+from datetime import datetime
+from typing import Optional, Sequence
 from .speech_types import SpeechType, TimerColor, SpeechConfig
+from .speech_registry import get_registry
+from .terminal import TerminalBackend, get_terminal, set_terminal
+from .screen_frame import FrameRenderer
 
 
 class DisplayManager:
     """Handles all display-related functionality"""
     
+    # Renderer for the live timer screen and per-speech-type static sections
+    _frame_renderer = None
+    _static_sections = {}
+    
+    @staticmethod
+    def get_terminal() -> TerminalBackend:
+        """Get the terminal backend used for output"""
+        return get_terminal()
+    
+    @staticmethod
+    def set_terminal(terminal: TerminalBackend):
+        """Plug in a different terminal backend (ANSI, Windows color, null)"""
+        set_terminal(terminal)
+        DisplayManager._frame_renderer = None
+    
     @staticmethod
     def clear_screen():
         """Clear the terminal screen"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        DisplayManager._invalidate_frame()
+        get_terminal().clear_screen()
     
     @staticmethod
     def set_background_color(color: TimerColor):
-        """Set terminal background color using Windows cmd color command"""
-        if color == TimerColor.BLANK:
-            # Reset to default colors - white text on black background
-            os.system('cmd /c "color 07"')
-        elif color == TimerColor.GREEN:
-            # Black text on green background
-            os.system('cmd /c "color 02"')
-        elif color == TimerColor.YELLOW:
-            # Black text on yellow background  
-            os.system('cmd /c "color 06"')
-        elif color == TimerColor.RED:
-            # White text on red background
-            os.system('cmd /c "color 04"')
-    
-    @staticmethod
-    def show_main_menu():
-        """Display the main menu"""
+        """Set terminal background color through the active terminal backend"""
+        # A new background only fills the screen on a full repaint
+        DisplayManager._invalidate_frame()
+        get_terminal().set_background_color(color)
+    
+    @staticmethod
+    def _invalidate_frame():
+        """Make the next timer frame repaint the whole screen"""
+        if DisplayManager._frame_renderer is not None:
+            DisplayManager._frame_renderer.invalidate()
+    
+    @staticmethod
+    def _get_frame_renderer() -> FrameRenderer:
+        """Get the frame renderer bound to the active terminal"""
+        terminal = get_terminal()
+        renderer = DisplayManager._frame_renderer
+        if renderer is None or renderer.terminal is not terminal:
+            renderer = FrameRenderer(terminal)
+            DisplayManager._frame_renderer = renderer
+        return renderer
+    
+    @staticmethod
+    def show_main_menu(speech_types: Optional[Sequence] = None):
+        """Display the main menu: speech types 1..N, then records, statistics, contest mode and exit"""
         # Ensure default colors for menu display
         DisplayManager.set_background_color(TimerColor.BLANK)
         DisplayManager.clear_screen()
@@ -41,100 +68,241 @@ class DisplayManager:
         print(f"{'='*60}")
         print("\nSelect Speech Type:")
         
-        # Dynamically generate menu from SpeechType enum
-        speech_types = [
-            SpeechType.ICE_BREAKER,
-            SpeechType.PREPARED, 
-            SpeechType.EVALUATION,
-            SpeechType.TABLE_TOPIC,
-            SpeechType.TEST
-        ]
+        # Built-in and file-defined types, in registry order
+        if speech_types is None:
+            speech_types = get_registry().speech_types()
         
         for i, speech_type in enumerate(speech_types, 1):
             config = SpeechConfig.get_config(speech_type)
             if config:
                 print(f"{i}. {config['name']} ({config['duration_range']})")
         
-        print("6. View Speech Records")
-        print("7. Exit")
+        actions = len(speech_types)
+        print(f"{actions + 1}. View Speech Records")
+        print(f"{actions + 2}. Speech Statistics")
+        print(f"{actions + 3}. Contest Mode (multiple rooms)")
+        print(f"{actions + 4}. Exit")
         print(f"\n{'='*60}")
     
     @staticmethod
     def show_timer_info(speech_type: SpeechType, elapsed_seconds: int, current_color: TimerColor):
-        """Display current timer information"""
-        DisplayManager.clear_screen()
+        """Display current timer information, redrawing only what changed"""
+        sections = DisplayManager._get_static_sections(speech_type)
+        if sections is None:
+            return
         
+        lines = DisplayManager._timer_info_lines(sections, elapsed_seconds, current_color)
+        DisplayManager._get_frame_renderer().render(lines)
+    
+    @staticmethod
+    def _get_static_sections(speech_type: SpeechType):
+        """Get the parts of the timer screen that never change for a speech type"""
         config = SpeechConfig.get_config(speech_type)
+        cached = DisplayManager._static_sections.get(speech_type)
+        # A reloaded speech types file brings new config objects
+        if cached is not None and cached[0] is config:
+            return cached[1]
         if not config:
-            return
-            
-        minutes = elapsed_seconds // 60
-        seconds = elapsed_seconds % 60
+            return None
         
-        print(f"\n{'='*60}")
-        print(f"  TOASTMASTER TIMER - {config['name'].upper()}")
-        print(f"  Expected Duration: {config['duration_range']}")
-        print(f"{'='*60}")
-        print(f"\n  ELAPSED TIME: {minutes:02d}:{seconds:02d}")
-        print(f"  CURRENT SIGNAL: {current_color.value.upper() if current_color != TimerColor.BLANK else 'BLANK'}")
+        header = (
+            "",
+            f"{'='*60}",
+            f"  TOASTMASTER TIMER - {config['name'].upper()}",
+            f"  Expected Duration: {config['duration_range']}",
+            f"{'='*60}",
+            "",
+        )
+        timings = tuple(
+            (timing_seconds, f"{timing_seconds // 60:02d}:{timing_seconds % 60:02d} - {color.value.upper()}")
+            for timing_seconds, color in config['timings']
+        )
         
-        # Show grace period status if applicable
+        grace = None
         grace_period = config.get('grace_period', 0)
         if grace_period > 0:
             red_time = SpeechConfig.get_red_time(speech_type)
             grace_end_time = SpeechConfig.get_grace_end_time(speech_type)
-            
+            grace_start = f"{red_time // 60:02d}:{red_time % 60:02d}"
+            grace_end = f"{grace_end_time // 60:02d}:{grace_end_time % 60:02d}"
+            grace = (
+                red_time,
+                grace_end_time,
+                f"{grace_start}-{grace_end} - GRACE PERIOD ({grace_period}s)",
+                f"{grace_end} - DISQUALIFIED (Grace period exceeded)",
+            )
+        
+        footer = (
+            "",
+            f"{'='*60}",
+            "  Press Ctrl+C to stop timer and record speech",
+            f"{'='*60}",
+        )
+        sections = (header, timings, grace, footer)
+        DisplayManager._static_sections[speech_type] = (config, sections)
+        return sections
+    
+    @staticmethod
+    def _timer_info_lines(sections, elapsed_seconds: int, current_color: TimerColor) -> list:
+        """Build the lines of the timer screen from its cached static sections"""
+        header, timings, grace, footer = sections
+        minutes = elapsed_seconds // 60
+        seconds = elapsed_seconds % 60
+        
+        lines = list(header)
+        lines.append(f"  ELAPSED TIME: {minutes:02d}:{seconds:02d}")
+        lines.append(f"  CURRENT SIGNAL: {current_color.value.upper() if current_color != TimerColor.BLANK else 'BLANK'}")
+        
+        # Show grace period status if applicable
+        if grace is not None:
+            red_time, grace_end_time = grace[0], grace[1]
             if elapsed_seconds >= grace_end_time:
-                print(f"  ⚠️  GRACE PERIOD OVER - DISQUALIFIED!")
+                lines.append(f"  ⚠️  GRACE PERIOD OVER - DISQUALIFIED!")
             elif elapsed_seconds >= red_time:
                 remaining_grace = grace_end_time - elapsed_seconds
-                print(f"  🟠 GRACE PERIOD ACTIVE - {remaining_grace}s remaining")
+                lines.append(f"  🟠 GRACE PERIOD ACTIVE - {remaining_grace}s remaining")
         
         # Show timing breakdown
-        print(f"\n  TIMING SIGNALS:")
-        for timing_seconds, color in config['timings']:
-            timing_min = timing_seconds // 60
-            timing_sec = timing_seconds % 60
+        lines.append("")
+        lines.append(f"  TIMING SIGNALS:")
+        for timing_seconds, label in timings:
             status = "✓" if elapsed_seconds >= timing_seconds else " "
-            print(f"  {status} {timing_min:02d}:{timing_sec:02d} - {color.value.upper()}")
+            lines.append(f"  {status} {label}")
         
         # Show grace period details if applicable
-        if grace_period > 0:
-            red_time = SpeechConfig.get_red_time(speech_type)
-            grace_start_min = red_time // 60
-            grace_start_sec = red_time % 60
-            grace_end_time = SpeechConfig.get_grace_end_time(speech_type)
-            grace_end_min = grace_end_time // 60
-            grace_end_sec = grace_end_time % 60
-            
-            # Show grace period timing
+        if grace is not None:
+            red_time, grace_end_time, grace_label, disqualify_label = grace
             if elapsed_seconds >= red_time:
                 grace_status = "🟠" if elapsed_seconds < grace_end_time else "⚠️"
             else:
                 grace_status = " "
-            print(f"  {grace_status} {grace_start_min:02d}:{grace_start_sec:02d}-{grace_end_min:02d}:{grace_end_sec:02d} - GRACE PERIOD ({grace_period}s)")
+            lines.append(f"  {grace_status} {grace_label}")
             
             disqualify_status = "⚠️" if elapsed_seconds >= grace_end_time else " "
-            print(f"  {disqualify_status} {grace_end_min:02d}:{grace_end_sec:02d} - DISQUALIFIED (Grace period exceeded)")
+            lines.append(f"  {disqualify_status} {disqualify_label}")
         
-        print(f"\n{'='*60}")
-        print("  Press Ctrl+C to stop timer and record speech")
-        print(f"{'='*60}")
+        lines.extend(footer)
+        return lines
+    
+    @staticmethod
+    def show_dashboard(statuses: list, hint: str = ""):
+        """Display all contest-mode timers, one row per room"""
+        terminal = get_terminal()
+        lines = [
+            "",
+            f"{'='*72}",
+            "  🎤 CONTEST MODE - ALL ROOMS",
+            f"{'='*72}",
+            f"  {'Room':<16} {'Speech':<22} {'Time':<7} {'Signal':<8} Status",
+            f"  {'-'*68}",
+        ]
+        for status in statuses:
+            config = SpeechConfig.get_config(status['speech_type']) if status['speech_type'] else {}
+            elapsed = status['elapsed_time']
+            color = status['current_color']
+            signal = color.value.upper() if color != TimerColor.BLANK else 'BLANK'
+            if not status['speech_type']:
+                state = "idle"
+            elif not status['running']:
+                state = "stopped"
+            elif status['grace_period_ended']:
+                state = "DISQUALIFIED"
+            elif status['grace_period_started']:
+                state = "grace period"
+            else:
+                state = "running"
+            lines.append(
+                f"  {status['name'][:16]:<16} {config.get('name', '-')[:22]:<22} "
+                f"{elapsed // 60:02d}:{elapsed % 60:02d}   {terminal.color_text(f'{signal:<8}', color)} {state}"
+            )
+        if not statuses:
+            lines.append("  No rooms yet - use 'add <room>'")
+        lines.append(f"{'='*72}")
+        if hint:
+            lines.append(f"  {hint}")
+        DisplayManager._get_frame_renderer().render(lines)
     
     @staticmethod
     def show_grace_period_notification(notification_type: str, grace_period: int = 0):
         """Show grace period start/end notifications"""
-        DisplayManager.clear_screen()
-        print(f"\n{'='*60}")
+        terminal = get_terminal()
+        DisplayManager._invalidate_frame()
+        terminal.clear_screen()
+        lines = ["", f"{'='*60}"]
         
         if notification_type == "started":
-            print(f"  🟠 GRACE PERIOD STARTED!")
-            print(f"  Speaker has {grace_period} seconds to conclude")
+            lines.append(f"  🟠 GRACE PERIOD STARTED!")
+            lines.append(f"  Speaker has {grace_period} seconds to conclude")
         elif notification_type == "ended":
-            print(f"  ⚠️  GRACE PERIOD OVER!")
-            print(f"  Speaker is now DISQUALIFIED in competitions")
+            lines.append(f"  ⚠️  GRACE PERIOD OVER!")
+            lines.append(f"  Speaker is now DISQUALIFIED in competitions")
         
-        print(f"{'='*60}")
+        lines.append(f"{'='*60}")
+        terminal.write("\n".join(lines) + "\n")
+        terminal.flush()
+    
+    @staticmethod
+    def show_records_page(page, filter_description: str, sort_description: str, hint: str = ""):
+        """Display one page of speech records from the records viewer"""
+        DisplayManager.clear_screen()
+        print(f"\n{'='*80}")
+        print(f"SPEECH RECORDS - {filter_description}, {sort_description}")
+        print(f"{'='*80}")
+        if not page.records:
+            print("\nNo speech records found.")
+        else:
+            print(f"{'Date/Time':<20} {'Speaker':<20} {'Type':<20} {'Duration':<10}")
+            print(f"{'-'*80}")
+            for record in page.records:
+                try:
+                    timestamp = datetime.fromisoformat(record.timestamp).strftime("%Y-%m-%d %H:%M")
+                except ValueError:
+                    timestamp = "-"
+                speech_type = record.speech_type.replace('_', ' ').title()
+                print(f"{timestamp:<20} {record.speaker_name[:20]:<20} {speech_type[:20]:<20} "
+                      f"{record.duration_formatted:<10}")
+        print(f"{'-'*80}")
+        print(f"Page {page.number} - {page.matches} matching record(s)")
+        if hint:
+            print(hint)
+    
+    @staticmethod
+    def show_statistics(summary, top_speakers: int = 10):
+        """Display duration statistics per speech type and for the most frequent speakers"""
+        DisplayManager.clear_screen()
+        print(f"\n{'='*80}")
+        print(f"SPEECH STATISTICS - {summary.records} record(s)")
+        print(f"{'='*80}")
+        if not summary.records:
+            print("\nNo speech records found.")
+            print(f"{'-'*80}")
+            return
+        
+        def fmt(seconds) -> str:
+            seconds = int(round(seconds))
+            return f"{seconds // 60:02d}:{seconds % 60:02d}"
+        
+        def row(label: str, stats) -> str:
+            return (f"{label[:24]:<24} {stats.count:>8} {fmt(stats.mean):>7} {fmt(stats.stddev):>7} "
+                    f"{fmt(stats.minimum):>7} {fmt(stats.percentile(0.5)):>7} {fmt(stats.maximum):>7}")
+        
+        def header(label: str) -> str:
+            return (f"{label:<24} {'Speeches':>8} {'Mean':>7} {'Std dev':>7} "
+                    f"{'Min':>7} {'~Median':>7} {'Max':>7}\n{'-'*80}")
+        
+        print(header("Speech Type"))
+        for speech_type, stats in sorted(summary.by_type().items(), key=lambda item: -item[1].count):
+            config = SpeechConfig.get_config(speech_type)
+            print(row(config.get('name') or speech_type.replace('_', ' ').title(), stats))
+        print(row("All speeches", summary.totals()))
+        
+        speakers = sorted(summary.by_speaker().items(), key=lambda item: (-item[1].count, item[0].casefold()))
+        print(f"\n{header('Speaker')}")
+        for speaker, stats in speakers[:top_speakers]:
+            print(row(speaker, stats))
+        if len(speakers) > top_speakers:
+            print(f"... and {len(speakers) - top_speakers} more speaker(s)")
+        print(f"{'-'*80}")
     
     @staticmethod
     def show_speech_recorded(speaker_name: str, speech_name: str, duration_formatted: str):
@@ -0,0 +1,189 @@
+"""
+Lightweight instrumentation for the Toastmaster Timer App hot paths
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Tuple
+
+# Latency buckets in seconds, from 10 microseconds to 10 seconds
+DEFAULT_BUCKETS = (0.00001, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 10.0)
+
+
+class Counter:
+    """Monotonically increasing count"""
+
+    __slots__ = ('name', 'help', 'value')
+
+    def __init__(self, name: str, help_text: str = ""):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+
+class Histogram:
+    """Distribution of observed values in cumulative buckets"""
+
+    __slots__ = ('name', 'help', 'buckets', 'counts', 'count', 'sum', 'max')
+
+    def __init__(self, name: str, help_text: str = "", buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+
+class _Timer:
+    """Context manager that observes its duration into a histogram"""
+
+    __slots__ = ('histogram', 'started')
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.histogram.observe(time.perf_counter() - self.started)
+
+
+class _NullTimer:
+    """Shared do-nothing timer handed out while metrics are disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """Named counters and histograms.
+
+    Disabled by default: ``inc``, ``observe`` and ``timer`` then return
+    after a single attribute check, so instrumented code pays almost
+    nothing. Hot loops can also test ``metrics.enabled`` themselves.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._counters: Dict[str, Counter] = {}
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Drop all recorded values"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def counter(self, name: str, help_text: str = "") -> Counter:
+        counter = self._counters.get(name)
+        if counter is None:
+            with self._lock:
+                counter = self._counters.setdefault(name, Counter(name, help_text))
+        return counter
+
+    def histogram(self, name: str, help_text: str = "") -> Histogram:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram(name, help_text))
+        return histogram
+
+    def inc(self, name: str, amount: int = 1, help_text: str = ""):
+        """Increment a counter if metrics are enabled"""
+        if self.enabled:
+            self.counter(name, help_text).inc(amount)
+
+    def observe(self, name: str, value: float, help_text: str = ""):
+        """Record a value in a histogram if metrics are enabled"""
+        if self.enabled:
+            self.histogram(name, help_text).observe(value)
+
+    def timer(self, name: str, help_text: str = ""):
+        """Context manager timing a block into a histogram (no-op when disabled)"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self.histogram(name, help_text))
+
+    def snapshot(self) -> Dict:
+        """Current values as plain dictionaries"""
+        with self._lock:
+            counters = list(self._counters.values())
+            histograms = list(self._histograms.values())
+        return {
+            "counters": {c.name: c.value for c in counters},
+            "histograms": {
+                h.name: {
+                    "count": h.count,
+                    "sum": h.sum,
+                    "max": h.max,
+                    "mean": h.sum / h.count if h.count else 0.0,
+                }
+                for h in histograms
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        with self._lock:
+            counters = sorted(self._counters.values(), key=lambda c: c.name)
+            histograms = sorted(self._histograms.values(), key=lambda h: h.name)
+        lines = []
+        for c in counters:
+            if c.help:
+                lines.append(f"# HELP {c.name} {c.help}")
+            lines.append(f"# TYPE {c.name} counter")
+            lines.append(f"{c.name} {c.value}")
+        for h in histograms:
+            if h.help:
+                lines.append(f"# HELP {h.name} {h.help}")
+            lines.append(f"# TYPE {h.name} histogram")
+            cumulative = 0
+            for bound, count in zip(h.buckets, h.counts):
+                cumulative += count
+                lines.append(f'{h.name}_bucket{{le="{bound:g}"}} {cumulative}')
+            lines.append(f'{h.name}_bucket{{le="+Inf"}} {h.count}')
+            lines.append(f"{h.name}_sum {h.sum:.9f}")
+            lines.append(f"{h.name}_count {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, filename: str):
+        """Write the Prometheus text file atomically"""
+        temp_filename = f"{filename}.tmp.{os.getpid()}"
+        with open(temp_filename, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(temp_filename, filename)
+
+
+# Process-wide registry used by all instrumented modules
+metrics = MetricsRegistry()
@@ -0,0 +1,167 @@
+"""
+Columnar storage of loaded speech records for the Toastmaster Timer App
+"""
+
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from .speech_record import SpeechRecord
+from .metrics import metrics
+
+_EPOCH = datetime(1970, 1, 1)
+# Stored for records whose timestamp is missing or unreadable
+MISSING_TIMESTAMP = -(2 ** 63)
+# Range of the 4-byte duration column
+_MIN_DURATION = -(2 ** 31)
+_MAX_DURATION = 2 ** 31 - 1
+
+
+def timestamp_to_micros(timestamp: str) -> int:
+    """Convert an ISO timestamp to integer microseconds since the epoch.
+
+    Naive timestamps (what the app writes) are converted without any time
+    zone adjustment, so the conversion round-trips exactly. Timestamps with
+    a UTC offset are converted to naive UTC; the offset itself is not kept.
+    """
+    return _parse_timestamp(timestamp)[0]
+
+
+def _parse_timestamp(timestamp: str) -> Tuple[int, bool]:
+    """Epoch microseconds of a timestamp, and False if they lose part of it (a UTC offset, or unreadable text)"""
+    try:
+        moment = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return MISSING_TIMESTAMP, not timestamp
+    exact = moment.tzinfo is None
+    if not exact:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = moment - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds, exact
+
+
+def micros_to_timestamp(micros: int) -> str:
+    """Inverse of ``timestamp_to_micros``"""
+    if micros == MISSING_TIMESTAMP:
+        return ""
+    return (_EPOCH + timedelta(microseconds=micros)).isoformat()
+
+
+def record_duration(item: Dict) -> Optional[int]:
+    """Whole-second duration of a record dictionary, or None if it is not a usable number"""
+    try:
+        duration = int(item.get("duration_seconds", 0))
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return duration if _MIN_DURATION <= duration <= _MAX_DURATION else None
+
+
+class RecordBatch:
+    """Column-oriented speech records.
+
+    Each record costs 8 bytes of timestamp (epoch microseconds), 4 bytes of
+    duration, 4 bytes of speaker id and 4 bytes of type id, held in typed
+    arrays. Speaker names and speech types are stored once each in string
+    tables. Indexing or iterating yields ``SpeechRecord`` objects built on
+    demand, so the batch can stand in for a list of records.
+
+    Records whose duration is not a number are skipped (and counted in
+    ``skipped``), like unreadable lines in the records file. Timestamps the
+    microsecond column cannot reproduce - those with a UTC offset, which is
+    converted to UTC, and unreadable ones - keep their original text in a
+    sparse row table, so every record reads back as it was written.
+    """
+
+    __slots__ = ('timestamps', 'durations', 'speaker_ids', 'type_ids',
+                 'speakers', 'types', '_speaker_lookup', '_type_lookup',
+                 'original_timestamps', 'skipped')
+
+    def __init__(self):
+        self.timestamps = array('q')
+        self.durations = array('i')
+        self.speaker_ids = array('I')
+        self.type_ids = array('I')
+        self.speakers: List[str] = []
+        self.types: List[str] = []
+        self._speaker_lookup: Dict[str, int] = {}
+        self._type_lookup: Dict[str, int] = {}
+        # Row -> timestamp text, only for rows whose timestamp is not naive ISO
+        self.original_timestamps: Dict[int, str] = {}
+        self.skipped = 0
+
+    @classmethod
+    def from_dicts(cls, items: Iterable[Dict]) -> 'RecordBatch':
+        batch = cls()
+        batch.extend(items)
+        return batch
+
+    def speaker_id(self, speaker_name: str) -> int:
+        """Id of a speaker name, adding it to the string table if new"""
+        speaker_id = self._speaker_lookup.get(speaker_name)
+        if speaker_id is None:
+            speaker_id = len(self.speakers)
+            self.speakers.append(speaker_name)
+            self._speaker_lookup[speaker_name] = speaker_id
+        return speaker_id
+
+    def type_id(self, speech_type: str) -> int:
+        """Id of a speech type value, adding it to the string table if new"""
+        type_id = self._type_lookup.get(speech_type)
+        if type_id is None:
+            type_id = len(self.types)
+            self.types.append(speech_type)
+            self._type_lookup[speech_type] = type_id
+        return type_id
+
+    def append(self, item: Dict) -> bool:
+        """Add one record dictionary; returns False if it was skipped as unusable"""
+        duration = item.get("duration_seconds", 0)
+        if type(duration) is not int or not _MIN_DURATION <= duration <= _MAX_DURATION:
+            duration = record_duration(item)
+            if duration is None:
+                self.skipped += 1
+                metrics.inc("toastmaster_records_skipped_total", help_text="Stored records skipped as unreadable")
+                return False
+        timestamp = item.get("timestamp", "")
+        micros, exact = _parse_timestamp(timestamp)
+        if not exact and isinstance(timestamp, str):
+            self.original_timestamps[len(self.durations)] = timestamp
+        self.timestamps.append(micros)
+        self.durations.append(duration)
+        self.speaker_ids.append(self.speaker_id(item.get("speaker_name", "")))
+        self.type_ids.append(self.type_id(item.get("speech_type", "")))
+        return True
+
+    def extend(self, items: Iterable[Dict]):
+        """Add many record dictionaries"""
+        for item in items:
+            self.append(item)
+
+    def __len__(self) -> int:
+        return len(self.durations)
+
+    def __getitem__(self, index: int) -> SpeechRecord:
+        """Materialize one row as a SpeechRecord"""
+        record = SpeechRecord.__new__(SpeechRecord)
+        original = self.original_timestamps.get(index % len(self)) if self.original_timestamps else None
+        record.timestamp = original if original is not None else micros_to_timestamp(self.timestamps[index])
+        record.speech_type = self.types[self.type_ids[index]]
+        record.speaker_name = self.speakers[self.speaker_ids[index]]
+        record.duration_seconds = self.durations[index]
+        return record
+
+    def __iter__(self) -> Iterator[SpeechRecord]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def rows(self, indices: Sequence[int]) -> List[SpeechRecord]:
+        """Materialize the given rows"""
+        return [self[index] for index in indices]
+
+    def epoch_seconds(self, index: int) -> float:
+        """Timestamp of a row as seconds since the epoch"""
+        return self.timestamps[index] / 1e6
+
+    def nbytes(self) -> int:
+        """Approximate bytes used by the column arrays"""
+        return sum(column.itemsize * len(column)
+                   for column in (self.timestamps, self.durations, self.speaker_ids, self.type_ids))
@@ -0,0 +1,234 @@
+"""
+Bulk import and export of speech records for the Toastmaster Timer App
+"""
+
+import csv
+import gzip
+import io
+import os
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, Optional, Set, Tuple
+from .record_batch import RecordBatch, timestamp_to_micros, MISSING_TIMESTAMP
+from .record_storage import RecordStorage, JsonLinesStorage, RECORD_FIELDS
+from .record_wal import fsync_directory
+
+FORMATS = ("csv", "jsonl")
+CSV_FIELDS = RECORD_FIELDS
+# (timestamp micros, case-folded speaker, speech type)
+RecordKey = Tuple[int, str, str]
+
+
+class TransferStats:
+    """Running totals of an import or export, passed to progress callbacks"""
+
+    __slots__ = ('read', 'written', 'duplicates', 'invalid', 'bytes_done', 'bytes_total')
+
+    def __init__(self, bytes_total: int = 0):
+        self.read = 0
+        self.written = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.bytes_done = 0
+        self.bytes_total = bytes_total
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def detect_format(filename: str) -> Tuple[str, bool]:
+    """Return (format, gzipped) from a file name such as ``records.csv.gz``"""
+    name = filename.lower()
+    compressed = name.endswith(".gz")
+    if compressed:
+        name = name[:-3]
+    if name.endswith(".csv"):
+        return "csv", compressed
+    if name.endswith((".jsonl", ".json", ".ndjson")):
+        return "jsonl", compressed
+    raise ValueError(f"Cannot tell the format of {filename!r}; use .csv or .jsonl, optionally with .gz")
+
+
+def record_key(timestamp_micros: int, speaker_name: str, speech_type: str) -> RecordKey:
+    """De-duplication key of (timestamp, case-folded speaker, speech type).
+
+    The whole tuple is the key, not its hash: records whose hashes collide
+    are still told apart.
+    """
+    return timestamp_micros, speaker_name.casefold(), speech_type
+
+
+def existing_keys(batch: RecordBatch) -> Set[RecordKey]:
+    """De-duplication keys of every record in a batch; keys share the batch's interned strings"""
+    speakers = [name.casefold() for name in batch.speakers]
+    types = batch.types
+    return {(timestamp, speakers[speaker_id], types[type_id])
+            for timestamp, speaker_id, type_id in zip(batch.timestamps, batch.speaker_ids, batch.type_ids)}
+
+
+def normalize(item: Dict) -> Optional[Tuple[Dict, int]]:
+    """Validate an imported row; returns (record dictionary, timestamp micros) or None if unusable"""
+    try:
+        timestamp = item["timestamp"].strip()
+        speech_type = item["speech_type"].strip()
+        speaker_name = item["speaker_name"].strip()
+        duration = int(item["duration_seconds"])
+    except (KeyError, AttributeError, TypeError, ValueError):
+        return None
+    if not speech_type or not speaker_name or duration < 0:
+        return None
+    micros = timestamp_to_micros(timestamp)
+    if micros == MISSING_TIMESTAMP:
+        return None
+    return {
+        "timestamp": timestamp,
+        "speech_type": speech_type,
+        "speaker_name": speaker_name,
+        "duration_seconds": duration,
+        "duration_formatted": _formatted_duration(duration)
+    }, micros
+
+
+@lru_cache(maxsize=4096)
+def _formatted_duration(seconds: int) -> str:
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+def read_rows(filename: str, file_format: Optional[str] = None,
+              stats: Optional[TransferStats] = None) -> Iterator[Dict]:
+    """Stream raw rows from a CSV or JSON Lines file, gzipped or not.
+
+    ``stats.bytes_done`` tracks the position in the (compressed) input file.
+    """
+    detected, compressed = detect_format(filename)
+    file_format = file_format or detected
+    with open(filename, 'rb') as raw:
+        stream = gzip.GzipFile(fileobj=raw, mode='rb') if compressed else raw
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+        if file_format == "csv":
+            rows = _csv_rows(text)
+        else:
+            # Damaged lines come through as empty rows so they are counted as invalid
+            rows = (JsonLinesStorage.decode(line) or {} for line in text if line.strip())
+        for row in rows:
+            if stats is not None:
+                stats.read += 1
+                if not stats.read % 1024:
+                    stats.bytes_done = raw.tell()
+            yield row
+        if stats is not None:
+            stats.bytes_done = raw.tell()
+
+
+def _csv_rows(text) -> Iterator[Dict]:
+    """Rows of a CSV file with a header line, as dictionaries (lighter than csv.DictReader)"""
+    reader = csv.reader(text)
+    header = next(reader, None)
+    if header is None:
+        return
+    header = [name.strip() for name in header]
+    for values in reader:
+        if values:
+            yield dict(zip(header, values))
+
+
+def _encode_csv(records: Iterable[Dict]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, CSV_FIELDS, extrasaction='ignore', lineterminator='\n')
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record)
+        if buffer.tell() >= 1 << 16:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def write_records(filename: str, records: Iterable[Dict], file_format: Optional[str] = None,
+                  stats: Optional[TransferStats] = None,
+                  progress: Optional[Callable[[TransferStats], None]] = None,
+                  progress_every: int = 10000) -> TransferStats:
+    """Atomically write records to a CSV or JSON Lines file, gzipped if the name ends in .gz"""
+    detected, compressed = detect_format(filename)
+    file_format = file_format or detected
+    stats = stats or TransferStats()
+
+    def counted():
+        for record in records:
+            yield record
+            stats.written += 1
+            if progress is not None and stats.written % progress_every == 0:
+                progress(stats)
+
+    if file_format == "csv":
+        chunks = _encode_csv(counted())
+    else:
+        chunks = (JsonLinesStorage.encode(record) for record in counted())
+
+    temp_filename = f"{filename}.tmp.{os.getpid()}"
+    try:
+        with open(temp_filename, 'wb') as raw:
+            stream = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6) if compressed else raw
+            text = io.TextIOWrapper(stream, encoding='utf-8', newline='', write_through=False)
+            for chunk in chunks:
+                text.write(chunk)
+            text.flush()
+            text.detach()
+            if compressed:
+                stream.close()
+            raw.flush()
+            os.fsync(raw.fileno())
+            stats.bytes_done = stats.bytes_total = raw.tell()
+        os.replace(temp_filename, filename)
+    finally:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+    fsync_directory(filename)
+    if progress is not None:
+        progress(stats)
+    return stats
+
+
+def import_records(storage: RecordStorage, filename: str, seen: Set[RecordKey],
+                   file_format: Optional[str] = None, batch_size: int = 10000,
+                   progress: Optional[Callable[[TransferStats], None]] = None) -> TransferStats:
+    """Stream records from a file into storage in batches, skipping duplicates.
+
+    ``seen`` holds the keys (see ``record_key``) of records already stored
+    and is updated with every record imported, so rows repeated within the
+    file are dropped too. Only one batch of records is held at a time; the
+    rest of the memory is one key tuple per stored record.
+    """
+    stats = TransferStats(os.path.getsize(filename))
+
+    def fresh_records():
+        for row in read_rows(filename, file_format, stats):
+            normalized = normalize(row)
+            if normalized is None:
+                stats.invalid += 1
+                continue
+            record, micros = normalized
+            key = record_key(micros, record["speaker_name"], record["speech_type"])
+            if key in seen:
+                stats.duplicates += 1
+                continue
+            seen.add(key)
+            yield record
+
+    records = fresh_records()
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        stats.written += storage.append_many(batch)
+        if progress is not None:
+            progress(stats)
+    return stats
+
+
+def format_progress(stats: TransferStats) -> str:
+    """One-line progress summary for the console"""
+    percent = f" {stats.bytes_done / stats.bytes_total:.0%}" if stats.bytes_total else ""
+    return (f"{stats.read:,} read, {stats.written:,} written, {stats.duplicates:,} duplicates, "
+            f"{stats.invalid:,} invalid{percent}")
@@ -2,94 +2,211 @@
 Speech record management for the Toastmaster Timer App
 """
 
-import json
 import os
+import threading
+from array import array
 from datetime import datetime
-from typing import List, Dict
+from typing import TYPE_CHECKING, Callable, List, Dict, Iterable, Iterator, Optional, Tuple
 from .speech_types import SpeechType
+from .speech_record import SpeechRecord
+from .record_batch import RecordBatch, timestamp_to_micros
+from .record_storage import RecordStorage, JsonLinesStorage
+from .metrics import metrics
 
+if TYPE_CHECKING:
+    from .record_io import TransferStats
+    from .record_summary import RecordSummary
+
+
+class _RecordCache:
+    """Columnar records plus lazily built indexes for one version of the file"""
+    
+    def __init__(self, signature, offset: int = 0):
+        self.signature = signature
+        self.offset = offset
+        self.tail = b""
+        self.batch = RecordBatch()
+        self.by_type: Optional[Dict[str, array]] = None
+        self.by_speaker: Optional[Dict[str, array]] = None
+    
+    def extend(self, items: List[Dict]):
+        """Add newly read records, keeping any built indexes up to date"""
+        batch = self.batch
+        first = len(batch)
+        batch.extend(items)
+        if self.by_type is not None:
+            self._index(self.by_type, first, lambda row: batch.types[batch.type_ids[row]])
+        if self.by_speaker is not None:
+            self._index(self.by_speaker, first, lambda row: batch.speakers[batch.speaker_ids[row]].casefold())
+    
+    def _index(self, index: Dict[str, array], first: int, key):
+        for row in range(first, len(self.batch)):
+            value = key(row)
+            rows = index.get(value)
+            if rows is None:
+                rows = index[value] = array('l')
+            rows.append(row)
+    
+    def type_index(self) -> Dict[str, array]:
+        """Hash index of row numbers by speech type value"""
+        if self.by_type is None:
+            self.by_type = {}
+            batch = self.batch
+            self._index(self.by_type, 0, lambda row: batch.types[batch.type_ids[row]])
+        return self.by_type
+    
+    def speaker_index(self) -> Dict[str, array]:
+        """Hash index of row numbers by case-folded speaker name"""
+        if self.by_speaker is None:
+            self.by_speaker = {}
+            batch = self.batch
+            self._index(self.by_speaker, 0, lambda row: batch.speakers[batch.speaker_ids[row]].casefold())
+        return self.by_speaker
+
+
+BACKENDS = ("jsonl", "binary", "sqlite")
+# Each backend keeps its records somewhere of its own (the binary store is a directory)
+DEFAULT_FILES = {"jsonl": "speech_records.json", "binary": "speech_records.tmr", "sqlite": "speech_records.db"}
 
-class SpeechRecord:
-    """Represents a single speech record"""
-    
-    def __init__(self, speech_type: SpeechType, speaker_name: str, duration_seconds: int):
-        self.timestamp = datetime.now().isoformat()
-        self.speech_type = speech_type.value
-        self.speaker_name = speaker_name
-        self.duration_seconds = duration_seconds
-        self.duration_formatted = f"{duration_seconds // 60:02d}:{duration_seconds % 60:02d}"
-    
-    def to_dict(self) -> Dict:
-        """Convert record to dictionary for JSON serialization"""
-        return {
-            "timestamp": self.timestamp,
-            "speech_type": self.speech_type,
-            "speaker_name": self.speaker_name,
-            "duration_seconds": self.duration_seconds,
-            "duration_formatted": self.duration_formatted
-        }
-    
-    @classmethod
-    def from_dict(cls, data: Dict) -> 'SpeechRecord':
-        """Create SpeechRecord from dictionary"""
-        record = cls.__new__(cls)
-        record.timestamp = data.get("timestamp", "")
-        record.speech_type = data.get("speech_type", "")
-        record.speaker_name = data.get("speaker_name", "")
-        record.duration_seconds = data.get("duration_seconds", 0)
-        record.duration_formatted = data.get("duration_formatted", "00:00")
-        return record
+
+def create_storage(filename: str, backend: str = "jsonl", commit_window: float = 0.0) -> RecordStorage:
+    """Create the record storage for a backend name"""
+    # The binary and SQLite modules are only imported when chosen (sqlite3 is slow to load)
+    if backend == "jsonl":
+        return JsonLinesStorage(filename, commit_window=commit_window)
+    if backend == "binary":
+        from .binary_store import BinaryRecordStorage
+        return BinaryRecordStorage(filename)
+    if backend == "sqlite":
+        from .sqlite_store import SqliteRecordStorage
+        return SqliteRecordStorage(filename)
+    raise ValueError(f"Unknown records backend: {backend!r} (expected one of {', '.join(BACKENDS)})")
 
 
 class RecordManager:
     """Manages speech records - saving, loading, and displaying with file-based operations"""
     
-    def __init__(self, filename: str = "speech_records.json"):
+    def __init__(self, filename: Optional[str] = None, commit_window: float = 0.0,
+                 backend: str = "jsonl"):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown records backend: {backend!r} (expected one of {', '.join(BACKENDS)})")
+        filename = filename or DEFAULT_FILES[backend]
         self.filename = filename
-        # Ensure the file exists with empty array if it doesn't exist
-        self._ensure_file_exists()
+        # commit_window > 0 lets a burst of saves share one fsync (group commit);
+        # backends "binary" and "sqlite" keep records in indexed stores instead
+        self.backend = backend
+        self.commit_window = commit_window
+        self._storage: Optional[RecordStorage] = None
+        self._open_lock = threading.Lock()
+        self._cache: Optional[_RecordCache] = None
+        # Persisted per-speaker/per-type statistics, loaded (with their module) on first use
+        self._summary: Optional['RecordSummary'] = None
+        self._summary_lock = threading.Lock()
+        self._summary_unsaved = 0
+    
+    @property
+    def summary_filename(self) -> str:
+        """The summary file kept beside the records"""
+        from .record_summary import summary_filename
+        return summary_filename(self.filename)
+    
+    @property
+    def storage(self) -> RecordStorage:
+        """The record storage, opened on first use so start-up touches no files"""
+        if self._storage is None:
+            with self._open_lock:
+                if self._storage is None:
+                    storage = create_storage(self.filename, self.backend, self.commit_window)
+                    # Ensure the file exists, migrate legacy files and replay the write-ahead log
+                    self._ensure_file_exists(storage)
+                    self._storage = storage
+        return self._storage
+    
+    def open(self) -> RecordStorage:
+        """Open the record storage now, raising if it cannot be created or read.
+
+        ``storage`` opens it on first use instead and only warns on failure,
+        after which every save fails on its own.
+        """
+        with self._open_lock:
+            if self._storage is None:
+                storage = create_storage(self.filename, self.backend, self.commit_window)
+                try:
+                    storage.ensure_exists()
+                except Exception:
+                    storage.close()
+                    raise
+                self._storage = storage
+        return self._storage
     
-    def _ensure_file_exists(self):
+    def _ensure_file_exists(self, storage: RecordStorage):
         """Ensure the records file exists with proper structure"""
-        if not os.path.exists(self.filename):
-            try:
-                with open(self.filename, 'w') as f:
-                    json.dump([], f, indent=2)
-            except Exception as e:
-                print(f"Warning: Could not create records file - {e}")
+        try:
+            storage.ensure_exists()
+        except Exception as e:
+            print(f"Warning: Could not create records file - {e}")
     
     def add_record(self, speech_type: SpeechType, speaker_name: str, duration_seconds: int):
-        """Add a new speech record directly to file"""
+        """Add a new speech record by appending it to the file"""
         record = SpeechRecord(speech_type, speaker_name, duration_seconds)
         
         try:
-            # Read existing records
-            existing_records = self._read_records_from_file()
-            
-            # Add new record
-            existing_records.append(record.to_dict())
-            
-            # Write back to file
-            with open(self.filename, 'w') as f:
-                json.dump(existing_records, f, indent=2)
-                
-            return record
-            
+            self.storage.append(record.to_dict())
         except Exception as e:
             print(f"Warning: Could not save record - {e}")
             return record
+        self._update_summary()
+        return record
     
-    def _read_records_from_file(self) -> List[Dict]:
-        """Read all records from file and return as list of dictionaries"""
+    def add_records(self, entries: Iterable[Tuple[SpeechType, str, int]]) -> List[SpeechRecord]:
+        """Add several (speech type, speaker name, duration) records in one batched write"""
+        records = [SpeechRecord(speech_type, speaker_name, duration_seconds)
+                   for speech_type, speaker_name, duration_seconds in entries]
         try:
-            if os.path.exists(self.filename):
-                with open(self.filename, 'r') as f:
-                    data = json.load(f)
-                    return data if isinstance(data, list) else []
-            return []
+            self.storage.append_many(record.to_dict() for record in records)
+        except Exception as e:
+            print(f"Warning: Could not save records - {e}")
+        self._update_summary()
+        return records
+    
+    def _iter_records_from_file(self) -> Iterator[Dict]:
+        """Stream records from file one at a time as dictionaries"""
+        try:
+            yield from self.storage.iter_records()
         except Exception as e:
             print(f"Warning: Could not load records - {e}")
-            return []
+    
+    def _cached(self) -> _RecordCache:
+        """Return the record cache, refreshing it only if the file changed.
+        
+        The cache is keyed on the file's inode, size and mtime. When the same
+        file has only grown (the normal append case) just the new lines are
+        parsed; any other change triggers a full reload.
+        """
+        signature = self.storage.signature()
+        cache = self._cache
+        if cache is not None and cache.signature == signature:
+            metrics.inc("toastmaster_records_cache_hits_total", help_text="Record lookups answered from the cache")
+            return cache
+        metrics.inc("toastmaster_records_cache_refreshes_total", help_text="Record cache refreshes from disk")
+        
+        if (cache is None or signature is None or cache.signature is None
+                or cache.signature[0] != signature[0] or signature[1] < cache.offset
+                or self.storage.peek(cache.offset - len(cache.tail), len(cache.tail)) != cache.tail):
+            cache = _RecordCache(signature)
+        
+        if signature is not None:
+            for items, cache.offset in self.storage.read_chunks(cache.offset):
+                cache.extend(items)
+            # Remember the bytes before the resume point to detect rewritten files
+            cache.tail = self.storage.peek(max(0, cache.offset - 64), min(64, cache.offset))
+        cache.signature = signature
+        self._cache = cache
+        return cache
+    
+    def _read_records_from_file(self) -> List[Dict]:
+        """Read all records from file and return as list of dictionaries"""
+        return list(self._iter_records_from_file())
     
     def save_records(self):
         """Legacy method - kept for backward compatibility but no longer needed"""
@@ -104,54 +221,179 @@ class RecordManager:
         pass
     
     def get_all_records(self) -> List[SpeechRecord]:
-        """Get all speech records by reading from file"""
+        """Get all speech records (parsed from file only when it has changed)"""
         try:
-            data = self._read_records_from_file()
-            return [SpeechRecord.from_dict(item) for item in data]
+            return list(self.get_record_batch())
         except Exception as e:
             print(f"Warning: Could not retrieve records - {e}")
             return []
     
     def display_records(self):
-        """Display all speech records in a formatted table by reading from file"""
-        records = self.get_all_records()
-        
-        if not records:
-            print("\nNo speech records found.")
-            return
-        
-        print(f"\n{'='*80}")
-        print("SPEECH RECORDS")
-        print(f"{'='*80}")
-        print(f"{'Date/Time':<20} {'Speaker':<20} {'Type':<20} {'Duration':<10}")
-        print(f"{'-'*80}")
+        """Display all speech records in a formatted table"""
+        header_printed = False
         
-        for record in records:
+        for record in self.get_record_batch():
+            if not header_printed:
+                print(f"\n{'='*80}")
+                print("SPEECH RECORDS")
+                print(f"{'='*80}")
+                print(f"{'Date/Time':<20} {'Speaker':<20} {'Type':<20} {'Duration':<10}")
+                print(f"{'-'*80}")
+                header_printed = True
+            
             timestamp = datetime.fromisoformat(record.timestamp).strftime("%Y-%m-%d %H:%M")
             speech_type = record.speech_type.replace('_', ' ').title()
             print(f"{timestamp:<20} {record.speaker_name:<20} {speech_type:<20} {record.duration_formatted:<10}")
+        
+        if not header_printed:
+            print("\nNo speech records found.")
+    
+    def import_records(self, filename: str, file_format: Optional[str] = None, batch_size: int = 10000,
+                       progress: Optional[Callable[["TransferStats"], None]] = None) -> "TransferStats":
+        """Bulk import a CSV or JSON Lines file (optionally .gz), skipping duplicates.
+        
+        Rows are streamed and written ``batch_size`` at a time; a record is a
+        duplicate if one with the same timestamp, speaker (ignoring case) and
+        speech type is already stored or earlier in the file. Raises OSError
+        or ValueError if the file cannot be read.
+        """
+        from . import record_io  # csv and gzip are only needed for transfers
+        seen = record_io.existing_keys(self.get_record_batch())
+        try:
+            return record_io.import_records(self.storage, filename, seen, file_format, batch_size, progress)
+        finally:
+            self._update_summary()
+    
+    def export_records(self, filename: str, file_format: Optional[str] = None,
+                       progress: Optional[Callable[["TransferStats"], None]] = None) -> "TransferStats":
+        """Stream every record to a CSV or JSON Lines file (gzipped if it ends in .gz).
+        
+        The file is replaced atomically. Raises OSError or ValueError on failure.
+        """
+        from . import record_io
+        return record_io.write_records(filename, self.storage.iter_records(), file_format, progress=progress)
+    
+    def get_record_batch(self) -> RecordBatch:
+        """Get all records as a columnar RecordBatch for analytics.
+        
+        The batch is shared with the record cache; treat it as read-only.
+        """
+        if self.storage.indexed:
+            return self.storage.load_batch()
+        return self._cached().batch
     
     def get_records_count(self) -> int:
-        """Get total number of records by reading from file"""
+        """Get total number of records (from the summary, without a scan)"""
         try:
-            data = self._read_records_from_file()
-            return len(data)
+            with self._summary_lock:
+                return self._refresh_summary().records
         except Exception:
             return 0
     
+    def get_summary(self) -> 'RecordSummary':
+        """Snapshot of the per-speaker and per-type duration statistics.
+        
+        The summary is persisted beside the records and only reads records
+        appended since it was last brought up to date, by this process or
+        another; it is rebuilt from scratch only if the records were
+        cleared or rewritten elsewhere.
+        """
+        try:
+            with self._summary_lock:
+                return self._refresh_summary().copy()
+        except Exception as e:
+            print(f"Warning: Could not summarize records - {e}")
+            from .record_summary import RecordSummary
+            return RecordSummary()
+    
+    def _refresh_summary(self) -> 'RecordSummary':
+        """Load the summary if needed and fold in new records (caller holds the lock)"""
+        from .record_summary import RecordSummary, SAVE_EVERY, load_summary
+        summary = self._summary
+        if summary is None:
+            summary = self._summary = load_summary(self.summary_filename) or RecordSummary()
+        added = summary.catch_up(self.storage)
+        if added:
+            self._summary_unsaved += added
+            if self._summary_unsaved >= SAVE_EVERY:
+                self._save_summary()
+        return summary
+    
+    def _update_summary(self):
+        """Fold records just written into the summary: reads only those records.
+        
+        A summary that was never loaded and has no file yet is left for the
+        first statistics request to build, so saving a record never scans.
+        """
+        if self._summary is None and not os.path.exists(self.summary_filename):
+            return
+        try:
+            with self._summary_lock:
+                self._refresh_summary()
+        except Exception as e:
+            print(f"Warning: Could not update records summary - {e}")
+    
+    def _save_summary(self):
+        from .record_summary import save_summary
+        try:
+            save_summary(self.summary_filename, self._summary)
+            self._summary_unsaved = 0
+        except OSError as e:
+            print(f"Warning: Could not save records summary - {e}")
+    
+    def rebuild_summary(self, repair: bool = True) -> List[str]:
+        """Recompute the summary from every record and compare it with the saved one.
+        
+        Returns the differences found (empty if the saved summary was
+        correct); with ``repair`` the rebuilt summary replaces it.
+        """
+        from .record_summary import build_summary, load_summary
+        with self._summary_lock:
+            saved = load_summary(self.summary_filename)
+            if saved is not None:
+                saved.catch_up(self.storage)
+            rebuilt = build_summary(self.storage)
+            differences = rebuilt.differences(saved) if saved is not None else ["no saved summary"]
+            if repair:
+                self._summary = rebuilt
+                self._save_summary()
+            return differences
+    
+    def close(self):
+        """Checkpoint pending writes and release file handles"""
+        if self._storage is None:
+            return
+        with self._summary_lock:
+            if self._summary is not None and self._summary_unsaved:
+                self._save_summary()
+        try:
+            self._storage.close()
+        except Exception as e:
+            print(f"Warning: Could not close records file - {e}")
+    
     def clear_records(self):
-        """Clear all records by writing empty array to file"""
+        """Clear all records by atomically replacing the file with an empty one"""
         try:
-            with open(self.filename, 'w') as f:
-                json.dump([], f, indent=2)
+            self.storage.clear()
         except Exception as e:
             print(f"Warning: Could not clear records - {e}")
+            return
+        try:
+            from .record_summary import RecordSummary
+            with self._summary_lock:
+                self._summary = RecordSummary()
+                self._summary.catch_up(self.storage)
+                self._save_summary()
+        except Exception as e:
+            print(f"Warning: Could not update records summary - {e}")
     
     def get_records_by_type(self, speech_type: SpeechType) -> List[SpeechRecord]:
         """Get records filtered by speech type"""
         try:
-            all_records = self.get_all_records()
-            return [record for record in all_records if record.speech_type == speech_type.value]
+            if self.storage.indexed:
+                return [SpeechRecord.from_dict(item) for item in self.storage.find_by_type(speech_type.value)]
+            cache = self._cached()
+            return cache.batch.rows(cache.type_index().get(speech_type.value, ()))
         except Exception as e:
             print(f"Warning: Could not filter records - {e}")
             return []
@@ -159,8 +401,24 @@ class RecordManager:
     def get_records_by_speaker(self, speaker_name: str) -> List[SpeechRecord]:
         """Get records filtered by speaker name"""
         try:
-            all_records = self.get_all_records()
-            return [record for record in all_records if record.speaker_name.lower() == speaker_name.lower()]
+            if self.storage.indexed:
+                return [SpeechRecord.from_dict(item) for item in self.storage.find_by_speaker(speaker_name)]
+            cache = self._cached()
+            return cache.batch.rows(cache.speaker_index().get(speaker_name.casefold(), ()))
+        except Exception as e:
+            print(f"Warning: Could not filter records - {e}")
+            return []
+    
+    def get_records_between(self, start: datetime, end: datetime) -> List[SpeechRecord]:
+        """Get records with ``start <= timestamp < end``"""
+        try:
+            start_micros = timestamp_to_micros(start.isoformat())
+            end_micros = timestamp_to_micros(end.isoformat())
+            if self.storage.indexed:
+                return [SpeechRecord.from_dict(item) for item in self.storage.find_between(start_micros, end_micros)]
+            batch = self._cached().batch
+            return batch.rows([row for row, micros in enumerate(batch.timestamps)
+                               if start_micros <= micros < end_micros])
         except Exception as e:
             print(f"Warning: Could not filter records - {e}")
             return []
@@ -0,0 +1,427 @@
+"""
+Storage backends for the Toastmaster Timer App speech records
+"""
+
+import errno
+import json
+import os
+import zlib
+from collections import Counter
+from itertools import islice
+from functools import lru_cache
+from json.encoder import encode_basestring
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .file_lock import FileLock
+from .metrics import metrics
+from .record_wal import WriteAheadLog, atomic_write_lines
+
+# Key order of SpeechRecord.to_dict()
+RECORD_FIELDS = ("timestamp", "speech_type", "speaker_name", "duration_seconds", "duration_formatted")
+_encode_repeated = lru_cache(maxsize=4096)(encode_basestring)
+
+
+class RecordStorage:
+    """Interface for record storage backends used by RecordManager.
+
+    Backends with ``indexed = True`` also answer ``find_by_type``,
+    ``find_by_speaker``, ``find_between``, ``find_page`` and ``load_batch``
+    themselves, so RecordManager does not keep its own cache for them.
+    """
+
+    indexed = False
+
+    def ensure_exists(self):
+        """Create the underlying storage if it does not exist yet"""
+        raise NotImplementedError
+
+    def append(self, record: Dict):
+        """Persist a single record dictionary"""
+        raise NotImplementedError
+
+    def append_many(self, records: Iterable[Dict]) -> int:
+        """Persist several records; backends override this to batch the writes"""
+        count = 0
+        for record in records:
+            self.append(record)
+            count += 1
+        return count
+
+    def iter_records(self) -> Iterator[Dict]:
+        """Yield stored record dictionaries in insertion order"""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        """Return the number of stored records"""
+        return sum(1 for _ in self.iter_records())
+
+    def read_since(self, position: Optional[List]) -> Optional[Iterator[Tuple[List[Dict], List]]]:
+        """Records stored after ``position``, in chunks of ``(records, position)``.
+
+        A position is a JSON-serializable list that only this backend
+        interprets; ``None`` means the beginning. Returns None when the
+        storage was cleared or rewritten since ``position`` was taken, so
+        the caller has to start again from ``None``. This default skips
+        ``position[0]`` records; backends override it to seek instead.
+        """
+        skip = position[0] if position else 0
+        if skip > self.count():
+            return None
+
+        def chunks():
+            seen = skip
+            records = self.iter_records()
+            for _ in islice(records, skip):
+                pass
+            while True:
+                chunk = list(islice(records, 10000))
+                if not chunk:
+                    return
+                seen += len(chunk)
+                yield chunk, [seen]
+        return chunks()
+
+    def clear(self):
+        """Remove all stored records"""
+        raise NotImplementedError
+
+    def close(self):
+        """Flush pending state and release any open handles"""
+        pass
+
+
+class JsonLinesStorage(RecordStorage):
+    """Append-only JSON Lines storage - one record per line.
+
+    Saving a record appends a single line, so the cost of a save no longer
+    depends on how many records are already on disk. Files written by older
+    versions (a single indented JSON array) are migrated to JSON Lines the
+    first time they are opened.
+
+    Every append is first made durable in a write-ahead log beside the
+    records file; the records file itself is only fsync'd at checkpoints.
+    Entries left in the log by a crash are replayed by ``ensure_exists``.
+
+    Writers in different processes coordinate through an advisory lock on
+    ``<filename>.lock``: each append writes its log entry and its record
+    line while holding the lock, so concurrent timers never lose records.
+    Readers do not lock; they only ever consume complete lines.
+    """
+
+    def __init__(self, filename: str, commit_window: float = 0.0, checkpoint_interval: int = 100):
+        self.filename = filename
+        self.checkpoint_interval = checkpoint_interval
+        self.wal = WriteAheadLog(filename + ".wal", commit_window)
+        self._lock = FileLock(filename + ".lock")
+        self._pending = 0
+
+    def ensure_exists(self):
+        """Create the records file, migrate legacy layouts and replay the log"""
+        with self._lock:
+            if not os.path.exists(self.filename):
+                atomic_write_lines(self.filename, [])
+            elif self._is_legacy_array():
+                self._migrate_legacy_array()
+            self.replay()
+
+    def append(self, record: Dict):
+        """Append one record as a single JSON line, durable on return"""
+        line = self.encode(record)
+        with metrics.timer("toastmaster_records_write_seconds", "Record append latency including WAL fsync"):
+            self._append_line(line)
+
+    def append_many(self, records: Iterable[Dict]) -> int:
+        """Append records with a single write and fsync; returns how many were added.
+
+        Bulk appends bypass the write-ahead log: the records file itself is
+        fsync'd before returning, so the batch is durable either way. That
+        fsync also covers every line the log holds, so the log is emptied
+        too, as at a checkpoint.
+        """
+        data = "".join(self.encode(record) for record in records).encode('utf-8')
+        if not data:
+            return 0
+        with metrics.timer("toastmaster_records_bulk_write_seconds", "Bulk record append latency"):
+            with self._lock:
+                # Never glue new lines onto a line a crashed writer left unfinished
+                self._truncate_torn_tail()
+                with open(self.filename, 'ab') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self.wal.reset()
+                self._pending = 0
+        return data.count(b"\n")
+
+    def _append_line(self, line: str):
+        with self._lock:
+            sequence = self.wal.write(line)
+            # A single O_APPEND write per line keeps lines whole for lock-free readers
+            with open(self.filename, 'ab') as f:
+                f.write(line.encode('utf-8'))
+            self._pending += 1
+            checkpoint_due = self._pending >= self.checkpoint_interval
+        self.wal.sync(sequence)
+        if checkpoint_due:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Flush the records file to disk and empty the write-ahead log"""
+        with self._lock:
+            if os.path.exists(self.filename):
+                with open(self.filename, 'rb+') as f:
+                    os.fsync(f.fileno())
+            self.wal.reset()
+            self._pending = 0
+
+    def replay(self):
+        """Re-apply log entries that did not reach the records file"""
+        with self._lock:
+            entries = self.wal.read_entries()
+            if not entries:
+                return
+            self._truncate_torn_tail()
+            missing = self._missing_lines(entries)
+            if missing:
+                with open(self.filename, 'a', encoding='utf-8') as f:
+                    f.writelines(missing)
+            self.checkpoint()
+
+    def close(self):
+        """Checkpoint pending records and close the log"""
+        self.checkpoint()
+        self.wal.close()
+
+    def iter_records(self) -> Iterator[Dict]:
+        """Stream records from the file one line at a time"""
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, 'r', encoding='utf-8') as f:
+            for line in f:
+                record = self.decode(line)
+                if record is not None:
+                    yield record
+
+    def signature(self):
+        """Return (inode, size, mtime) identifying the current file contents"""
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def read_since(self, position: Optional[List]) -> Optional[Iterator[Tuple[List[Dict], List]]]:
+        """Complete lines after a position of ``[inode, offset, crc32 of the 64 bytes before it]``"""
+        signature = self.signature()
+        if signature is None:
+            return iter(()) if position is None else None
+        inode, size = signature[0], signature[1]
+        offset = 0
+        if position is not None:
+            offset = position[1]
+            if (position[0] != inode or size < offset
+                    or self._tail_checksum(offset) != position[2]):
+                return None
+
+        def chunks():
+            for records, end in self.read_chunks(offset):
+                yield records, [inode, end, self._tail_checksum(end)]
+        return chunks()
+
+    def _tail_checksum(self, offset: int) -> int:
+        # Appends never change the bytes before an offset; a rewrite almost surely does
+        return zlib.crc32(self.peek(max(0, offset - 64), min(64, offset)))
+
+    def peek(self, offset: int, length: int) -> bytes:
+        """Read raw bytes from the records file"""
+        with open(self.filename, 'rb') as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def read_chunks(self, offset: int, chunk_size: int = 1 << 20):
+        """Read complete records from a byte offset in bounded chunks.
+
+        Yields ``(records, next_offset)`` pairs, where ``next_offset`` is
+        just past the last complete line consumed, so callers can resume
+        reading after later appends. A partial last line is left unread.
+        """
+        with open(self.filename, 'rb') as f:
+            f.seek(offset)
+            pending = b""
+            while True:
+                with metrics.timer("toastmaster_records_read_seconds", "Raw records file read latency"):
+                    data = f.read(chunk_size)
+                if not data:
+                    return
+                data = pending + data
+                end = data.rfind(b"\n") + 1
+                pending = data[end:]
+                if not end:
+                    continue
+                with metrics.timer("toastmaster_records_parse_seconds", "Records JSON decode latency"):
+                    records = []
+                    for raw in data[:end].decode('utf-8', errors='replace').splitlines():
+                        record = self.decode(raw)
+                        if record is not None:
+                            records.append(record)
+                offset += end
+                yield records, offset
+
+    def read_from(self, offset: int):
+        """Read all complete records from a byte offset; returns (records, next_offset)"""
+        records = []
+        for chunk, offset in self.read_chunks(offset):
+            records.extend(chunk)
+        return records, offset
+
+    def count(self) -> int:
+        """Count records without decoding them"""
+        if not os.path.exists(self.filename):
+            return 0
+        with open(self.filename, 'rb') as f:
+            return sum(1 for line in f if line.strip())
+
+    def clear(self):
+        """Atomically replace the records file with an empty one"""
+        with self._lock:
+            atomic_write_lines(self.filename, [])
+            self.wal.reset()
+            self._pending = 0
+
+    @staticmethod
+    def encode(record: Dict) -> str:
+        """Serialize a record dictionary to a single JSON line"""
+        if tuple(record) == RECORD_FIELDS and type(record["duration_seconds"]) is int:
+            # Fast path for the standard layout, byte-identical to json.dumps; speaker
+            # names, types and formatted durations repeat, so their escaping is cached
+            return (f'{{"timestamp":{encode_basestring(record["timestamp"])},'
+                    f'"speech_type":{_encode_repeated(record["speech_type"])},'
+                    f'"speaker_name":{_encode_repeated(record["speaker_name"])},'
+                    f'"duration_seconds":{record["duration_seconds"]},'
+                    f'"duration_formatted":{_encode_repeated(record["duration_formatted"])}}}\n')
+        return json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n"
+
+    @staticmethod
+    def decode(line: str):
+        """Parse a JSON line, returning None for blank or damaged lines"""
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        return record if isinstance(record, dict) else None
+
+    def _is_legacy_array(self) -> bool:
+        """Check whether the file still uses the old JSON array layout"""
+        with open(self.filename, 'r', encoding='utf-8') as f:
+            while True:
+                char = f.read(1)
+                if not char:
+                    return False
+                if not char.isspace():
+                    return char == '['
+
+    def _read_legacy_array(self) -> List[Dict]:
+        with open(self.filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return [item for item in data if isinstance(item, dict)] if isinstance(data, list) else []
+
+    def _migrate_legacy_array(self):
+        """Rewrite a legacy JSON array file as JSON Lines"""
+        atomic_write_lines(self.filename, [self.encode(record) for record in self._read_legacy_array()])
+
+    def _truncate_torn_tail(self):
+        """Drop a partially written last line left behind by a crash"""
+        with open(self.filename, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+            position = size
+            while position > 0:
+                step = min(4096, position)
+                position -= step
+                f.seek(position)
+                newline = f.read(step).rfind(b"\n")
+                if newline >= 0:
+                    f.truncate(position + newline + 1)
+                    return
+            f.truncate(0)
+
+    def _missing_lines(self, entries: List[str]) -> List[str]:
+        """Log entries with no matching line in the records file, in log order.
+
+        Other lines (bulk appends, other writers) may follow the logged
+        ones, so the whole file is searched; each file line accounts for
+        one entry, so repeated identical records are replayed as often as
+        they are missing.
+        """
+        unmatched = Counter(entry.encode('utf-8') for entry in entries)
+        with open(self.filename, 'rb') as f:
+            for line in f:
+                if line in unmatched:
+                    unmatched[line] -= 1
+                    if not unmatched[line]:
+                        del unmatched[line]
+                        if not unmatched:
+                            return []
+        missing = []
+        for entry in entries:
+            data = entry.encode('utf-8')
+            if unmatched.get(data):
+                unmatched[data] -= 1
+                missing.append(entry)
+        return missing
+
+
+def read_json_records(json_filename: str) -> Iterator[Dict]:
+    """Records of a JSON records file, read without creating, migrating or replaying anything.
+
+    Legacy JSON arrays are parsed in place and log entries a crash left
+    unapplied are included, as opening the file would. A missing file
+    raises FileNotFoundError here rather than being created empty.
+    """
+    if not os.path.isfile(json_filename):
+        raise FileNotFoundError(errno.ENOENT, "No such records file", json_filename)
+    source = JsonLinesStorage(json_filename)
+
+    def records():
+        if source._is_legacy_array():
+            yield from source._read_legacy_array()
+            return
+        yield from source.iter_records()
+        entries = source.wal.read_entries()
+        if entries:
+            for line in source._missing_lines(entries):
+                record = source.decode(line)
+                if record is not None:
+                    yield record
+    return records()
+
+
+def copy_records(records: Iterable[Dict], target: RecordStorage, batch_size: int = 10000) -> int:
+    """Append records to ``target`` in batches; returns the count"""
+    copied, pending = 0, []
+    for record in records:
+        pending.append(record)
+        if len(pending) >= batch_size:
+            copied += target.append_many(pending)
+            pending = []
+    return copied + target.append_many(pending)
+
+
+def export_json_lines(source: RecordStorage, json_filename: str) -> int:
+    """Atomically write every record of ``source`` as a JSON Lines file; returns the count"""
+    exported = 0
+
+    def lines():
+        nonlocal exported
+        for record in source.iter_records():
+            exported += 1
+            yield JsonLinesStorage.encode(record)
+
+    atomic_write_lines(json_filename, lines())
+    return exported
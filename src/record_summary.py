@@ -0,0 +1,276 @@
+"""
+Persisted, incrementally updated summary statistics of speech records
+"""
+
+import json
+import math
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+from .record_batch import record_duration
+from .record_storage import RecordStorage
+from .record_wal import atomic_write_lines
+
+SUMMARY_VERSION = 1
+# Width of the duration histogram buckets
+BUCKET_SECONDS = 15
+# Records folded in before the summary is written back to disk
+SAVE_EVERY = 100
+
+
+def _text(value) -> str:
+    """A speaker name or speech type as text: missing or null as "", anything else as str()"""
+    if isinstance(value, str):
+        return value
+    return "" if value is None else str(value)
+
+
+def summary_filename(records_filename: str) -> str:
+    """The summary file kept beside a records file (or binary store directory)"""
+    return os.path.normpath(records_filename) + ".summary.json"
+
+
+class SummaryStats:
+    """Count, sum, sum of squares, extremes and histogram of speech durations.
+
+    Durations are whole seconds, so the sums are exact integers and two
+    summaries of the same records compare equal.
+    """
+
+    __slots__ = ('count', 'total', 'squares', 'minimum', 'maximum', 'histogram')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.squares = 0
+        self.minimum = 0
+        self.maximum = 0
+        # Bucket number (duration // BUCKET_SECONDS) -> speeches
+        self.histogram: Dict[int, int] = {}
+
+    def add(self, duration: int):
+        if not self.count or duration < self.minimum:
+            self.minimum = duration
+        if not self.count or duration > self.maximum:
+            self.maximum = duration
+        self.count += 1
+        self.total += duration
+        self.squares += duration * duration
+        bucket = duration // BUCKET_SECONDS
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def merge(self, other: "SummaryStats"):
+        if not other.count:
+            return
+        if not self.count or other.minimum < self.minimum:
+            self.minimum = other.minimum
+        if not self.count or other.maximum > self.maximum:
+            self.maximum = other.maximum
+        self.count += other.count
+        self.total += other.total
+        self.squares += other.squares
+        for bucket, count in other.histogram.items():
+            self.histogram[bucket] = self.histogram.get(bucket, 0) + count
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def stddev(self) -> float:
+        """Population standard deviation"""
+        if not self.count:
+            return 0.0
+        return math.sqrt(max(0.0, self.squares / self.count - self.mean ** 2))
+
+    def percentile(self, fraction: float) -> int:
+        """Approximate percentile: the middle of the histogram bucket holding it"""
+        if not self.count:
+            return 0
+        rank = fraction * (self.count - 1)
+        seen = 0
+        for bucket in sorted(self.histogram):
+            seen += self.histogram[bucket]
+            if seen > rank:
+                middle = bucket * BUCKET_SECONDS + BUCKET_SECONDS // 2
+                return min(max(middle, self.minimum), self.maximum)
+        return self.maximum
+
+    def copy(self) -> "SummaryStats":
+        stats = SummaryStats.__new__(SummaryStats)
+        stats.count, stats.total, stats.squares = self.count, self.total, self.squares
+        stats.minimum, stats.maximum = self.minimum, self.maximum
+        stats.histogram = dict(self.histogram)
+        return stats
+
+    def to_list(self) -> List:
+        return [self.count, self.total, self.squares, self.minimum, self.maximum,
+                {str(bucket): count for bucket, count in sorted(self.histogram.items())}]
+
+    @classmethod
+    def from_list(cls, values: List) -> "SummaryStats":
+        stats = cls()
+        stats.count, stats.total, stats.squares, stats.minimum, stats.maximum, histogram = values
+        stats.histogram = {int(bucket): count for bucket, count in histogram.items()}
+        return stats
+
+    def __eq__(self, other):
+        return isinstance(other, SummaryStats) and self.to_list() == other.to_list()
+
+
+class RecordSummary:
+    """Duration statistics per (speaker, speech type) for a whole records store.
+
+    Speakers are grouped ignoring case, as in the records viewer. The
+    summary remembers the storage ``position`` it has read up to, so it is
+    brought up to date by reading only the records appended since - by
+    this process or any other - and rebuilt only when the records were
+    cleared or rewritten.
+    """
+
+    def __init__(self):
+        self.groups: Dict[Tuple[str, str], SummaryStats] = {}
+        # Case-folded speaker -> name as first recorded
+        self.speakers: Dict[str, str] = {}
+        self.records = 0
+        self.position: Optional[List] = None
+
+    def clear(self):
+        """Forget everything, back to the beginning of the storage"""
+        self.groups.clear()
+        self.speakers.clear()
+        self.records = 0
+        self.position = None
+
+    def add(self, record: Dict) -> bool:
+        """Fold one record dictionary in; returns False if it was skipped.
+
+        Like ``RecordBatch``, records whose duration is not a number are
+        skipped and everything else is kept: a null or non-string speaker
+        or speech type is counted under its text form.
+        """
+        duration = record_duration(record)
+        if duration is None:
+            return False
+        speaker = _text(record.get("speaker_name"))
+        folded = speaker.casefold()
+        key = (folded, _text(record.get("speech_type")))
+        stats = self.groups.get(key)
+        if stats is None:
+            stats = self.groups[key] = SummaryStats()
+            self.speakers.setdefault(folded, speaker)
+        stats.add(duration)
+        self.records += 1
+        return True
+
+    def extend(self, records: Iterable[Dict]) -> int:
+        """Fold records in; returns how many were not skipped"""
+        return sum(1 for record in records if self.add(record))
+
+    def catch_up(self, storage: RecordStorage) -> int:
+        """Read the records stored since ``position``; returns how many were folded in"""
+        chunks = storage.read_since(self.position)
+        if chunks is None:
+            self.clear()
+            chunks = storage.read_since(None)
+        added = 0
+        for records, position in chunks:
+            added += self.extend(records)
+            self.position = position
+        return added
+
+    def totals(self, speaker: Optional[str] = None, speech_type: Optional[str] = None) -> SummaryStats:
+        """Statistics of one speaker, one speech type, both or everything"""
+        folded = speaker.casefold() if speaker is not None else None
+        result = SummaryStats()
+        for (group_speaker, group_type), stats in self.groups.items():
+            if (folded is None or group_speaker == folded) and (speech_type is None or group_type == speech_type):
+                result.merge(stats)
+        return result
+
+    def by_type(self) -> Dict[str, SummaryStats]:
+        """Statistics per speech type value"""
+        result: Dict[str, SummaryStats] = {}
+        for (_, speech_type), stats in self.groups.items():
+            result.setdefault(speech_type, SummaryStats()).merge(stats)
+        return result
+
+    def by_speaker(self) -> Dict[str, SummaryStats]:
+        """Statistics per speaker, keyed by the name as first recorded"""
+        result: Dict[str, SummaryStats] = {}
+        for (speaker, _), stats in self.groups.items():
+            result.setdefault(self.speakers[speaker], SummaryStats()).merge(stats)
+        return result
+
+    def copy(self) -> "RecordSummary":
+        summary = RecordSummary()
+        summary.groups = {key: stats.copy() for key, stats in self.groups.items()}
+        summary.speakers = dict(self.speakers)
+        summary.records = self.records
+        summary.position = self.position
+        return summary
+
+    def differences(self, other: "RecordSummary", limit: int = 20) -> List[str]:
+        """Human-readable differences from another summary (empty if they agree)"""
+        problems = []
+        if self.records != other.records:
+            problems.append(f"record count {self.records} != {other.records}")
+        for key in sorted(set(self.groups) | set(other.groups)):
+            mine, theirs = self.groups.get(key), other.groups.get(key)
+            if mine != theirs:
+                speaker = self.speakers.get(key[0]) or other.speakers.get(key[0])
+                describe = lambda stats: stats.to_list()[:5] if stats is not None else "missing"
+                problems.append(f"{speaker} / {key[1]}: {describe(mine)} != {describe(theirs)}")
+        if len(problems) > limit:
+            problems[limit:] = [f"... and {len(problems) - limit} more"]
+        return problems
+
+    def to_json(self) -> str:
+        groups = [[self.speakers[speaker], speech_type] + stats.to_list()
+                  for (speaker, speech_type), stats in self.groups.items()]
+        return json.dumps({"version": SUMMARY_VERSION, "bucket_seconds": BUCKET_SECONDS,
+                           "records": self.records, "position": self.position, "groups": groups},
+                          separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, text: str) -> "RecordSummary":
+        """Parse a saved summary; raises ValueError if it is not one this version wrote"""
+        data = json.loads(text)
+        if (not isinstance(data, dict) or data.get("version") != SUMMARY_VERSION
+                or data.get("bucket_seconds") != BUCKET_SECONDS):
+            raise ValueError("unsupported summary format")
+        summary = cls()
+        try:
+            for group in data["groups"]:
+                speaker, speech_type, values = group[0], group[1], group[2:]
+                folded = speaker.casefold()
+                summary.speakers.setdefault(folded, speaker)
+                summary.groups[(folded, speech_type)] = SummaryStats.from_list(values)
+            summary.records = data["records"]
+            summary.position = data["position"]
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise ValueError(f"malformed summary - {e}") from None
+        return summary
+
+
+def load_summary(filename: str) -> Optional[RecordSummary]:
+    """Read a saved summary; None if it is missing or unreadable (it will be rebuilt)"""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return RecordSummary.from_json(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not load records summary, rebuilding it - {e}")
+        return None
+
+
+def save_summary(filename: str, summary: RecordSummary):
+    """Atomically replace the summary file"""
+    atomic_write_lines(filename, [summary.to_json() + "\n"])
+
+
+def build_summary(storage: RecordStorage) -> RecordSummary:
+    """Summarize every stored record from scratch"""
+    summary = RecordSummary()
+    summary.catch_up(storage)
+    return summary
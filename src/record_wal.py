@@ -0,0 +1,146 @@
+"""
+Write-ahead log for the Toastmaster Timer App speech records
+"""
+
+import os
+import threading
+import zlib
+from typing import List
+
+
+def fsync_directory(path: str):
+    """Flush a directory entry so a rename inside it survives a crash"""
+    if os.name != 'posix':
+        return
+    directory = os.path.dirname(os.path.abspath(path))
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_lines(filename: str, lines: List[str]):
+    """Replace a file with the given lines using write-to-temp and rename.
+
+    Readers see either the old contents or the new contents, never a
+    partially written file.
+    """
+    temp_filename = f"{filename}.tmp.{os.getpid()}"
+    try:
+        with open(temp_filename, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_filename, filename)
+    finally:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+    fsync_directory(filename)
+
+
+class WriteAheadLog:
+    """Durable, checksummed log of records that are not yet checkpointed.
+
+    Each entry is written as ``<crc32> <line>`` and fsync'd before
+    ``sync()`` returns. With a positive ``commit_window`` the first writer
+    waits up to that many seconds so concurrent writers can share a single
+    fsync (group commit). It only waits while other threads of this process
+    are between ``write()`` and ``sync()``; a lone writer syncs at once.
+    Writers in other processes have their own log handles and fsyncs.
+    """
+
+    def __init__(self, filename: str, commit_window: float = 0.0):
+        self.filename = filename
+        self.commit_window = max(0.0, commit_window)
+        self._file = None
+        self._condition = threading.Condition()
+        self._written = 0
+        self._synced = 0
+        self._syncing = False
+        # Threads that have written an entry and not yet returned from sync()
+        self._in_flight = 0
+
+    def write(self, line: str) -> int:
+        """Write an entry without syncing; returns its sequence number"""
+        data = line.encode('utf-8')
+        entry = b"%08x " % zlib.crc32(data) + data
+        if not entry.endswith(b"\n"):
+            entry += b"\n"
+        with self._condition:
+            handle = self._open()
+            handle.write(entry)
+            handle.flush()
+            self._written += 1
+            self._in_flight += 1
+            return self._written
+
+    def sync(self, sequence: int):
+        """Block until the entry with the given sequence number is on disk"""
+        with self._condition:
+            try:
+                while self._synced < sequence:
+                    if self._syncing:
+                        self._condition.wait()
+                        continue
+                    self._syncing = True
+                    try:
+                        if self.commit_window > 0 and self._in_flight > 1:
+                            # Let the other writers join this commit group
+                            self._condition.wait(self.commit_window)
+                        target = self._written
+                        handle = self._file
+                        self._condition.release()
+                        try:
+                            if handle is not None:
+                                os.fsync(handle.fileno())
+                        finally:
+                            self._condition.acquire()
+                        self._synced = max(self._synced, target)
+                    finally:
+                        self._syncing = False
+                        self._condition.notify_all()
+            finally:
+                self._in_flight -= 1
+
+    def read_entries(self) -> List[str]:
+        """Return the intact entries in the log, stopping at a torn tail"""
+        if not os.path.exists(self.filename):
+            return []
+        entries = []
+        with open(self.filename, 'rb') as f:
+            for raw in f:
+                if not raw.endswith(b"\n") or len(raw) < 10 or raw[8:9] != b" ":
+                    break
+                data = raw[9:]
+                try:
+                    checksum = int(raw[:8], 16)
+                except ValueError:
+                    break
+                if zlib.crc32(data) != checksum:
+                    break
+                entries.append(data.decode('utf-8'))
+        return entries
+
+    def reset(self):
+        """Discard all entries once they are safely checkpointed"""
+        with self._condition:
+            handle = self._open()
+            handle.seek(0)
+            handle.truncate()
+            handle.flush()
+            os.fsync(handle.fileno())
+            self._synced = self._written
+            self._condition.notify_all()
+
+    def close(self):
+        """Close the log file handle"""
+        with self._condition:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.filename, 'ab')
+        return self._file
@@ -0,0 +1,174 @@
+"""
+Paged speech records viewer for the Toastmaster Timer App
+"""
+
+import heapq
+from datetime import datetime
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
+from .record_batch import RecordBatch, timestamp_to_micros
+from .speech_record import SpeechRecord
+
+SORT_FIELDS = ("date", "duration")
+
+
+class RecordFilter(NamedTuple):
+    """Which records to show; unset fields match everything"""
+    speaker: Optional[str] = None
+    speech_type: Optional[str] = None
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+    def describe(self) -> str:
+        parts = []
+        if self.speaker:
+            parts.append(f"speaker '{self.speaker}'")
+        if self.speech_type:
+            parts.append(self.speech_type.replace('_', ' ').title())
+        if self.start:
+            parts.append(f"from {self.start:%Y-%m-%d}")
+        if self.end:
+            parts.append(f"before {self.end:%Y-%m-%d}")
+        return ", ".join(parts) or "all records"
+
+
+class RecordPage(NamedTuple):
+    """One page of records and where it sits in the result"""
+    number: int
+    records: List[SpeechRecord]
+    matches: int
+    has_previous: bool
+    has_next: bool
+
+
+class RecordPager:
+    """Keyset-paginated, filtered and sorted view over a RecordManager.
+
+    Each page starts after the sort key of the previous page's last row,
+    so records added while paging never shift rows between pages.
+
+    Indexed backends answer a page with ``find_page``: SQLite filters,
+    orders and limits in SQL, and the binary store reads only index
+    candidates, so nothing beyond the page is held in memory. For the
+    JSON lines backend the filter runs over the record cache's
+    ``RecordBatch`` (the whole archive, kept in memory and shared with
+    the rest of the app) and matching row numbers stream through
+    ``heapq.nsmallest`` bounded by one page; only the rows on the page
+    are turned into ``SpeechRecord`` objects.
+    """
+
+    def __init__(self, record_manager, record_filter: Optional[RecordFilter] = None,
+                 sort: str = "date", descending: bool = True, page_size: int = 20):
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Unknown sort field: {sort!r} (expected one of {', '.join(SORT_FIELDS)})")
+        self.record_manager = record_manager
+        self.record_filter = record_filter or RecordFilter()
+        self.sort = sort
+        self.descending = descending
+        self.page_size = max(1, page_size)
+        # Sort key each page starts after; None for the first page
+        self._starts: List[Optional[Tuple]] = [None]
+        self._last_key: Optional[Tuple] = None
+        self._has_next = False
+
+    def _matching_rows(self, batch: RecordBatch) -> Iterator[int]:
+        """Row numbers of records passing the filter, in storage order"""
+        record_filter = self.record_filter
+        speaker_ids = type_ids = None
+        if record_filter.speaker:
+            key = record_filter.speaker.casefold()
+            speaker_ids = {speaker_id for speaker_id, name in enumerate(batch.speakers) if name.casefold() == key}
+        if record_filter.speech_type:
+            type_ids = {type_id for type_id, value in enumerate(batch.types) if value == record_filter.speech_type}
+        start = timestamp_to_micros(record_filter.start.isoformat()) if record_filter.start else None
+        end = timestamp_to_micros(record_filter.end.isoformat()) if record_filter.end else None
+
+        for row in range(len(batch)):
+            if speaker_ids is not None and batch.speaker_ids[row] not in speaker_ids:
+                continue
+            if type_ids is not None and batch.type_ids[row] not in type_ids:
+                continue
+            if start is not None and batch.timestamps[row] < start:
+                continue
+            if end is not None and batch.timestamps[row] >= end:
+                continue
+            yield row
+
+    def _sort_key(self, batch: RecordBatch) -> Callable[[int], Tuple]:
+        """Unique ascending key per row; the row number breaks ties"""
+        column = batch.timestamps if self.sort == "date" else batch.durations
+        if self.descending:
+            return lambda row: (-column[row], -row)
+        return lambda row: (column[row], row)
+
+    def _load_indexed(self, storage) -> RecordPage:
+        record_filter = self.record_filter
+        found, matches = storage.find_page(
+            self.sort, self.descending, self._starts[-1], self.page_size + 1,
+            speaker=record_filter.speaker or None, speech_type=record_filter.speech_type or None,
+            start=timestamp_to_micros(record_filter.start.isoformat()) if record_filter.start else None,
+            end=timestamp_to_micros(record_filter.end.isoformat()) if record_filter.end else None)
+        self._has_next = len(found) > self.page_size
+        found = found[:self.page_size]
+        self._last_key = found[-1][0] if found else None
+        return RecordPage(len(self._starts), [SpeechRecord.from_dict(record) for _, record in found],
+                          matches, len(self._starts) > 1, self._has_next)
+
+    def _load(self) -> RecordPage:
+        storage = self.record_manager.storage
+        if storage.indexed:
+            return self._load_indexed(storage)
+        batch = self.record_manager.get_record_batch()
+        key = self._sort_key(batch)
+        after = self._starts[-1]
+        matches = 0
+
+        def candidates():
+            nonlocal matches
+            for row in self._matching_rows(batch):
+                matches += 1
+                if after is None or key(row) > after:
+                    yield row
+
+        # One extra row tells whether another page follows
+        rows = heapq.nsmallest(self.page_size + 1, candidates(), key=key)
+        self._has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self._last_key = key(rows[-1]) if rows else None
+        return RecordPage(len(self._starts), batch.rows(rows), matches,
+                          len(self._starts) > 1, self._has_next)
+
+    def page(self) -> RecordPage:
+        """Reload the current page"""
+        return self._load()
+
+    def first_page(self) -> RecordPage:
+        self._starts = [None]
+        return self._load()
+
+    def next_page(self) -> RecordPage:
+        """Move forward one page (stays on the last page at the end)"""
+        if self._has_next and self._last_key is not None:
+            self._starts.append(self._last_key)
+        return self._load()
+
+    def previous_page(self) -> RecordPage:
+        """Move back one page (stays on the first page at the start)"""
+        if len(self._starts) > 1:
+            self._starts.pop()
+        return self._load()
+
+    def set_filter(self, record_filter: RecordFilter) -> RecordPage:
+        self.record_filter = record_filter
+        return self.first_page()
+
+    def set_sort(self, sort: str, descending: bool) -> RecordPage:
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Unknown sort field: {sort!r} (expected one of {', '.join(SORT_FIELDS)})")
+        self.sort = sort
+        self.descending = descending
+        return self.first_page()
+
+    def describe_sort(self) -> str:
+        if self.sort == "date":
+            return "newest first" if self.descending else "oldest first"
+        return "longest first" if self.descending else "shortest first"
@@ -0,0 +1,61 @@
+"""
+Differential screen rendering for the Toastmaster Timer App
+"""
+
+from typing import List, Optional
+from .terminal import TerminalBackend
+
+
+class FrameRenderer:
+    """Draws full-screen frames, sending only what changed since the last one.
+
+    The first frame (or any frame after ``invalidate``) clears the screen and
+    is written in full. Later frames are compared row by row with the
+    previous one; unchanged rows are skipped and changed rows are rewritten
+    from the first differing column using cursor positioning. Backends that
+    cannot position the cursor always get a full redraw.
+    """
+
+    def __init__(self, terminal: TerminalBackend):
+        self.terminal = terminal
+        self._previous: Optional[List[str]] = None
+
+    def invalidate(self):
+        """Force the next frame to repaint the whole screen"""
+        self._previous = None
+
+    def render(self, lines: List[str]):
+        """Draw a frame, as a diff against the previous frame when possible"""
+        terminal = self.terminal
+        if self._previous is None or not terminal.supports_cursor:
+            terminal.clear_screen()
+            terminal.write("\n".join(lines) + "\n")
+        else:
+            terminal.write(self.diff(self._previous, lines))
+        terminal.flush()
+        self._previous = list(lines)
+
+    @staticmethod
+    def diff(previous: List[str], lines: List[str]) -> str:
+        """Escape sequences that turn the previous frame into the new one"""
+        out = []
+        for row in range(max(len(previous), len(lines))):
+            old = previous[row] if row < len(previous) else ""
+            new = lines[row] if row < len(lines) else ""
+            if old == new:
+                continue
+            start = 0
+            limit = min(len(old), len(new))
+            while start < limit and old[start] == new[start]:
+                start += 1
+            # Wide characters (emoji) and escape sequences make columns
+            # unpredictable, so only skip an unchanged plain-text prefix
+            prefix = old[:start]
+            if not prefix.isascii() or "\033" in prefix:
+                start = 0
+            out.append(f"\033[{row + 1};{start + 1}H{new[start:]}\033[K")
+        if not out:
+            return ""
+        # Park the cursor below the frame, where a full redraw would leave it
+        out.append(f"\033[{len(lines) + 1};1H")
+        return "".join(out)
@@ -0,0 +1,428 @@
+"""
+Network timer signal server for the Toastmaster Timer App
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+from .metrics import metrics
+from .speech_types import TimerColor
+from .timer_engine import TimerUpdate
+
+DEFAULT_PORT = 8765
+# Loopback only unless an address is given: the stream is unauthenticated
+DEFAULT_HOST = "127.0.0.1"
+# A subscriber whose unsent output grows past this is too slow and is dropped
+MAX_PENDING_BYTES = 64 * 1024
+MAX_REQUEST_BYTES = 8 * 1024
+KEEPALIVE_SECONDS = 15.0
+
+_SSE_HEADERS = (b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/event-stream\r\n"
+                b"Cache-Control: no-cache\r\n"
+                b"Connection: keep-alive\r\n"
+                b"Access-Control-Allow-Origin: *\r\n\r\n")
+_NOT_FOUND = (b"HTTP/1.1 404 Not Found\r\nContent-Type: text/plain\r\n"
+              b"Content-Length: 10\r\nConnection: close\r\n\r\nNot found\n")
+_LINE_KEEPALIVE = b"\n"
+_SSE_KEEPALIVE = b": keepalive\n\n"
+
+# Full-screen signal page for a browser on the speaker's screen
+SIGNAL_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Speech timer</title>
+<style>
+html, body { margin: 0; height: 100%; background: #000; color: #fff; font-family: sans-serif; }
+body { display: flex; align-items: center; justify-content: center; transition: background 0.2s; }
+#time { font-size: 20vw; opacity: 0.6; }
+</style></head>
+<body><div id="time"></div>
+<script>
+var colors = {green: "#1a9e3a", yellow: "#f2c200", red: "#d01c1c", "": "#000"};
+// Contest rooms only send transitions, so count on locally from the last update
+var last = null, received = 0;
+function show() {
+  if (!last) return;
+  var seconds = last.elapsed;
+  if (last.kind != "stopped") seconds += Math.floor((Date.now() - received) / 1000);
+  document.getElementById("time").textContent =
+    Math.floor(seconds / 60) + ":" + String(seconds % 60).padStart(2, "0");
+}
+var source = new EventSource("/events" + location.search);
+source.onmessage = function (message) {
+  last = JSON.parse(message.data);
+  received = Date.now();
+  document.body.style.background = colors[last.color] || "#000";
+  show();
+};
+setInterval(show, 250);
+</script></body></html>
+""".encode('utf-8')
+_PAGE_RESPONSE = (b"HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n"
+                  b"Content-Length: " + str(len(SIGNAL_PAGE)).encode() + b"\r\n"
+                  b"Connection: close\r\n\r\n" + SIGNAL_PAGE)
+
+
+def encode_update(update: TimerUpdate, room: str = "", seq: int = 0) -> bytes:
+    """JSON payload of a timer update, without framing"""
+    return json.dumps({
+        "room": room,
+        "kind": update.kind,
+        "speech_type": update.speech_type.value if update.speech_type else None,
+        "elapsed": update.elapsed,
+        "color": update.color.value,
+        "event": update.event_type.value if update.event_type else None,
+        "seq": seq,
+        "sent": time.time()
+    }, separators=(',', ':')).encode('utf-8')
+
+
+class _Subscriber(asyncio.Protocol):
+    """One connection: waits for its request, then only receives frames.
+
+    ``GET /events[?room=NAME]`` gets Server-Sent Events, ``GET /`` the
+    signal page, and a first line of ``SUBSCRIBE [NAME]`` JSON lines.
+    """
+
+    def __init__(self, worker: "_Worker"):
+        self.worker = worker
+        self.transport: Optional[asyncio.Transport] = None
+        self.sse = False
+        self.room: Optional[str] = None
+        self._request = b""
+
+    def connection_made(self, transport):
+        self.transport = transport
+        sock = transport.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def data_received(self, data: bytes):
+        if self._request is None:
+            return  # Subscribers have nothing more to say; ignore it
+        self._request += data
+        if self._request.startswith(b"GET "):
+            if b"\r\n\r\n" not in self._request and b"\n\n" not in self._request:
+                return self._check_size()
+            self._handle_http(self._request.split(b"\n", 1)[0])
+        else:
+            if b"\n" not in self._request:
+                return self._check_size()
+            self._handle_line(self._request.split(b"\n", 1)[0])
+        self._request = None
+
+    def _check_size(self):
+        if len(self._request) > MAX_REQUEST_BYTES:
+            self.transport.close()
+
+    def _handle_http(self, request_line: bytes):
+        try:
+            target = request_line.split()[1].decode('ascii')
+        except (IndexError, UnicodeDecodeError):
+            target = ""
+        url = urlsplit(target)
+        if url.path == "/":
+            self.transport.write(_PAGE_RESPONSE)
+            self.transport.close()
+        elif url.path == "/events":
+            self.sse = True
+            self.room = parse_qs(url.query).get("room", [None])[0]
+            self.transport.write(_SSE_HEADERS)
+            self.worker._subscribe(self)
+        else:
+            self.transport.write(_NOT_FOUND)
+            self.transport.close()
+
+    def _handle_line(self, line: bytes):
+        words = line.decode('utf-8', 'replace').split(None, 1)
+        if not words or words[0].upper() != "SUBSCRIBE":
+            self.transport.write(b'{"error":"expected SUBSCRIBE [room]"}\n')
+            self.transport.close()
+            return
+        self.room = words[1].strip() if len(words) > 1 else None
+        self.worker._subscribe(self)
+
+    def connection_lost(self, exc):
+        self.worker._unsubscribe(self)
+
+
+class _Worker:
+    """One event loop thread serving a share of the subscribers"""
+
+    def __init__(self, server: "SignalServer", index: int):
+        self.server = server
+        self.index = index
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self.dropped = 0
+        self._listener: Optional[asyncio.AbstractServer] = None
+        # Subscribers by room; None follows every room
+        self._rooms: Dict[Optional[str], Set[_Subscriber]] = {}
+
+    def start(self, sock: socket.socket, ready: threading.Event, failure: List[BaseException]):
+        loop = asyncio.new_event_loop()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            try:
+                self._listener = loop.run_until_complete(
+                    loop.create_server(lambda: _Subscriber(self), sock=sock))
+            except OSError as e:
+                failure.append(e)
+                ready.set()
+                loop.close()
+                return
+            self.loop = loop
+            loop.call_later(KEEPALIVE_SECONDS, self._keepalive)
+            ready.set()
+            try:
+                loop.run_forever()
+            finally:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.close()
+
+        self.thread = threading.Thread(target=run, name=f"signal-server-{self.index}", daemon=True)
+        self.thread.start()
+
+    def broadcast(self, room: str, frames: Tuple[bytes, bytes]):
+        line, sse = frames
+        with metrics.timer("toastmaster_signal_broadcast_seconds", "Time to hand one frame to every subscriber"):
+            for key in (None, room):
+                subscribers = self._rooms.get(key)
+                if not subscribers:
+                    continue
+                for subscriber in list(subscribers):
+                    self._send(subscriber, sse if subscriber.sse else line)
+
+    def _send(self, subscriber: _Subscriber, frame: bytes):
+        transport = subscriber.transport
+        if transport.get_write_buffer_size() > MAX_PENDING_BYTES:
+            self.dropped += 1
+            metrics.inc("toastmaster_signal_dropped_total", help_text="Slow signal subscribers disconnected")
+            transport.abort()
+            return
+        transport.write(frame)
+
+    def _subscribe(self, subscriber: _Subscriber):
+        self._rooms.setdefault(subscriber.room, set()).add(subscriber)
+        for line, sse in self.server._replay(subscriber.room):
+            subscriber.transport.write(sse if subscriber.sse else line)
+
+    def _unsubscribe(self, subscriber: _Subscriber):
+        subscribers = self._rooms.get(subscriber.room)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+
+    def _keepalive(self):
+        """Let idle connections (and proxies) know the server is still there"""
+        for subscribers in self._rooms.values():
+            for subscriber in list(subscribers):
+                self._send(subscriber, _SSE_KEEPALIVE if subscriber.sse else _LINE_KEEPALIVE)
+        self.loop.call_later(KEEPALIVE_SECONDS, self._keepalive)
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._rooms.values())
+
+    def stop(self):
+        loop, self.loop = self.loop, None
+        if loop is None:
+            return
+
+        def shutdown():
+            self._listener.close()
+            for subscribers in self._rooms.values():
+                for subscriber in subscribers:
+                    subscriber.transport.close()
+            self._rooms.clear()
+            # Let the transports flush their close before stopping
+            loop.call_soon(loop.stop)
+
+        loop.call_soon_threadsafe(shutdown)
+        self.thread.join()
+
+
+class SignalServer:
+    """Publishes timer updates to remote signal screens over TCP.
+
+    Attach it to a TimerEngine (or TimerController) and/or TimerRegistry
+    and call ``start()``; the server runs asyncio event loops on daemon
+    threads. Each update is encoded once, on the timer's thread, into one
+    shared Server-Sent Events frame and one JSON line; the loops then hand
+    the same bytes object to every subscriber's transport, so the cost per
+    subscriber is a single non-blocking send. Subscribers that stop
+    reading are disconnected rather than buffered for.
+
+    The stream has no authentication and allows any web origin, so the
+    server listens on loopback unless given a host; pass ``0.0.0.0`` (or
+    a LAN address) to serve screens on other machines of a trusted network.
+
+    With ``workers`` > 1 the listening socket is shared by that many
+    loops and each accepts its own share of subscribers. Sends release
+    the GIL, so on a multi-core machine the fan-out runs in parallel.
+
+    New subscribers immediately receive the latest update of every room
+    they follow, so a screen that (re)connects mid-speech shows the
+    current colour.
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: Optional[int] = None):
+        self.host = host
+        self.port = port
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.frames_published = 0
+        self._workers: List[_Worker] = []
+        # Latest (line, sse) frames by room, replayed to new subscribers
+        self._latest: Dict[str, Tuple[bytes, bytes]] = {}
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._attached: List = []
+
+    # -- timer side (any thread) --
+
+    def attach(self, engine):
+        """Publish every update of a TimerEngine or TimerController (room "")"""
+        engine = getattr(engine, 'engine', engine)
+        engine.add_listener(self.publish)
+        self._attached.append(engine)
+
+    def attach_registry(self, registry):
+        """Publish the transitions and stops of every contest room, by room name"""
+        registry.add_listener(lambda name, update: self.publish(update, name))
+
+    def publish(self, update: TimerUpdate, room: str = ""):
+        """Encode an update once and send it to the room's subscribers; thread-safe"""
+        with self._lock:
+            self._seq += 1
+            payload = encode_update(update, room, self._seq)
+            frames = (payload + b"\n", b"data: " + payload + b"\n\n")
+            self._latest[room] = frames
+            self.frames_published += 1
+        for worker in self._workers:
+            loop = worker.loop
+            if loop is None:
+                continue
+            try:
+                loop.call_soon_threadsafe(worker.broadcast, room, frames)
+            except RuntimeError:
+                pass  # Loop already closed during shutdown
+
+    def _replay(self, room: Optional[str]) -> List[Tuple[bytes, bytes]]:
+        """Latest frames a new subscriber to ``room`` should see"""
+        with self._lock:
+            if room is None:
+                return list(self._latest.values())
+            return [self._latest[room]] if room in self._latest else []
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(worker.subscriber_count for worker in self._workers)
+
+    @property
+    def subscribers_dropped(self) -> int:
+        return sum(worker.dropped for worker in self._workers)
+
+    # -- lifecycle --
+
+    def start(self) -> int:
+        """Start serving on background threads; returns the bound port"""
+        if self._workers:
+            return self.port
+        listening = socket.create_server((self.host, self.port), backlog=4096)
+        listening.setblocking(False)
+        self.port = listening.getsockname()[1]
+        failure: List[BaseException] = []
+        try:
+            for index in range(self.workers):
+                worker = _Worker(self, index)
+                ready = threading.Event()
+                # Each loop owns a duplicate descriptor of the one listening socket
+                worker.start(listening.dup(), ready, failure)
+                ready.wait()
+                if failure:
+                    break
+                self._workers.append(worker)
+        finally:
+            listening.close()
+        if failure:
+            self.stop()
+            raise failure[0]
+        return self.port
+
+    def stop(self):
+        """Disconnect every subscriber and stop the server threads"""
+        for engine in self._attached:
+            engine.remove_listener(self.publish)
+        self._attached.clear()
+        for worker in self._workers:
+            worker.stop()
+        self._workers = []
+
+
+def parse_address(address: str, default_host: str = DEFAULT_HOST) -> Tuple[str, int]:
+    """Split ``HOST:PORT``, ``:PORT`` or ``PORT`` into (host, port); the host defaults to loopback"""
+    host, _, port = address.rpartition(":")
+    try:
+        return host or default_host, int(port)
+    except ValueError:
+        raise ValueError(f"Invalid address {address!r}; expected HOST:PORT") from None
+
+
+def subscribe(host: str, port: int = DEFAULT_PORT, room: Optional[str] = None,
+              timeout: Optional[float] = None) -> Iterator[Dict]:
+    """Connect with the line protocol and yield each update as a dictionary"""
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.sendall(f"SUBSCRIBE {room}\n".encode('utf-8') if room else b"SUBSCRIBE\n")
+        with sock.makefile('rb') as stream:
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def watch(host: str, port: int = DEFAULT_PORT, room: Optional[str] = None):
+    """Test client: paint this terminal with the signal colour of a remote timer"""
+    from .display_manager import DisplayManager
+    color = None
+    try:
+        for update in subscribe(host, port, room):
+            latency = (time.time() - update["sent"]) * 1000
+            new_color = TimerColor(update["color"])
+            if new_color != color:
+                DisplayManager.set_background_color(new_color)
+                color = new_color
+            elapsed = update["elapsed"]
+            label = f"[{update['room']}] " if update["room"] else ""
+            print(f"\r{label}{update['speech_type'] or ''} {elapsed // 60:02d}:{elapsed % 60:02d} "
+                  f"{update['kind']:<10} {latency:6.1f} ms", end="", flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        DisplayManager.set_background_color(TimerColor.BLANK)
+        print()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line: ``python -m src.signal_server watch HOST:PORT [--room NAME]``"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Remote speech timer signal screen")
+    parser.add_argument("command", choices=["watch"])
+    parser.add_argument("address", nargs="?", default=f"{DEFAULT_HOST}:{DEFAULT_PORT}",
+                        help="signal server HOST:PORT")
+    parser.add_argument("--room", help="only follow this contest room")
+    args = parser.parse_args(argv)
+    host, port = parse_address(args.address)
+    try:
+        watch(host, port, args.room)
+    except OSError as e:
+        print(f"Cannot connect to {host}:{port}: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,65 @@
+"""
+Accelerated speech simulation for the Toastmaster Timer App
+"""
+
+from typing import Dict, List, Optional, Tuple
+from .speech_types import SpeechType, SpeechConfig, TimerColor
+from .clock import ScaledClock, VirtualClock
+from .timer_engine import TimerEngine, TimerUpdate
+from .timing_schedule import TimingEventType
+
+
+def simulate_speech(speech_type: SpeechType, duration: Optional[float] = None,
+                    speed: Optional[float] = None, display: bool = False) -> List[TimerUpdate]:
+    """Replay a speech through the real TimerEngine and return every update.
+
+    With ``speed=None`` the engine runs on a ``VirtualClock`` and finishes
+    instantly; otherwise it runs on a ``ScaledClock`` at that many times
+    real time. ``duration`` defaults to one second past the last event.
+    """
+    if duration is None:
+        duration = max(SpeechConfig.get_red_time(speech_type), SpeechConfig.get_grace_end_time(speech_type)) + 1
+    clock = VirtualClock() if speed is None else ScaledClock(speed)
+    engine = TimerEngine(headless=not display, clock=clock)
+    updates: List[TimerUpdate] = []
+    engine.add_listener(updates.append)
+    engine.run_for(speech_type, duration)
+    return updates
+
+
+def expected_transitions(speech_type: SpeechType, duration: float) -> List[Tuple[int, TimingEventType]]:
+    """Transitions a speech should produce, derived directly from SpeechConfig"""
+    config = SpeechConfig.get_config(speech_type)
+    names = {
+        TimerColor.GREEN: TimingEventType.GREEN,
+        TimerColor.YELLOW: TimingEventType.YELLOW,
+        TimerColor.RED: TimingEventType.RED,
+    }
+    expected = [(at, names[color]) for at, color in config['timings']]
+    if config.get('grace_period', 0) > 0:
+        grace_end = SpeechConfig.get_grace_end_time(speech_type)
+        expected.append((SpeechConfig.get_red_time(speech_type), TimingEventType.GRACE_START))
+        expected.append((grace_end, TimingEventType.GRACE_END))
+        expected.append((grace_end, TimingEventType.DISQUALIFY))
+    expected.sort(key=lambda item: item[0])
+    return [(at, event_type) for at, event_type in expected if at <= duration]
+
+
+def verify_speech_config(speech_type: SpeechType, speed: Optional[float] = None) -> List[str]:
+    """Simulate one speech type and list any differences from its configuration"""
+    duration = max(SpeechConfig.get_red_time(speech_type), SpeechConfig.get_grace_end_time(speech_type)) + 1
+    updates = simulate_speech(speech_type, duration, speed)
+    actual = [(update.elapsed, update.event_type) for update in updates if update.kind == "transition"]
+    expected = expected_transitions(speech_type, duration)
+    problems = []
+    if actual != expected:
+        problems.append(f"{speech_type.value}: expected {expected}, got {actual}")
+    if not updates or updates[-1].kind != "stopped" or updates[-1].elapsed != int(duration):
+        problems.append(f"{speech_type.value}: timer did not stop at {int(duration)}s")
+    return problems
+
+
+def verify_all_configs(speed: Optional[float] = None) -> Dict[SpeechType, List[str]]:
+    """Simulate every configured speech type; returns problems per type"""
+    return {speech_type: verify_speech_config(speech_type, speed)
+            for speech_type in SpeechConfig.get_all_configs()}
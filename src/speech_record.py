@@ -0,0 +1,50 @@
+"""
+Speech record types for the Toastmaster Timer App
+"""
+
+import sys
+from datetime import datetime
+from typing import Dict
+from .speech_types import SpeechType
+
+
+class SpeechRecord:
+    """Represents a single speech record.
+    
+    Uses ``__slots__`` instead of a per-instance ``__dict__``, interns the
+    repeated speaker and type strings, and derives ``duration_formatted``
+    on access rather than storing it.
+    """
+    
+    __slots__ = ('timestamp', 'speech_type', 'speaker_name', 'duration_seconds')
+    
+    def __init__(self, speech_type: SpeechType, speaker_name: str, duration_seconds: int):
+        self.timestamp = datetime.now().isoformat()
+        self.speech_type = speech_type.value
+        self.speaker_name = speaker_name
+        self.duration_seconds = duration_seconds
+    
+    @property
+    def duration_formatted(self) -> str:
+        """Duration as MM:SS"""
+        return f"{self.duration_seconds // 60:02d}:{self.duration_seconds % 60:02d}"
+    
+    def to_dict(self) -> Dict:
+        """Convert record to dictionary for JSON serialization"""
+        return {
+            "timestamp": self.timestamp,
+            "speech_type": self.speech_type,
+            "speaker_name": self.speaker_name,
+            "duration_seconds": self.duration_seconds,
+            "duration_formatted": self.duration_formatted
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SpeechRecord':
+        """Create SpeechRecord from dictionary"""
+        record = cls.__new__(cls)
+        record.timestamp = data.get("timestamp", "")
+        record.speech_type = sys.intern(data.get("speech_type", ""))
+        record.speaker_name = sys.intern(data.get("speaker_name", ""))
+        record.duration_seconds = data.get("duration_seconds", 0)
+        return record
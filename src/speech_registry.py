@@ -0,0 +1,341 @@
+"""
+Speech type definitions loaded from TOML or JSON files for the Toastmaster Timer App
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
+from .speech_types import SpeechType, SpeechConfig, TimerColor
+from .timing_schedule import TimingSchedule
+
+# Looked for in the working directory when no file is given
+DEFAULT_FILES = ("speech_types.toml", "speech_types.json")
+ENVIRONMENT_VARIABLE = "TOASTMASTER_SPEECH_TYPES"
+# How often lookups may stat the definitions file for changes
+RELOAD_CHECK_SECONDS = 1.0
+
+_KEY_PATTERN = re.compile(r"^[a-z][a-z0-9_]*$")
+_FIELDS = {"key", "name", "duration_range", "green", "yellow", "red", "grace_period"}
+_COLORS = (("green", TimerColor.GREEN), ("yellow", TimerColor.YELLOW), ("red", TimerColor.RED))
+
+
+class CustomSpeechType:
+    """A speech type defined in a file rather than in ``SpeechType``.
+
+    Quacks like a ``SpeechType`` member where the app needs it: ``value``
+    is the key stored in records and ``name`` the upper-case identifier.
+    """
+
+    __slots__ = ('value', 'name')
+
+    def __init__(self, value: str):
+        self.value = value
+        self.name = value.upper()
+
+    def __eq__(self, other):
+        return isinstance(other, CustomSpeechType) and other.value == self.value
+
+    def __hash__(self):
+        return hash((CustomSpeechType, self.value))
+
+    def __repr__(self):
+        return f"<CustomSpeechType.{self.name}: {self.value!r}>"
+
+
+SpeechTypeLike = Union[SpeechType, CustomSpeechType]
+
+
+class SpeechDefinition(NamedTuple):
+    """One validated speech type with everything the timer needs precomputed"""
+    speech_type: SpeechTypeLike
+    name: str
+    duration_range: str
+    timings: Tuple[Tuple[int, TimerColor], ...]
+    grace_period: int
+    green_time: int
+    yellow_time: int
+    red_time: int
+    # 0 when the type has no grace period, as in SpeechConfig.get_grace_end_time
+    grace_end_time: int
+    # None when the type has no grace period: its schedule never disqualifies
+    disqualify_time: Optional[int]
+    # Read-only dictionary in the shape of a SpeechConfig.SPEECH_CONFIGS entry
+    config: Mapping
+    schedule: TimingSchedule
+
+    @property
+    def key(self) -> str:
+        return self.speech_type.value
+
+
+class SpeechRegistry:
+    """Immutable, ordered set of speech definitions indexed by key.
+
+    Iterating yields definitions in menu order; ``get`` accepts a key or
+    anything with a ``value`` (a ``SpeechType`` or ``CustomSpeechType``).
+    """
+
+    __slots__ = ('definitions', 'source', '_by_key')
+
+    def __init__(self, definitions: Iterable[SpeechDefinition], source: Optional[str] = None):
+        self.definitions: Tuple[SpeechDefinition, ...] = tuple(definitions)
+        self.source = source
+        self._by_key = MappingProxyType({definition.key: definition for definition in self.definitions})
+
+    def __iter__(self) -> Iterator[SpeechDefinition]:
+        return iter(self.definitions)
+
+    def __len__(self) -> int:
+        return len(self.definitions)
+
+    def __contains__(self, speech_type) -> bool:
+        return self.get(speech_type) is not None
+
+    def get(self, speech_type) -> Optional[SpeechDefinition]:
+        """Definition for a key or speech type, or None if it is not defined"""
+        return self._by_key.get(getattr(speech_type, 'value', speech_type))
+
+    def speech_type(self, key: str) -> SpeechTypeLike:
+        """Speech type for a key; raises ValueError like ``SpeechType(key)``"""
+        definition = self._by_key.get(key)
+        if definition is None:
+            raise ValueError(f"Unknown speech type {key!r} (expected one of {', '.join(self._by_key)})")
+        return definition.speech_type
+
+    def speech_types(self) -> Tuple[SpeechTypeLike, ...]:
+        return tuple(definition.speech_type for definition in self.definitions)
+
+    def menu(self) -> Dict[str, SpeechTypeLike]:
+        """Menu choices "1", "2", ... mapped to speech types, in menu order"""
+        return {str(number): definition.speech_type for number, definition in enumerate(self.definitions, 1)}
+
+
+def _format_time(seconds: int) -> str:
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def _seconds(value, where: str) -> int:
+    """Seconds from an int or an "M:SS" string"""
+    if isinstance(value, bool):
+        raise ValueError(f"{where}: expected seconds or \"M:SS\", got {value!r}")
+    if isinstance(value, int):
+        seconds = value
+    elif isinstance(value, str) and re.fullmatch(r"\d+:[0-5]\d", value.strip()):
+        minutes, secs = value.strip().split(":")
+        seconds = int(minutes) * 60 + int(secs)
+    else:
+        raise ValueError(f"{where}: expected seconds or \"M:SS\", got {value!r}")
+    if seconds <= 0:
+        raise ValueError(f"{where}: must be after the start of the speech")
+    return seconds
+
+
+def compile_definition(speech_type: SpeechTypeLike, name: str, timings: Iterable[Tuple[int, TimerColor]],
+                       grace_period: int, duration_range: Optional[str] = None) -> SpeechDefinition:
+    """Build a definition and precompute its signal times and timing schedule"""
+    timings = tuple(sorted(timings, key=lambda timing: timing[0]))
+    times = {color: at for at, color in timings}
+    red_time = timings[-1][0] if timings else 0
+    grace_end_time = red_time + grace_period if grace_period > 0 else 0
+    if duration_range is None:
+        first = timings[0][0] if timings else 0
+        if first % 60 == 0 and red_time % 60 == 0:
+            duration_range = f"{first // 60}-{red_time // 60} minutes"
+        else:
+            duration_range = f"{_format_time(first)}-{_format_time(red_time)}"
+    config = MappingProxyType({
+        "name": name,
+        "duration_range": duration_range,
+        "timings": timings,
+        "grace_period": grace_period
+    })
+    return SpeechDefinition(
+        speech_type, name, duration_range, timings, grace_period,
+        times.get(TimerColor.GREEN, 0), times.get(TimerColor.YELLOW, 0), red_time,
+        grace_end_time, grace_end_time if grace_period > 0 else None, config,
+        TimingSchedule(speech_type, config))
+
+
+def _builtin_definitions() -> List[SpeechDefinition]:
+    return [compile_definition(speech_type, config["name"], config["timings"],
+                               config.get("grace_period", 0), config["duration_range"])
+            for speech_type, config in SpeechConfig.SPEECH_CONFIGS.items()]
+
+
+def _validate(entry, number: int, source: str, seen: set) -> SpeechDefinition:
+    where = f"{source}: speech type #{number}"
+    if not isinstance(entry, dict):
+        raise ValueError(f"{where}: expected a table of fields")
+    key = entry.get("key")
+    if not isinstance(key, str) or not _KEY_PATTERN.match(key):
+        raise ValueError(f"{where}: 'key' must be lower-case letters, digits and underscores, got {key!r}")
+    where = f"{source}: speech type '{key}'"
+    if key in seen:
+        raise ValueError(f"{where}: defined twice")
+    seen.add(key)
+    unknown = set(entry) - _FIELDS
+    if unknown:
+        raise ValueError(f"{where}: unknown field(s) {', '.join(sorted(unknown))}")
+    name = entry.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError(f"{where}: 'name' is required")
+    if "red" not in entry:
+        raise ValueError(f"{where}: 'red' is required")
+    timings = [(_seconds(entry[field], f"{where}: '{field}'"), color)
+               for field, color in _COLORS if field in entry]
+    for (earlier, earlier_color), (later, later_color) in zip(timings, timings[1:]):
+        if later <= earlier:
+            raise ValueError(f"{where}: {later_color.value} must come after {earlier_color.value}")
+    grace_period = entry.get("grace_period", 0)
+    if isinstance(grace_period, bool) or not isinstance(grace_period, int) or grace_period < 0:
+        raise ValueError(f"{where}: 'grace_period' must be a whole number of seconds")
+    duration_range = entry.get("duration_range")
+    if duration_range is not None and not isinstance(duration_range, str):
+        raise ValueError(f"{where}: 'duration_range' must be text")
+
+    try:
+        speech_type = SpeechType(key)
+    except ValueError:
+        speech_type = CustomSpeechType(key)
+    return compile_definition(speech_type, name.strip(), timings, grace_period, duration_range)
+
+
+def compile_registry(data: Mapping, source: str = "<definitions>") -> SpeechRegistry:
+    """Validate parsed definitions and compile them into a registry.
+
+    ``data`` holds a ``speech_types`` list and optionally
+    ``include_builtins`` (default true). Entries with a built-in key
+    replace that type in place; new keys follow the built-ins in file
+    order. Raises ValueError naming the first problem found.
+    """
+    if not isinstance(data, Mapping):
+        raise ValueError(f"{source}: expected a table with a 'speech_types' list")
+    unknown = set(data) - {"speech_types", "include_builtins"}
+    if unknown:
+        raise ValueError(f"{source}: unknown top-level field(s) {', '.join(sorted(unknown))}")
+    entries = data.get("speech_types", [])
+    if not isinstance(entries, list):
+        raise ValueError(f"{source}: 'speech_types' must be a list")
+    include_builtins = data.get("include_builtins", True)
+    if not isinstance(include_builtins, bool):
+        raise ValueError(f"{source}: 'include_builtins' must be true or false")
+
+    seen = set()
+    custom = [_validate(entry, number, source, seen) for number, entry in enumerate(entries, 1)]
+    definitions = {definition.key: definition for definition in _builtin_definitions()} if include_builtins else {}
+    for definition in custom:
+        definitions[definition.key] = definition
+    if not definitions:
+        raise ValueError(f"{source}: no speech types defined")
+    return SpeechRegistry(definitions.values(), source)
+
+
+def load_registry(filename: str) -> SpeechRegistry:
+    """Parse and compile a .toml or .json definitions file; raises OSError or ValueError"""
+    with open(filename, 'rb') as f:
+        raw = f.read()
+    if filename.lower().endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11: JSON definitions still work
+            raise ValueError(f"{filename}: TOML needs Python 3.11 or newer; use a .json file instead") from None
+        try:
+            data = tomllib.loads(raw.decode('utf-8'))
+        except (tomllib.TOMLDecodeError, UnicodeDecodeError) as e:
+            raise ValueError(f"{filename}: {e}") from None
+    else:
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            raise ValueError(f"{filename}: {e}") from None
+    return compile_registry(data, filename)
+
+
+class _RegistryCache:
+    """The current registry and the file version it was compiled from"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.filename: Optional[str] = None
+        self.explicit = False
+        self.signature = None
+        self.registry: Optional[SpeechRegistry] = None
+        self.checked = float('-inf')
+        self.builtins: Optional[SpeechRegistry] = None
+
+
+_cache = _RegistryCache()
+
+
+def set_definitions_file(filename: Optional[str]):
+    """Use this file for speech types (None: environment variable or default files)"""
+    with _cache.lock:
+        _cache.filename = filename
+        _cache.explicit = filename is not None
+        # Dropped rather than re-validated: with no file the signature is None too
+        _cache.registry = None
+        _cache.signature = None
+        _cache.checked = float('-inf')
+
+
+def _definitions_file() -> Optional[str]:
+    if _cache.explicit:
+        return _cache.filename
+    filename = os.environ.get(ENVIRONMENT_VARIABLE)
+    if filename:
+        return filename
+    for candidate in DEFAULT_FILES:
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def _signature(filename: Optional[str]):
+    if filename is None:
+        return None
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return filename, stat.st_mtime_ns, stat.st_size
+
+
+def get_registry() -> SpeechRegistry:
+    """The current speech types, recompiled only when the definitions file changes.
+
+    The file is checked at most once every ``RELOAD_CHECK_SECONDS``;
+    between checks a lookup is a couple of attribute reads. An edit that
+    fails validation is reported once and the previous registry is kept.
+    """
+    registry = _cache.registry
+    if registry is not None and time.monotonic() - _cache.checked < RELOAD_CHECK_SECONDS:
+        return registry
+    with _cache.lock:
+        _cache.checked = time.monotonic()
+        filename = _definitions_file()
+        signature = _signature(filename)
+        if _cache.registry is not None and signature == _cache.signature:
+            return _cache.registry
+        _cache.signature = signature
+        if signature is None:
+            if _cache.builtins is None:
+                _cache.builtins = SpeechRegistry(_builtin_definitions(), None)
+            _cache.registry = _cache.builtins
+        else:
+            try:
+                _cache.registry = load_registry(filename)
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not load speech types - {e}")
+                if _cache.registry is None:
+                    _cache.builtins = _cache.builtins or SpeechRegistry(_builtin_definitions(), None)
+                    _cache.registry = _cache.builtins
+        return _cache.registry
+
+
+def get_definition(speech_type) -> Optional[SpeechDefinition]:
+    """Current definition of a speech type or key, or None"""
+    return get_registry().get(speech_type)
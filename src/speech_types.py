@@ -24,7 +24,12 @@ class TimerColor(Enum):
 
 
 class SpeechConfig:
-    """Speech configuration data and utilities"""
+    """Speech configuration data and utilities.
+    
+    ``SPEECH_CONFIGS`` holds the built-in types. Lookups go through the
+    speech registry (``src.speech_registry``), which adds or overrides
+    types from a definitions file and precomputes their signal times.
+    """
     
     SPEECH_CONFIGS = {
         SpeechType.ICE_BREAKER: {
@@ -61,27 +66,30 @@ class SpeechConfig:
     
     @classmethod
     def get_config(cls, speech_type: SpeechType) -> Dict:
-        """Get configuration for a specific speech type"""
-        return cls.SPEECH_CONFIGS.get(speech_type, {})
+        """Get configuration for a specific speech type (read-only)"""
+        definition = _get_definition(speech_type)
+        return definition.config if definition is not None else {}
     
     @classmethod
     def get_all_configs(cls) -> Dict[SpeechType, Dict]:
-        """Get all speech configurations"""
-        return cls.SPEECH_CONFIGS
+        """Get all speech configurations, in menu order"""
+        from .speech_registry import get_registry
+        return {definition.speech_type: definition.config for definition in get_registry()}
     
     @classmethod
     def get_red_time(cls, speech_type: SpeechType) -> int:
         """Get the time when red signal starts for a speech type"""
-        config = cls.get_config(speech_type)
-        if config and config.get('timings'):
-            return config['timings'][-1][0]  # Last timing is red
-        return 0
+        definition = _get_definition(speech_type)
+        return definition.red_time if definition is not None else 0
     
     @classmethod
     def get_grace_end_time(cls, speech_type: SpeechType) -> int:
         """Get the time when grace period ends for a speech type"""
-        config = cls.get_config(speech_type)
-        if config and config.get('grace_period', 0) > 0:
-            red_time = cls.get_red_time(speech_type)
-            return red_time + config['grace_period']
-        return 0
+        definition = _get_definition(speech_type)
+        return definition.grace_end_time if definition is not None else 0
+
+
+def _get_definition(speech_type):
+    # Imported here because the registry module builds on this one
+    from .speech_registry import get_definition
+    return get_definition(speech_type)
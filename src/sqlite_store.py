@@ -0,0 +1,298 @@
+"""
+SQLite record storage for the Toastmaster Timer App
+"""
+
+import errno
+import os
+import sqlite3
+import sys
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .metrics import metrics
+from .record_batch import RecordBatch, timestamp_to_micros
+from .record_storage import RecordStorage, copy_records, export_json_lines, read_json_records
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS speech_records (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT NOT NULL,
+        speech_type TEXT NOT NULL,
+        speaker_name TEXT NOT NULL,
+        duration_seconds INTEGER NOT NULL,
+        micros INTEGER
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_records_speaker ON speech_records (speaker_name COLLATE NOCASE)",
+    "CREATE INDEX IF NOT EXISTS idx_records_type ON speech_records (speech_type)",
+    # Bumped by clear() so cached batches in any process know to reload
+    "CREATE TABLE IF NOT EXISTS record_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO record_meta (key, value) VALUES ('generation', 0)",
+)
+
+# Databases written before the micros column get it added and filled in on open
+_MIGRATION = (
+    "ALTER TABLE speech_records ADD COLUMN micros INTEGER",
+    "UPDATE speech_records SET micros = timestamp_micros(timestamp)",
+)
+# The timestamp text keeps its UTC offset; micros is the UTC time it names, for ordering and ranges
+_MICROS_INDEX = (
+    "DROP INDEX IF EXISTS idx_records_timestamp",
+    "CREATE INDEX IF NOT EXISTS idx_records_micros ON speech_records (micros)",
+)
+
+_COLUMNS = "id, timestamp, speech_type, speaker_name, duration_seconds"
+_INSERT = ("INSERT INTO speech_records (timestamp, speech_type, speaker_name, duration_seconds, micros) "
+           "VALUES (?, ?, ?, ?, ?)")
+
+
+def _row_values(record: Dict):
+    timestamp = record.get("timestamp", "")
+    return (timestamp, record.get("speech_type", ""), record.get("speaker_name", ""),
+            int(record.get("duration_seconds", 0)), timestamp_to_micros(timestamp))
+
+
+def _to_dict(row) -> Dict:
+    _, timestamp, speech_type, speaker_name, duration = row
+    return {
+        "timestamp": timestamp,
+        "speech_type": speech_type,
+        "speaker_name": speaker_name,
+        "duration_seconds": duration,
+        "duration_formatted": f"{duration // 60:02d}:{duration % 60:02d}"
+    }
+
+
+class SqliteRecordStorage(RecordStorage):
+    """Records in an SQLite database in WAL mode.
+
+    An insert is one short transaction whose cost does not depend on the
+    table size, and ``speaker_name COLLATE NOCASE``, ``speech_type`` and
+    ``micros`` (the timestamp as UTC epoch microseconds) are indexed, so
+    filters and range queries read only the matching rows. WAL mode lets other processes read while one writes;
+    SQLite's own locking replaces the file lock the JSON backend needs.
+    """
+
+    indexed = True
+
+    def __init__(self, filename: str, synchronous: str = "FULL"):
+        self.filename = filename
+        self.synchronous = synchronous
+        self._connection: Optional[sqlite3.Connection] = None
+        # One connection shared by the app's threads, used one at a time
+        self._lock = threading.RLock()
+        self._batch: Optional[RecordBatch] = None
+        self._batch_generation = None
+        self._batch_last_id = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.filename, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(f"PRAGMA synchronous={self.synchronous}")
+            self._connection = connection
+        return self._connection
+
+    def ensure_exists(self):
+        """Create the database, table and indexes if missing"""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                for statement in SCHEMA:
+                    connection.execute(statement)
+                columns = [row[1] for row in connection.execute("PRAGMA table_info(speech_records)")]
+                if "micros" not in columns:
+                    connection.create_function("timestamp_micros", 1, timestamp_to_micros, deterministic=True)
+                    for statement in _MIGRATION:
+                        connection.execute(statement)
+                for statement in _MICROS_INDEX:
+                    connection.execute(statement)
+
+    def append(self, record: Dict):
+        """Insert one record, durable on return"""
+        with metrics.timer("toastmaster_records_write_seconds", "Record append latency including WAL fsync"):
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    connection.execute(_INSERT, _row_values(record))
+
+    def append_many(self, records: Iterable[Dict]) -> int:
+        """Insert records in a single transaction; returns how many were added"""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                cursor = connection.executemany(_INSERT, (_row_values(record) for record in records))
+            return max(0, cursor.rowcount)
+
+    def _query(self, sql: str, parameters=()) -> List[Dict]:
+        with self._lock:
+            return [_to_dict(row) for row in self._connect().execute(sql, parameters)]
+
+    def iter_records(self) -> Iterator[Dict]:
+        """Yield every record in insertion order"""
+        # Fetched in chunks so the shared connection is never held across a yield
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._connect().execute(
+                    f"SELECT {_COLUMNS} FROM speech_records WHERE id > ? ORDER BY id LIMIT 5000",
+                    (last_id,)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield _to_dict(row)
+            last_id = rows[-1][0]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM speech_records").fetchone()[0]
+
+    def clear(self):
+        """Delete all records"""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM speech_records")
+                connection.execute("UPDATE record_meta SET value = value + 1 WHERE key = 'generation'")
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+            self._batch = None
+
+    def find_by_type(self, speech_type: str) -> List[Dict]:
+        return self._query(f"SELECT {_COLUMNS} FROM speech_records WHERE speech_type = ? ORDER BY id",
+                           (speech_type,))
+
+    def find_by_speaker(self, speaker_name: str) -> List[Dict]:
+        """Records of a speaker; NOCASE folds ASCII letters only"""
+        return self._query(f"SELECT {_COLUMNS} FROM speech_records "
+                           f"WHERE speaker_name = ? COLLATE NOCASE ORDER BY id", (speaker_name,))
+
+    def find_between(self, start: int, end: int) -> List[Dict]:
+        """Records with ``start <= timestamp < end`` (epoch microseconds)"""
+        return self._query(f"SELECT {_COLUMNS} FROM speech_records "
+                           f"WHERE micros >= ? AND micros < ? ORDER BY id", (start, end))
+
+    def find_page(self, sort: str, descending: bool, after: Optional[Tuple[int, int]], limit: int,
+                  speaker: Optional[str] = None, speech_type: Optional[str] = None,
+                  start: Optional[int] = None, end: Optional[int] = None) -> Tuple[List[Tuple[Tuple, Dict]], int]:
+        """Up to ``limit`` matching records ordered by (sort column, row id) after the key ``after``.
+
+        Returns ``([(key, record), ...], number of matches)``. The filter,
+        order and limit all run in SQL, so only the page is fetched.
+        """
+        column = "micros" if sort == "date" else "duration_seconds"
+        conditions, parameters = [], []
+        if speaker:
+            conditions.append("speaker_name = ? COLLATE NOCASE")
+            parameters.append(speaker)
+        if speech_type:
+            conditions.append("speech_type = ?")
+            parameters.append(speech_type)
+        if start is not None:
+            conditions.append("micros >= ?")
+            parameters.append(start)
+        if end is not None:
+            conditions.append("micros < ?")
+            parameters.append(end)
+        where = " AND ".join(conditions) or "1"
+        page_where, page_parameters = where, list(parameters)
+        if after is not None:
+            page_where += f" AND ({column}, id) {'<' if descending else '>'} (?, ?)"
+            page_parameters.extend(after)
+        order = "DESC" if descending else "ASC"
+        with self._lock:
+            connection = self._connect()
+            matches = connection.execute(f"SELECT COUNT(*) FROM speech_records WHERE {where}",
+                                         parameters).fetchone()[0]
+            rows = connection.execute(
+                f"SELECT {_COLUMNS}, {column} FROM speech_records WHERE {page_where} "
+                f"ORDER BY {column} {order}, id {order} LIMIT ?", page_parameters + [limit]).fetchall()
+        return [((row[-1], row[0]), _to_dict(row[:-1])) for row in rows], matches
+
+    def read_since(self, position: Optional[List]) -> Optional[Iterator[Tuple[List[Dict], List]]]:
+        """Rows after a position of ``[generation, last row id]``, read by primary key"""
+        with self._lock:
+            generation = self._connect().execute(
+                "SELECT value FROM record_meta WHERE key = 'generation'").fetchone()[0]
+        if position is not None and position[0] != generation:
+            return None
+        last_id = position[1] if position is not None else 0
+
+        def chunks():
+            nonlocal last_id
+            while True:
+                with self._lock:
+                    rows = self._connect().execute(
+                        f"SELECT {_COLUMNS} FROM speech_records WHERE id > ? ORDER BY id LIMIT 10000",
+                        (last_id,)).fetchall()
+                if not rows:
+                    return
+                last_id = rows[-1][0]
+                yield [_to_dict(row) for row in rows], [generation, last_id]
+        return chunks()
+
+    def load_batch(self) -> RecordBatch:
+        """All records as a RecordBatch, fetching only rows added since the last call"""
+        with self._lock:
+            connection = self._connect()
+            generation = connection.execute(
+                "SELECT value FROM record_meta WHERE key = 'generation'").fetchone()[0]
+            if self._batch is None or generation != self._batch_generation:
+                self._batch = RecordBatch()
+                self._batch_generation = generation
+                self._batch_last_id = 0
+            rows = connection.execute(f"SELECT {_COLUMNS} FROM speech_records WHERE id > ? ORDER BY id",
+                                      (self._batch_last_id,)).fetchall()
+            if rows:
+                self._batch.extend(_to_dict(row) for row in rows)
+                self._batch_last_id = rows[-1][0]
+            return self._batch
+
+
+def import_json(json_filename: str, db_filename: str, batch_size: int = 10000) -> int:
+    """Copy records from a JSON records file into an SQLite database; returns the count"""
+    records = read_json_records(json_filename)
+    target = SqliteRecordStorage(db_filename)
+    target.ensure_exists()
+    try:
+        return copy_records(records, target, batch_size)
+    finally:
+        target.close()
+
+
+def export_json(db_filename: str, json_filename: str) -> int:
+    """Write an SQLite database's records as a JSON Lines records file; returns the count"""
+    if not os.path.isfile(db_filename):
+        raise FileNotFoundError(errno.ENOENT, "No such database", db_filename)
+    source = SqliteRecordStorage(db_filename)
+    source.ensure_exists()
+    try:
+        return export_json_lines(source, json_filename)
+    finally:
+        source.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line: ``python -m src.sqlite_store import|export <json file> <database>``"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Convert speech records between JSON and SQLite")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("json_file", help="JSON records file (e.g. speech_records.json)")
+    parser.add_argument("database", help="SQLite database file")
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "import":
+            count = import_json(args.json_file, args.database)
+            print(f"Imported {count} records from {args.json_file} into {args.database}")
+        else:
+            count = export_json(args.database, args.json_file)
+            print(f"Exported {count} records from {args.database} to {args.json_file}")
+    except (OSError, sqlite3.Error) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,191 @@
+"""
+Terminal output backends for the Toastmaster Timer App
+"""
+
+import os
+import sys
+from typing import Optional, TextIO
+from .speech_types import TimerColor
+from .metrics import metrics
+
+
+class TerminalBackend:
+    """Base class for terminal backends used by DisplayManager"""
+
+    # Whether the backend can move the cursor to redraw parts of the screen
+    supports_cursor = False
+    # Background color last set; None when unknown
+    current_color: Optional[TimerColor] = None
+
+    def write(self, text: str):
+        """Queue text for output"""
+        raise NotImplementedError
+
+    def flush(self):
+        """Push queued output to the terminal"""
+        pass
+
+    def clear_screen(self):
+        """Clear the terminal screen"""
+        raise NotImplementedError
+
+    def set_background_color(self, color: TimerColor):
+        """Change the background color used for subsequent output"""
+        raise NotImplementedError
+
+    def color_text(self, text: str, color: TimerColor) -> str:
+        """Wrap text so it shows on the given signal color, where supported"""
+        return text
+
+
+class AnsiTerminal(TerminalBackend):
+    """Writes ANSI escape sequences straight to a buffered text stream.
+
+    Nothing is forked: a color change or clear is a few bytes written to
+    stdout, so a full timer redraw costs microseconds.
+    """
+
+    supports_cursor = True
+
+    # SGR sequences: foreground;background
+    COLOR_CODES = {
+        TimerColor.BLANK: "\033[0m",
+        TimerColor.GREEN: "\033[30;42m",
+        TimerColor.YELLOW: "\033[30;43m",
+        TimerColor.RED: "\033[97;41m",
+    }
+    CLEAR = "\033[H\033[2J"
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self._stream = stream
+
+    @property
+    def stream(self) -> TextIO:
+        # Resolve sys.stdout lazily so redirection after start-up still works
+        return self._stream if self._stream is not None else sys.stdout
+
+    def write(self, text: str):
+        self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def clear_screen(self):
+        # Erasing uses the current background, so this paints the whole screen
+        self.stream.write(self.CLEAR)
+        self.stream.flush()
+
+    def set_background_color(self, color: TimerColor):
+        if color == self.current_color:
+            return
+        self.current_color = color
+        self.stream.write(self.COLOR_CODES.get(color, self.COLOR_CODES[TimerColor.BLANK]))
+        self.stream.flush()
+
+    def color_text(self, text: str, color: TimerColor) -> str:
+        if color == TimerColor.BLANK:
+            return text
+        # The reset at the end changes the background once this text is written
+        self.current_color = None
+        return f"{self.COLOR_CODES[color]}{text}{self.COLOR_CODES[TimerColor.BLANK]}"
+
+
+class WindowsColorTerminal(TerminalBackend):
+    """Legacy backend using the Windows cmd ``color`` and ``cls`` commands"""
+
+    # cmd color attributes: background digit followed by foreground digit
+    COLOR_CODES = {
+        TimerColor.BLANK: "07",
+        TimerColor.GREEN: "02",
+        TimerColor.YELLOW: "06",
+        TimerColor.RED: "04",
+    }
+
+    def write(self, text: str):
+        sys.stdout.write(text)
+
+    def flush(self):
+        sys.stdout.flush()
+
+    def clear_screen(self):
+        sys.stdout.flush()
+        metrics.inc("toastmaster_display_subprocess_spawns_total", help_text="Shell processes started for display updates")
+        os.system('cls' if os.name == 'nt' else 'clear')
+
+    def set_background_color(self, color: TimerColor):
+        # Each change starts a shell, so repeated resets are skipped
+        code = self.COLOR_CODES.get(color)
+        if code and color != self.current_color:
+            self.current_color = color
+            sys.stdout.flush()
+            metrics.inc("toastmaster_display_subprocess_spawns_total", help_text="Shell processes started for display updates")
+            os.system(f'cmd /c "color {code}"')
+
+
+class NullTerminal(TerminalBackend):
+    """Discards all output - for benchmarks and headless use"""
+
+    supports_cursor = True
+
+    def write(self, text: str):
+        pass
+
+    def clear_screen(self):
+        pass
+
+    def set_background_color(self, color: TimerColor):
+        pass
+
+
+BACKENDS = {
+    "ansi": AnsiTerminal,
+    "windows": WindowsColorTerminal,
+    "null": NullTerminal,
+}
+
+_terminal: Optional[TerminalBackend] = None
+
+
+def _enable_windows_ansi() -> bool:
+    """Turn on virtual terminal processing in a Windows console"""
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except Exception:
+        return False
+
+
+def create_terminal(name: Optional[str] = None) -> TerminalBackend:
+    """Create a terminal backend by name, or pick the best one for this platform.
+
+    The ``TOASTMASTER_TERMINAL`` environment variable (ansi, windows, null)
+    overrides automatic selection.
+    """
+    name = name or os.environ.get("TOASTMASTER_TERMINAL")
+    if name:
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown terminal backend: {name}")
+        return BACKENDS[name]()
+    if os.name == 'nt' and not _enable_windows_ansi():
+        return WindowsColorTerminal()
+    return AnsiTerminal()
+
+
+def get_terminal() -> TerminalBackend:
+    """Return the active terminal backend, creating it on first use"""
+    global _terminal
+    if _terminal is None:
+        _terminal = create_terminal()
+    return _terminal
+
+
+def set_terminal(terminal: TerminalBackend):
+    """Replace the active terminal backend"""
+    global _terminal
+    _terminal = terminal
@@ -0,0 +1,325 @@
+"""
+Headless timer daemon with a Unix domain control socket for the Toastmaster Timer App
+"""
+
+import asyncio
+import getpass
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import tempfile
+from typing import Callable, Dict, List, Optional
+from .record_manager import RecordManager
+from .records_viewer import RecordFilter, RecordPager
+from .speech_registry import get_registry
+from .speech_types import SpeechType
+from .timer_engine import TimerController
+
+# Every message is a 4-byte big-endian length followed by that many bytes of JSON
+FRAME_HEADER = struct.Struct('!I')
+MAX_FRAME_BYTES = 1 << 20
+MAX_RECORDS = 1000
+COMMANDS = ("ping", "start", "stop", "status", "records", "shutdown")
+
+
+def default_socket_path() -> str:
+    """Per-user control socket in the temporary directory"""
+    return os.path.join(tempfile.gettempdir(), f"toastmaster-timer-{getpass.getuser()}.sock")
+
+
+def encode_frame(message: Dict) -> bytes:
+    payload = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+class DaemonError(Exception):
+    """A command the daemon refused; sent back to the client as its error"""
+
+
+_FIELD_KINDS = {str: "a string", int: "an integer"}
+
+
+def _field(request: Dict, name: str, kind: type, default=None):
+    """A request field, refused unless it has the expected type; ``default`` if absent or null"""
+    value = request.get(name)
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, kind):
+        raise DaemonError(f"{name!r} must be {_FIELD_KINDS[kind]}")
+    return value
+
+
+def _speech_type(name) -> SpeechType:
+    """Speech type for a key in the current registry, so edited definitions apply without a restart"""
+    try:
+        return get_registry().speech_type(name)
+    except ValueError as e:
+        raise DaemonError(str(e)) from None
+
+
+class TimerDaemon:
+    """Long-running headless TimerController and RecordManager behind a control socket.
+
+    Clients send length-prefixed JSON requests such as ``{"cmd": "start",
+    "type": "prepared"}`` and get one response frame per request, in
+    order, carrying ``"ok"`` and the request's ``"id"`` if it had one.
+    Everything stays loaded between commands, so status and timer
+    commands are answered from memory on the event loop; commands that
+    touch the records file (``stop`` with a speaker, ``records``) run on
+    a worker thread so an fsync never stalls other clients.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, record_manager: Optional[RecordManager] = None,
+                 timer_controller: Optional[TimerController] = None):
+        self.socket_path = socket_path or default_socket_path()
+        self.record_manager = record_manager or RecordManager()
+        self.timer_controller = timer_controller or TimerController(headless=True)
+        self.requests_handled = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._stopping: Optional[asyncio.Event] = None
+        # Connected clients' handler tasks and their streams
+        self._clients: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._handlers: Dict[str, Callable[[Dict], Dict]] = {
+            "ping": self._ping,
+            "start": self._start,
+            "stop": self._stop,
+            "status": self._status,
+            "records": self._records,
+            "shutdown": self._shutdown,
+        }
+
+    # -- commands --
+
+    def handle(self, request: Dict) -> Dict:
+        """Run one request and build its response; never raises"""
+        command = request.get("cmd") if isinstance(request, dict) else None
+        try:
+            handler = self._handlers.get(command) if isinstance(command, str) else None
+            if handler is None:
+                raise DaemonError(f"Unknown command {command!r} (expected one of {', '.join(COMMANDS)})")
+            response = handler(request)
+            response["ok"] = True
+        except DaemonError as e:
+            response = {"ok": False, "error": str(e)}
+        except Exception as e:
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        if isinstance(request, dict) and "id" in request:
+            response["id"] = request["id"]
+        self.requests_handled += 1
+        return response
+
+    def _ping(self, request: Dict) -> Dict:
+        return {"pid": os.getpid(), "requests": self.requests_handled}
+
+    def _start(self, request: Dict) -> Dict:
+        speech_type = _speech_type(_field(request, "type", str))
+        if self.timer_controller.is_timer_running():
+            raise DaemonError("A timer is already running; stop it first")
+        if not self.timer_controller.start_speech_timer(speech_type):
+            raise DaemonError("Failed to start timer")
+        return {"speech_type": speech_type.value}
+
+    def _stop(self, request: Dict) -> Dict:
+        """Stop the timer; with a ``speaker`` the speech is recorded too"""
+        speaker = (_field(request, "speaker", str) or "").strip()
+        speech_type = self.timer_controller.engine.get_current_speech_type()
+        if not self.timer_controller.is_timer_running():
+            raise DaemonError("No timer is running")
+        elapsed = self.timer_controller.stop_speech_timer()
+        response = {"speech_type": speech_type.value, "elapsed": elapsed, "record": None}
+        if speaker and elapsed > 0:
+            response["record"] = self.record_manager.add_record(speech_type, speaker, elapsed).to_dict()
+        return response
+
+    def _status(self, request: Dict) -> Dict:
+        status = self.timer_controller.get_timer_status()
+        speech_type = status["speech_type"]
+        status["speech_type"] = speech_type.value if speech_type else None
+        status["current_color"] = status["current_color"].value
+        return status
+
+    def _records(self, request: Dict) -> Dict:
+        """Newest records first, optionally filtered by ``speaker`` and ``type``"""
+        speaker = _field(request, "speaker", str)
+        speech_type = _field(request, "type", str)
+        if speech_type is not None:
+            speech_type = _speech_type(speech_type).value
+        limit = min(MAX_RECORDS, max(1, _field(request, "limit", int, 20)))
+        pager = RecordPager(self.record_manager, RecordFilter(speaker, speech_type), page_size=limit)
+        page = pager.first_page()
+        return {"records": [record.to_dict() for record in page.records], "matches": page.matches}
+
+    def _shutdown(self, request: Dict) -> Dict:
+        if self._stopping is not None:
+            asyncio.get_running_loop().call_soon(self._stopping.set)
+        return {}
+
+    # -- socket server --
+
+    # Commands that may block on the records file run off the event loop
+    _BLOCKING = {"stop", "records"}
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        self._clients[task] = writer
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(FRAME_HEADER.size)
+                    (length,) = FRAME_HEADER.unpack(header)
+                    if length > MAX_FRAME_BYTES:
+                        writer.write(encode_frame({"ok": False, "error": "Request too large"}))
+                        break
+                    payload = await reader.readexactly(length)
+                except asyncio.IncompleteReadError:
+                    break
+                try:
+                    request = json.loads(payload)
+                except ValueError:
+                    response = {"ok": False, "error": "Request is not valid JSON"}
+                else:
+                    command = request.get("cmd") if isinstance(request, dict) else None
+                    if isinstance(command, str) and command in self._BLOCKING:
+                        response = await loop.run_in_executor(None, self.handle, request)
+                    else:
+                        response = self.handle(request)
+                writer.write(encode_frame(response))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            del self._clients[task]
+            writer.close()
+
+    def _claim_socket_path(self):
+        """Remove a socket left behind by a daemon that died; refuse if one is alive"""
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(self.socket_path)
+        else:
+            raise OSError(f"A timer daemon is already listening on {self.socket_path}")
+        finally:
+            probe.close()
+
+    async def serve(self, ready: Optional[Callable[[], None]] = None):
+        """Serve clients until a shutdown command or ``stop()``"""
+        if not hasattr(socket, 'AF_UNIX'):
+            raise OSError("Daemon mode needs Unix domain sockets, which this platform lacks")
+        self._claim_socket_path()
+        self._stopping = asyncio.Event()
+        # Owner-only from the moment the socket exists
+        old_umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(self._client, self.socket_path)
+        finally:
+            os.umask(old_umask)
+        try:
+            if ready is not None:
+                ready()
+            await self._stopping.wait()
+        finally:
+            self._server.close()
+            # Hang up on connected clients and let their handlers finish, so a
+            # speech being recorded is saved before the records file closes
+            for writer in self._clients.values():
+                writer.close()
+            if self._clients:
+                await asyncio.wait(list(self._clients))
+            await self._server.wait_closed()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            if self.timer_controller.is_timer_running():
+                self.timer_controller.stop_speech_timer()
+            self.record_manager.close()
+
+    def stop(self):
+        """Ask a serving daemon to shut down (call from its event loop)"""
+        if self._stopping is not None:
+            self._stopping.set()
+
+    def run(self):
+        """Serve in the calling thread until SIGINT/SIGTERM or a shutdown command"""
+        async def main():
+            loop = asyncio.get_running_loop()
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(signum, self.stop)
+            await self.serve(lambda: print(f"Timer daemon listening on {self.socket_path}", flush=True))
+
+        asyncio.run(main())
+
+
+class DaemonClient:
+    """Blocking client for the daemon's control socket; keeps one connection open"""
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: Optional[float] = 5.0):
+        self.socket_path = socket_path or default_socket_path()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(self.socket_path)
+        self._buffer = b""
+
+    def request(self, command: str, **params) -> Dict:
+        """Send one command and return the daemon's response dictionary"""
+        params["cmd"] = command
+        self._sock.sendall(encode_frame(params))
+        (length,) = FRAME_HEADER.unpack(self._read(FRAME_HEADER.size))
+        return json.loads(self._read(length))
+
+    def _read(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            chunk = self._sock.recv(max(65536, size))
+            if not chunk:
+                raise ConnectionError("Timer daemon closed the connection")
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def close(self):
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line: ``python -m src.timer_daemon start prepared | stop [speaker] | status | records``"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Send a command to a running timer daemon")
+    parser.add_argument("command", choices=COMMANDS)
+    parser.add_argument("argument", nargs="?",
+                        help="speech type for start, speaker name for stop and records")
+    parser.add_argument("--socket", default=None, help=f"control socket (default: {default_socket_path()})")
+    parser.add_argument("--limit", type=int, default=20, help="records to list")
+    args = parser.parse_args(argv)
+
+    params = {}
+    if args.command == "start":
+        params["type"] = args.argument
+    elif args.command in ("stop", "records") and args.argument:
+        params["speaker"] = args.argument
+    if args.command == "records":
+        params["limit"] = args.limit
+    try:
+        with DaemonClient(args.socket) as client:
+            response = client.request(args.command, **params)
+    except OSError as e:
+        print(f"Cannot reach the timer daemon: {e}")
+        sys.exit(1)
+    print(json.dumps(response, indent=2))
+    if not response.get("ok"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -2,58 +2,214 @@
 Timer functionality for the Toastmaster Timer App
 """
 
+import os
 import time
 import threading
-from typing import Optional
+from typing import Callable, List, NamedTuple, Optional
 from .speech_types import SpeechType, TimerColor, SpeechConfig
 from .display_manager import DisplayManager
+from .timing_schedule import TimingEventType, TimingSchedule, get_schedule
+from .clock import Clock, SYSTEM_CLOCK
+from .metrics import metrics
 
 
-class TimerEngine:
-    """Core timer functionality with threading support"""
+class TimerUpdate(NamedTuple):
+    """A timer state change published to listeners.
+    
+    ``kind`` is "tick" (display second), "transition" (schedule event) or
+    "stopped"; ``event_type`` is set for transitions, whose ``elapsed`` is
+    the event's scheduled second even if the timer woke up late.
+    """
+    kind: str
+    speech_type: SpeechType
+    elapsed: int
+    color: TimerColor
+    event_type: Optional[TimingEventType] = None
+
+
+class TickStats:
+    """Lateness of timer ticks relative to their scheduled deadlines"""
     
     def __init__(self):
+        self.ticks = 0
+        self.last = 0.0
+        self.max = 0.0
+        self.total = 0.0
+    
+    def record(self, lateness: float):
+        """Record how late (in seconds) a tick ran"""
+        self.ticks += 1
+        self.last = lateness
+        self.total += lateness
+        if lateness > self.max:
+            self.max = lateness
+    
+    def to_dict(self) -> dict:
+        """Summary in milliseconds"""
+        return {
+            "ticks": self.ticks,
+            "last_ms": round(self.last * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "mean_ms": round(self.total / self.ticks * 1000, 3) if self.ticks else 0.0
+        }
+
+
+class TimerEngine:
+    """Core timer functionality with threading support.
+    
+    Headless engines draw nothing and by default only wake up when the
+    schedule changes state; with ``ticks=True`` they still wake every
+    second to publish ticks to listeners, e.g. for remote signal screens.
+    """
+    
+    # How long a grace period notification stays on screen
+    NOTIFICATION_SECONDS = 2
+    
+    def __init__(self, headless: bool = False, clock: Optional[Clock] = None, ticks: bool = False):
+        self.headless = headless
+        self.ticks = ticks or not headless
+        self.clock = clock or SYSTEM_CLOCK
         self.current_speech_type: Optional[SpeechType] = None
-        self.timer_running = False
         self.start_time: Optional[float] = None
         self.current_color = TimerColor.BLANK
         self.timer_thread: Optional[threading.Thread] = None
         self.grace_period_started = False
         self.grace_period_ended = False
+        self.tick_stats = TickStats()
+        self.schedule: Optional[TimingSchedule] = None
+        self._events_handled = 0
+        self._notification_until = 0
+        # Last whole second the worker handled
+        self._elapsed = 0
+        # _state guards start/stop transitions; _stopped is set whenever no timer runs
+        self._state = threading.Condition()
+        self._running = False
+        self._stopped = threading.Event()
+        self._stopped.set()
+        self._wakeup = threading.Event()
+        self._completion_callbacks: List[Callable[[int], None]] = []
+        self._listeners: List[Callable[[TimerUpdate], None]] = []
+        # Clock seconds a run_for() call lasts
+        self._run_seconds: Optional[float] = None
+    
+    @property
+    def timer_running(self) -> bool:
+        """Whether a timer is currently running"""
+        return self._running
     
     def start_timer(self, speech_type: SpeechType):
         """Start timing for specified speech type"""
+        self._prepare(speech_type)
+        
+        with self._state:
+            # Monotonic time is immune to NTP and wall-clock adjustments
+            self.start_time = self.clock.monotonic()
+            self._run_seconds = None
+            self._running = True
+            self._stopped.clear()
+            self.timer_thread = threading.Thread(target=self._timer_worker)
+            self.timer_thread.daemon = True
+            self.timer_thread.start()
+            self._state.notify_all()
+    
+    def run_for(self, speech_type: SpeechType, seconds: float) -> int:
+        """Run a timer in the calling thread for ``seconds`` of clock time.
+        
+        With a ``VirtualClock`` this replays the whole speech instantly; with
+        a ``ScaledClock`` it runs accelerated. Returns the elapsed time.
+        """
+        self._prepare(speech_type)
+        
+        with self._state:
+            self.start_time = self.clock.monotonic()
+            self._run_seconds = seconds
+            self._running = True
+            self._stopped.clear()
+            self.timer_thread = threading.current_thread()
+            self._state.notify_all()
+        
+        self._timer_worker()
+        return self.stop_timer()
+    
+    def _prepare(self, speech_type: SpeechType):
+        """Reset per-speech state before a timer starts"""
         self.current_speech_type = speech_type
-        self.timer_running = True
         self.grace_period_started = False
         self.grace_period_ended = False
         self.current_color = TimerColor.BLANK
-        DisplayManager.set_background_color(TimerColor.BLANK)
-        
-        config = SpeechConfig.get_config(speech_type)
-        print(f"\nStarting timer for {config['name']}...")
+        self.tick_stats = TickStats()
+        self.schedule = get_schedule(speech_type)
+        self._events_handled = 0
+        self._notification_until = 0
+        self._elapsed = 0
+        self._wakeup.clear()
         
-        self.timer_thread = threading.Thread(target=self._timer_worker)
-        self.timer_thread.daemon = True
-        self.timer_thread.start()
+        if not self.headless:
+            DisplayManager.set_background_color(TimerColor.BLANK)
+            config = SpeechConfig.get_config(speech_type)
+            print(f"\nStarting timer for {config['name']}...")
     
     def stop_timer(self) -> int:
         """Stop the current timer and return elapsed time"""
-        if self.timer_running:
-            self.timer_running = False
-            elapsed = int(time.time() - self.start_time) if self.start_time else 0
-            
-            # Reset terminal colors
+        with self._state:
+            if not self._running:
+                return 0
+            self._running = False
+            elapsed = int(self.clock.monotonic() - self.start_time) if self.start_time is not None else 0
+            elapsed = max(elapsed, self._elapsed)
+            if self._run_seconds is not None:
+                # A timed run ends on the last second its worker reached
+                elapsed = self._elapsed
+            self._wakeup.set()
+            self._stopped.set()
+            self._state.notify_all()
+            callbacks = list(self._completion_callbacks)
+        
+        # Reset terminal colors
+        if not self.headless:
             DisplayManager.set_background_color(TimerColor.BLANK)
             DisplayManager.clear_screen()
-            
-            return elapsed
-        return 0
+        
+        self._publish(TimerUpdate("stopped", self.current_speech_type, elapsed, self.current_color))
+        for callback in callbacks:
+            try:
+                callback(elapsed)
+            except Exception as e:
+                print(f"Warning: Timer completion callback failed - {e}")
+        
+        return elapsed
+    
+    def wait_until_stopped(self, timeout: Optional[float] = None) -> bool:
+        """Block until the timer stops; returns False if the timeout expires first"""
+        return self._stopped.wait(timeout)
+    
+    def wait_until_started(self, timeout: Optional[float] = None) -> bool:
+        """Block until a timer is running; returns False if the timeout expires first"""
+        with self._state:
+            return self._state.wait_for(lambda: self._running, timeout)
+    
+    def add_completion_callback(self, callback: Callable[[int], None]):
+        """Call ``callback(elapsed_seconds)`` each time a running timer is stopped"""
+        self._completion_callbacks.append(callback)
+    
+    def remove_completion_callback(self, callback: Callable[[int], None]):
+        """Stop notifying a previously added completion callback"""
+        if callback in self._completion_callbacks:
+            self._completion_callbacks.remove(callback)
+    
+    def add_listener(self, callback: Callable[[TimerUpdate], None]):
+        """Call ``callback(update)`` for every tick, transition and stop"""
+        self._listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[TimerUpdate], None]):
+        """Stop notifying a previously added listener"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
     
     def get_elapsed_time(self) -> int:
         """Get current elapsed time in seconds"""
-        if self.start_time:
-            return int(time.time() - self.start_time)
+        if self.start_time is not None:
+            return int(self.clock.monotonic() - self.start_time)
         return 0
     
     def is_running(self) -> bool:
@@ -69,62 +225,116 @@ class TimerEngine:
         return self.current_color
     
     def _timer_worker(self):
-        """Background timer worker thread"""
+        """Background timer worker thread.
+        
+        The worker wakes on absolute deadlines measured from the start time:
+        every whole second when drawing the display or publishing ticks, or
+        only at the next schedule event otherwise. Render work never pushes
+        later wake-ups back, so the clock does not drift. A wake-up on a
+        deadline counts as that deadline's second even when the float
+        subtraction lands just short of it, so no second repeats.
+        """
         if not self.current_speech_type:
             return
             
-        config = SpeechConfig.get_config(self.current_speech_type)
-        self.start_time = time.time()
+        clock = self.clock
+        schedule = self.schedule
+        start_time = self.start_time
+        run_seconds = self._run_seconds
+        stop_at = start_time + run_seconds if run_seconds is not None else None
+        deadline = start_time
+        due = 0
+        reached_stop = False
+        this_thread = threading.current_thread()
         
-        while self.timer_running:
-            elapsed = int(time.time() - self.start_time)
-            
-            # Determine current color based on elapsed time
-            current_color = TimerColor.BLANK
-            for timing_seconds, color in config['timings']:
-                if elapsed >= timing_seconds:
-                    current_color = color
+        # A restarted timer gets a new thread; a stale worker exits on its next wake-up
+        while self.timer_running and self.timer_thread is this_thread:
+            now = clock.monotonic()
+            lateness = max(0.0, now - deadline)
+            self.tick_stats.record(lateness)
+            metrics.observe("toastmaster_tick_lateness_seconds", lateness, "Timer wake-up overshoot past its deadline")
+            elapsed = max(int(now - start_time), due)
+            stopping = reached_stop or (stop_at is not None and now >= stop_at)
+            if stopping:
+                # A timed run ends on its last second, however late the wake-up
+                elapsed = int(run_seconds)
+            self._elapsed = elapsed
             
             # Update color if changed
+            current_color = schedule.color_at(elapsed)
             if current_color != self.current_color:
                 self.current_color = current_color
-                DisplayManager.set_background_color(current_color)
+                if not self.headless:
+                    DisplayManager.set_background_color(current_color)
             
-            # Handle grace period notifications
-            self._handle_grace_period_notifications(elapsed, config)
+            # Handle grace period events reached since the last wake-up
+            self._handle_schedule_events(elapsed)
             
-            # Display timer info
-            DisplayManager.show_timer_info(self.current_speech_type, elapsed, self.current_color)
+            if stopping:
+                break
             
-            time.sleep(1)
+            if not self.ticks:
+                next_event = schedule.next_event_time(elapsed)
+                due = elapsed if next_event is None else next_event
+                deadline = start_time + next_event if next_event is not None else None
+            else:
+                # Display timer info unless a notification is still on screen
+                if not self.headless and elapsed >= self._notification_until:
+                    with metrics.timer("toastmaster_render_seconds", "Timer screen render duration per tick"):
+                        DisplayManager.show_timer_info(self.current_speech_type, elapsed, self.current_color)
+                self._publish(TimerUpdate("tick", self.current_speech_type, elapsed, self.current_color))
+                # Next whole-second boundary, skipping any missed ticks
+                due = max(int(clock.monotonic() - start_time), elapsed) + 1
+                deadline = start_time + due
+            
+            if stop_at is not None and (deadline is None or stop_at <= deadline):
+                due = max(int(run_seconds), elapsed)
+                deadline = stop_at
+            if deadline is None:
+                # Nothing left to happen; sleep until stopped
+                clock.wait(self._wakeup)
+            elif clock.wait(self._wakeup, max(0.0, deadline - clock.monotonic())):
+                # Woken before the deadline, so its second was not reached
+                due = elapsed
+            else:
+                reached_stop = deadline == stop_at
     
-    def _handle_grace_period_notifications(self, elapsed: int, config: dict):
-        """Handle grace period start/end notifications"""
-        grace_period = config.get('grace_period', 0)
-        if grace_period <= 0:
-            return
-        
-        red_time = SpeechConfig.get_red_time(self.current_speech_type)
-        grace_end_time = SpeechConfig.get_grace_end_time(self.current_speech_type)
+    def _handle_schedule_events(self, elapsed: int):
+        """Handle schedule events reached since the last wake-up without blocking the clock"""
+        schedule = self.schedule
+        reached = schedule.events_reached(elapsed)
         
-        # Check if grace period just started
-        if elapsed >= red_time and not self.grace_period_started:
-            self.grace_period_started = True
-            DisplayManager.show_grace_period_notification("started", grace_period)
-            time.sleep(2)  # Show notification for 2 seconds
-        
-        # Check if grace period just ended
-        if elapsed >= grace_end_time and not self.grace_period_ended:
-            self.grace_period_ended = True
-            DisplayManager.show_grace_period_notification("ended")
-            time.sleep(2)  # Show notification for 2 seconds
+        for event in schedule.events[self._events_handled:reached]:
+            if event.event_type == TimingEventType.GRACE_START:
+                self.grace_period_started = True
+                self._show_notification(elapsed, "started", schedule.grace_period)
+            elif event.event_type == TimingEventType.GRACE_END:
+                self.grace_period_ended = True
+                self._show_notification(elapsed, "ended")
+            self._publish(TimerUpdate("transition", self.current_speech_type, event.at, event.color, event.event_type))
+        self._events_handled = reached
+    
+    def _publish(self, update: TimerUpdate):
+        """Send an update to all listeners"""
+        for callback in self._listeners:
+            try:
+                callback(update)
+            except Exception as e:
+                print(f"Warning: Timer listener failed - {e}")
+    
+    def _show_notification(self, elapsed: int, notification_type: str, grace_period: int = 0):
+        """Show a grace period notification for a few ticks"""
+        if self.headless:
+            return
+        DisplayManager.show_grace_period_notification(notification_type, grace_period)
+        self._notification_until = elapsed + self.NOTIFICATION_SECONDS
 
 
 class TimerController:
     """High-level timer controller that coordinates timer engine with other components"""
     
-    def __init__(self):
-        self.engine = TimerEngine()
+    def __init__(self, headless: bool = False, clock: Optional[Clock] = None, ticks: bool = False):
+        self.engine = TimerEngine(headless=headless, clock=clock, ticks=ticks)
     
     def start_speech_timer(self, speech_type: SpeechType) -> bool:
         """Start a timer for a specific speech type"""
@@ -151,10 +361,34 @@ class TimerController:
             "elapsed_time": self.engine.get_elapsed_time(),
             "current_color": self.engine.get_current_color(),
             "grace_period_started": self.engine.grace_period_started,
-            "grace_period_ended": self.engine.grace_period_ended
+            "grace_period_ended": self.engine.grace_period_ended,
+            "tick_jitter": self.engine.tick_stats.to_dict()
         }
     
-    def wait_for_timer_completion(self):
-        """Wait for timer to complete (until stopped by user)"""
-        while self.engine.is_running():
-            time.sleep(0.1)
+    def add_completion_callback(self, callback: Callable[[int], None]):
+        """Call ``callback(elapsed_seconds)`` whenever a speech timer is stopped"""
+        self.engine.add_completion_callback(callback)
+    
+    def remove_completion_callback(self, callback: Callable[[int], None]):
+        """Remove a completion callback"""
+        self.engine.remove_completion_callback(callback)
+    
+    def wait_for_timer_completion(self, timeout: Optional[float] = None) -> bool:
+        """Wait for timer to complete (until stopped by user).
+        
+        Blocks on the engine's stop event instead of polling. Returns False
+        if ``timeout`` seconds pass while the timer is still running.
+        """
+        if os.name != 'nt':
+            # Lock waits are interrupted by Ctrl+C on POSIX
+            return self.engine.wait_until_stopped(timeout)
+        
+        # On Windows a blocking wait would swallow Ctrl+C until it returns,
+        # so wait in short slices to let KeyboardInterrupt through
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = 0.5 if deadline is None else min(0.5, deadline - time.monotonic())
+            if remaining <= 0:
+                return not self.engine.is_running()
+            if self.engine.wait_until_stopped(remaining):
+                return True
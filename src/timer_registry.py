@@ -0,0 +1,207 @@
+"""
+Multi-room timer registry for the Toastmaster Timer App contest mode
+"""
+
+import heapq
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from .speech_types import SpeechType, TimerColor
+from .timing_schedule import TimingEventType, TimingSchedule, get_schedule
+from .timer_engine import TimerUpdate
+
+
+class RoomTimer:
+    """State of one named timer; slotted so hundreds of rooms stay compact"""
+
+    __slots__ = ('name', 'speech_type', 'schedule', 'start_time', 'stop_elapsed',
+                 'current_color', 'events_handled', 'grace_period_started',
+                 'grace_period_ended', 'running', 'generation')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.speech_type: Optional[SpeechType] = None
+        self.schedule: Optional[TimingSchedule] = None
+        self.start_time = 0.0
+        self.stop_elapsed = 0
+        self.current_color = TimerColor.BLANK
+        self.events_handled = 0
+        self.grace_period_started = False
+        self.grace_period_ended = False
+        self.running = False
+        self.generation = 0
+
+    def elapsed(self, now: float) -> int:
+        """Elapsed whole seconds at monotonic time ``now``"""
+        return int(now - self.start_time) if self.running else self.stop_elapsed
+
+
+class TimerRegistry:
+    """Runs many named timers on one shared scheduler thread.
+
+    The scheduler keeps a heap of the next schedule event for every running
+    timer and sleeps until the earliest one, so CPU use grows with the
+    number of color/grace transitions, not with timers times seconds.
+    Elapsed time is computed on demand when a status is requested.
+    """
+
+    def __init__(self):
+        self._timers: Dict[str, RoomTimer] = {}
+        self._heap: List[tuple] = []
+        self._condition = threading.Condition()
+        self._listeners: List[Callable[[str, TimerUpdate], None]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def add_timer(self, name: str) -> RoomTimer:
+        """Register a named timer (returns the existing one if present)"""
+        with self._condition:
+            timer = self._timers.get(name)
+            if timer is None:
+                timer = RoomTimer(name)
+                self._timers[name] = timer
+            return timer
+
+    def remove_timer(self, name: str) -> int:
+        """Stop and unregister a timer; returns its elapsed time"""
+        elapsed = self.stop(name)
+        with self._condition:
+            self._timers.pop(name, None)
+        return elapsed
+
+    def names(self) -> List[str]:
+        """Names of all registered timers in insertion order"""
+        with self._condition:
+            return list(self._timers)
+
+    def start(self, name: str, speech_type: SpeechType):
+        """Start (or restart) the named timer for a speech type"""
+        with self._condition:
+            timer = self._timers.get(name) or self.add_timer(name)
+            timer.speech_type = speech_type
+            timer.schedule = get_schedule(speech_type)
+            timer.start_time = time.monotonic()
+            timer.stop_elapsed = 0
+            timer.current_color = TimerColor.BLANK
+            timer.events_handled = 0
+            timer.grace_period_started = False
+            timer.grace_period_ended = False
+            timer.running = True
+            timer.generation += 1
+            self._push(timer, 0)
+            self._ensure_thread()
+            self._condition.notify()
+
+    def stop(self, name: str) -> int:
+        """Stop the named timer and return its elapsed time"""
+        with self._condition:
+            timer = self._timers.get(name)
+            if timer is None or not timer.running:
+                return 0
+            timer.stop_elapsed = int(time.monotonic() - timer.start_time)
+            timer.running = False
+            # Any heap entry for the old generation is now ignored
+            timer.generation += 1
+            update = TimerUpdate("stopped", timer.speech_type, timer.stop_elapsed, timer.current_color)
+        self._notify(name, update)
+        return update.elapsed
+
+    def is_running(self, name: str) -> bool:
+        """Check whether the named timer is running"""
+        timer = self._timers.get(name)
+        return timer is not None and timer.running
+
+    def get_status(self, name: str) -> dict:
+        """Status of one timer, in the same shape as TimerController.get_timer_status"""
+        with self._condition:
+            return self._status(self._timers[name], time.monotonic())
+
+    def get_all_status(self) -> List[dict]:
+        """Status of every timer, for the dashboard"""
+        with self._condition:
+            now = time.monotonic()
+            return [self._status(timer, now) for timer in self._timers.values()]
+
+    def add_listener(self, callback: Callable[[str, TimerUpdate], None]):
+        """Call ``callback(name, update)`` for every transition and stop"""
+        self._listeners.append(callback)
+
+    def close(self):
+        """Stop the scheduler thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _status(self, timer: RoomTimer, now: float) -> dict:
+        return {
+            "name": timer.name,
+            "running": timer.running,
+            "speech_type": timer.speech_type,
+            "elapsed_time": timer.elapsed(now),
+            "current_color": timer.current_color,
+            "grace_period_started": timer.grace_period_started,
+            "grace_period_ended": timer.grace_period_ended
+        }
+
+    def _push(self, timer: RoomTimer, at: int):
+        # The due second travels with the entry: start_time + at - start_time
+        # can round to just under ``at``, which would never reach the event
+        heapq.heappush(self._heap, (timer.start_time + at, id(timer), timer.generation, timer, at))
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._closed = False
+            self._thread = threading.Thread(target=self._scheduler, name="timer-registry")
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _scheduler(self):
+        """Shared scheduler thread: fire due schedule events for all timers"""
+        while True:
+            updates = []
+            with self._condition:
+                while not self._closed:
+                    if self._heap and self._heap[0][0] <= time.monotonic():
+                        break
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._condition.wait(timeout)
+                if self._closed:
+                    return
+                now = time.monotonic()
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, generation, timer, due = heapq.heappop(self._heap)
+                    if generation != timer.generation or not timer.running:
+                        continue
+                    updates.extend(self._advance(timer, now, due))
+            for name, update in updates:
+                self._notify(name, update)
+
+    def _advance(self, timer: RoomTimer, now: float, due: int) -> list:
+        """Apply the events a timer has reached by its due second and queue its next wake-up"""
+        schedule = timer.schedule
+        elapsed = max(int(now - timer.start_time), due)
+        timer.current_color = schedule.color_at(elapsed)
+        reached = schedule.events_reached(elapsed)
+        updates = []
+        for event in schedule.events[timer.events_handled:reached]:
+            if event.event_type == TimingEventType.GRACE_START:
+                timer.grace_period_started = True
+            elif event.event_type == TimingEventType.GRACE_END:
+                timer.grace_period_ended = True
+            updates.append((timer.name, TimerUpdate(
+                "transition", timer.speech_type, event.at, event.color, event.event_type)))
+        timer.events_handled = reached
+        next_event = schedule.next_event_time(elapsed)
+        if next_event is not None:
+            self._push(timer, next_event)
+        return updates
+
+    def _notify(self, name: str, update: TimerUpdate):
+        for callback in list(self._listeners):
+            try:
+                callback(name, update)
+            except Exception as e:
+                print(f"Warning: Timer listener failed - {e}")
@@ -0,0 +1,95 @@
+"""
+Precompiled timing schedules for the Toastmaster Timer App
+"""
+
+from bisect import bisect_right
+from enum import Enum
+from typing import Dict, NamedTuple, Optional, Tuple
+from .speech_types import SpeechType, TimerColor
+
+
+class TimingEventType(Enum):
+    """Kinds of events on a speech's timing schedule"""
+    GREEN = "green"
+    YELLOW = "yellow"
+    RED = "red"
+    GRACE_START = "grace_start"
+    GRACE_END = "grace_end"
+    DISQUALIFY = "disqualify"
+
+
+class TimingEvent(NamedTuple):
+    """A single scheduled event: when it happens and the signal color from then on"""
+    at: int
+    event_type: TimingEventType
+    color: TimerColor
+
+
+_COLOR_EVENTS = {
+    TimerColor.GREEN: TimingEventType.GREEN,
+    TimerColor.YELLOW: TimingEventType.YELLOW,
+    TimerColor.RED: TimingEventType.RED,
+}
+
+
+class TimingSchedule:
+    """Immutable, time-sorted schedule of events for one speech type.
+
+    Built once from a ``SpeechConfig`` entry so the timer never has to scan
+    timings or repeat config lookups; the current state at any elapsed time
+    is a binary search.
+    """
+
+    __slots__ = ('speech_type', 'events', 'times', 'grace_period',
+                 'red_time', 'grace_end_time', '_color_times', '_colors')
+
+    def __init__(self, speech_type: SpeechType, config: Dict):
+        timings = sorted(config.get('timings', []), key=lambda timing: timing[0])
+        grace_period = config.get('grace_period', 0)
+        red_time = timings[-1][0] if timings else 0
+        grace_end_time = red_time + grace_period if grace_period > 0 else 0
+
+        events = [TimingEvent(at, _COLOR_EVENTS[color], color) for at, color in timings]
+        if grace_period > 0:
+            last_color = timings[-1][1] if timings else TimerColor.BLANK
+            events.append(TimingEvent(red_time, TimingEventType.GRACE_START, last_color))
+            events.append(TimingEvent(grace_end_time, TimingEventType.GRACE_END, last_color))
+            events.append(TimingEvent(grace_end_time, TimingEventType.DISQUALIFY, last_color))
+
+        # Stable sort keeps color events ahead of grace events at the same second
+        events.sort(key=lambda event: event.at)
+        self.speech_type = speech_type
+        self.events: Tuple[TimingEvent, ...] = tuple(events)
+        self.times: Tuple[int, ...] = tuple(event.at for event in events)
+        self.grace_period = grace_period
+        self.red_time = red_time
+        self.grace_end_time = grace_end_time
+        self._color_times = tuple(at for at, _ in timings)
+        self._colors = tuple(color for _, color in timings)
+
+    def color_at(self, elapsed: float) -> TimerColor:
+        """Signal color at the given elapsed time"""
+        index = bisect_right(self._color_times, elapsed)
+        return self._colors[index - 1] if index else TimerColor.BLANK
+
+    def events_reached(self, elapsed: float) -> int:
+        """Number of events that have happened by the given elapsed time"""
+        return bisect_right(self.times, elapsed)
+
+    def next_event_time(self, elapsed: float) -> Optional[int]:
+        """Elapsed time of the next event after ``elapsed``, or None if none remain"""
+        index = bisect_right(self.times, elapsed)
+        return self.times[index] if index < len(self.times) else None
+
+
+def get_schedule(speech_type: SpeechType) -> TimingSchedule:
+    """Get the compiled schedule for a speech type (an empty one if it is not defined).
+
+    Schedules are compiled with the speech registry, so this follows
+    edits to the speech types file.
+    """
+    from .speech_registry import get_definition
+    definition = get_definition(speech_type)
+    if definition is None:
+        return TimingSchedule(speech_type, {})
+    return definition.schedule
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the speech archive analytics
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.analytics import ArchiveAnalytics, np
+from src.record_manager import RecordManager
+from src.speech_types import SpeechType
+
+
+def test_analytics():
+    """Check statistics and outcome classification against hand-computed values"""
+    print("Testing Archive Analytics")
+    print("=" * 50)
+
+    workdir = tempfile.mkdtemp(prefix="toastmaster-analytics-")
+    rm = RecordManager(os.path.join(workdir, "records.json"))
+    # Prepared speech: green 300, yellow 360, red 420, grace ends 450
+    durations = [200, 300, 359, 360, 420, 450, 451]
+    for duration in durations:
+        rm.add_record(SpeechType.PREPARED, "Alice", duration)
+    rm.add_record(SpeechType.TABLE_TOPIC, "alice", 150)
+    rm.add_record(SpeechType.TABLE_TOPIC, "Bob", 30)
+
+    kernels = [False] + ([True] if np is not None else [])
+    for use_numpy in kernels:
+        analytics = ArchiveAnalytics(rm, use_numpy=use_numpy)
+        print(f"\nKernel: {analytics.kernel.name}")
+
+        # Test 1: per-type statistics
+        prepared = analytics.by_type()["prepared"]
+        assert prepared.count == len(durations)
+        assert prepared.mean == statistics.mean(durations)
+        assert prepared.median == statistics.median(durations)
+        assert (prepared.minimum, prepared.maximum) == (200, 451)
+        print(f"prepared: mean {prepared.mean:.1f}s, median {prepared.median:.0f}s")
+
+        # Test 2: one outcome per duration, boundaries included in the later color
+        assert prepared.outcomes["under_minimum"] == 1 / 7
+        assert prepared.outcomes["green"] == 2 / 7
+        assert prepared.outcomes["yellow"] == 1 / 7
+        assert prepared.outcomes["red"] == 2 / 7
+        assert prepared.outcomes["over_grace"] == 1 / 7
+        assert prepared.qualification_rate == 5 / 7
+        print(f"prepared qualification rate: {prepared.qualification_rate:.0%}")
+
+        # Test 3: speakers are grouped case-insensitively; no grace means no disqualification
+        speakers = analytics.by_speaker()
+        assert speakers["Alice"].count == 8 and speakers["Bob"].count == 1
+        assert analytics.outcome_counts()["over_grace"] == 1
+        assert analytics.by_type()["table_topic"].outcomes["red"] == 0.5
+
+        # Test 4: trends, and new records picked up incrementally
+        trends = analytics.trends("day", group_by="type")
+        assert sum(stats.count for window in trends.values() for stats in window.values()) == 9
+        rm.add_record(SpeechType.PREPARED, "Bob", 330)
+        assert analytics.by_type()["prepared"].count == 8
+        assert analytics.overall().count == 10
+        rm.clear_records()
+        assert analytics.overall() is None
+        for duration in durations:
+            rm.add_record(SpeechType.PREPARED, "Alice", duration)
+        rm.add_record(SpeechType.TABLE_TOPIC, "alice", 150)
+        rm.add_record(SpeechType.TABLE_TOPIC, "Bob", 30)
+        print("trends and incremental updates ok")
+
+    rm.close()
+    print("\n✅ Analytics tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_analytics()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio timer engine
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src import async_timer
+from src.async_timer import AsyncTimerController, AsyncTimerEngine
+from src.metrics import metrics
+from src.speech_registry import get_registry, set_definitions_file
+from src.speech_types import TimerColor
+from src.timer_engine import TimerUpdate
+from src.timing_schedule import TimingEventType
+
+# A speech short enough to run for real: green at 1 s, red at 2 s, disqualified at 3 s
+DRILL = {"include_builtins": False, "speech_types": [
+    {"key": "drill", "name": "Drill", "green": 1, "red": 2, "grace_period": 1}]}
+
+
+class EarlyLoop:
+    """Stands in for the event loop, running every callback a little before its deadline"""
+
+    def __init__(self, now: float, early: float):
+        self.now = now
+        self.early = early
+        self.scheduled = []
+
+    def time(self) -> float:
+        return self.now
+
+    def call_at(self, when, callback):
+        self.scheduled.append((when, callback))
+        return self
+
+    def cancel(self):
+        self.scheduled.clear()
+
+    def run(self, limit: int):
+        for _ in range(limit):
+            if not self.scheduled:
+                return
+            when, callback = self.scheduled.pop(0)
+            self.now = max(self.now, when - self.early)
+            callback()
+
+
+async def _run_drill(drill):
+    """Start, follow, stop and wait on a timer"""
+    controller = AsyncTimerController()
+    assert await controller.start_speech_timer(drill)
+    assert controller.is_timer_running()
+
+    # Test 1: the iterator sees every tick and transition, then the stop
+    print("\n1. Following a running timer...")
+    updates = []
+    async for update in controller.events():
+        updates.append(update)
+        if update.kind == "tick" and update.elapsed == 3:
+            assert await controller.stop_speech_timer() == 3
+    kinds = [(update.kind, update.elapsed) for update in updates]
+    assert [elapsed for kind, elapsed in kinds if kind == "tick"] == [0, 1, 2, 3], kinds
+    transitions = [(update.event_type, update.elapsed) for update in updates if update.kind == "transition"]
+    assert transitions == [(TimingEventType.GREEN, 1), (TimingEventType.RED, 2), (TimingEventType.GRACE_START, 2),
+                           (TimingEventType.GRACE_END, 3), (TimingEventType.DISQUALIFY, 3)], transitions
+    assert updates[-1] == TimerUpdate("stopped", drill, 3, TimerColor.RED)
+    status = controller.get_timer_status()
+    assert not status["running"] and status["grace_period_ended"]
+    assert status["tick_jitter"]["max_ms"] < 100, status["tick_jitter"]
+    print(f"{len(updates)} updates; stopped at {updates[-1].elapsed}s")
+
+    # Test 2: waiting with a timeout leaves nothing pending behind
+    print("\n2. Waiting with a timeout...")
+    assert await controller.wait_for_timer_completion(0), "a stopped timer is done"
+    await controller.start_speech_timer(drill)
+    assert not await controller.wait_for_timer_completion(0.05)
+    assert asyncio.all_tasks() == {asyncio.current_task()}, asyncio.all_tasks()
+    loop = asyncio.get_running_loop()
+    loop.call_later(0.05, controller.engine.stop_timer)
+    started = loop.time()
+    assert await controller.wait_for_timer_completion(5)
+    assert loop.time() - started < 1, "waiter was not woken by the stop"
+    print("Timed-out wait cleaned up; stop woke the waiter")
+
+
+async def _slow_subscriber(drill):
+    """A subscriber that stops reading keeps only the newest updates"""
+    engine = AsyncTimerEngine(ticks=False)
+    engine.start_timer(drill)
+    events = engine.events()
+    first = asyncio.ensure_future(events.__anext__())
+    await asyncio.sleep(0)
+    for second in range(200):
+        engine._publish(TimerUpdate("tick", drill, second, TimerColor.BLANK))
+    engine.stop_timer()
+    received = [await first] + [update async for update in events]
+    # The newest updates, ending with the stop
+    size = AsyncTimerEngine.EVENT_QUEUE_SIZE
+    assert [update.elapsed for update in received[:-1]] == list(range(200 - size + 1, 200)), received[:2]
+    assert received[-1].kind == "stopped"
+    assert not engine._subscribers, "finished subscriber was not removed"
+    return received
+
+
+def test_async_timer():
+    """Run a short speech on the event loop and follow its updates"""
+    print("Testing Async Timer")
+    print("=" * 50)
+
+    workdir = tempfile.mkdtemp(prefix="toastmaster-async-")
+    metrics.enable()
+    try:
+        filename = os.path.join(workdir, "speech_types.json")
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(DRILL, f)
+        set_definitions_file(filename)
+        drill = get_registry().speech_type("drill")
+
+        asyncio.run(_run_drill(drill))
+
+        # Test 3: a subscriber that stops reading does not grow without bound
+        print("\n3. Falling behind...")
+        received = asyncio.run(_slow_subscriber(drill))
+        dropped = metrics.snapshot()["counters"]["toastmaster_async_events_dropped_total"]
+        assert dropped == 201 - len(received), dropped
+        print(f"Kept {len(received)} of 201 updates; oldest {dropped} dropped")
+
+        # Test 4: the loop may run a callback up to its clock resolution early
+        print("\n4. Waking just before each deadline...")
+        early = time.get_clock_info("monotonic").resolution
+        for ticks in (True, False):
+            loop = EarlyLoop(1000.0, early)
+            engine = AsyncTimerEngine(ticks=ticks)
+            updates = []
+            engine._publish = updates.append
+            get_running_loop = async_timer.asyncio.get_running_loop
+            async_timer.asyncio.get_running_loop = lambda: loop
+            try:
+                engine.start_timer(drill)
+            finally:
+                async_timer.asyncio.get_running_loop = get_running_loop
+            loop.run(8)
+            assert engine.stop_timer() == (7 if ticks else 3)
+            elapsed = [update.elapsed for update in updates if update.kind == "tick"]
+            assert elapsed == (list(range(8)) if ticks else []), elapsed
+            transitions = [(update.event_type, update.elapsed) for update in updates if update.kind == "transition"]
+            assert transitions == [(event.event_type, event.at) for event in engine.schedule.events], transitions
+        print(f"Callbacks {early * 1e9:.0f} ns early keep their seconds")
+    finally:
+        set_definitions_file(None)
+        metrics.disable()
+        metrics.reset()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("\n✅ Async timer tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_async_timer()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
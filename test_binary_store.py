@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the binary segmented record store
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.binary_store import BinaryRecordStorage, import_json, export_json
+from src.record_manager import RecordManager
+from src.speech_types import SpeechType
+
+
+def test_binary_store():
+    """Compare the binary backend with the JSON Lines backend on the same records"""
+    print("Testing Binary Record Store")
+    print("=" * 50)
+
+    workdir = tempfile.mkdtemp(prefix="toastmaster-binary-")
+    try:
+        json_file = os.path.join(workdir, "records.json")
+        store_dir = os.path.join(workdir, "records.tmr")
+
+        # Test 1: import from JSON into small segments so most are sealed and indexed
+        print("\n1. Importing JSON records...")
+        json_rm = RecordManager(json_file)
+        speakers = ["Alice", "Bob", "Carol Brown", "Zoë"]
+        types = list(SpeechType)
+        for n in range(250):
+            json_rm.add_record(types[n % len(types)], speakers[n % len(speakers)], 60 + n)
+        BinaryRecordStorage(store_dir, segment_size=64).ensure_exists()
+        assert import_json(json_file, store_dir) == 250
+        indexes = [name for name in os.listdir(store_dir) if name.endswith(".idx")]
+        assert len(indexes) == 3, indexes
+        print(f"Imported 250 records, {len(indexes)} sealed segments")
+
+        # Test 2: indexed queries agree with the JSON backend
+        print("\n2. Comparing queries...")
+        binary_rm = RecordManager(store_dir, backend="binary")
+        as_dicts = lambda records: [record.to_dict() for record in records]
+        assert binary_rm.get_records_count() == 250
+        assert as_dicts(binary_rm.get_all_records()) == as_dicts(json_rm.get_all_records())
+        for speaker in speakers + ["alice", "nobody"]:
+            assert as_dicts(binary_rm.get_records_by_speaker(speaker)) == \
+                as_dicts(json_rm.get_records_by_speaker(speaker)), speaker
+        for speech_type in types:
+            assert as_dicts(binary_rm.get_records_by_type(speech_type)) == \
+                as_dicts(json_rm.get_records_by_type(speech_type))
+        start = datetime.fromisoformat(json_rm.get_all_records()[100].timestamp)
+        end = datetime.fromisoformat(json_rm.get_all_records()[200].timestamp)
+        assert as_dicts(binary_rm.get_records_between(start, end)) == \
+            as_dicts(json_rm.get_records_between(start, end))
+        print("Speaker, type and time range queries match")
+
+        # Test 3: appends, export and clear
+        print("\n3. Appending, exporting and clearing...")
+        binary_rm.add_record(SpeechType.TEST, "Dave", 12)
+        assert binary_rm.get_records_by_speaker("dave")[0].duration_seconds == 12
+        exported = os.path.join(workdir, "exported.json")
+        assert export_json(store_dir, exported) == 251
+        assert RecordManager(exported).get_records_count() == 251
+        binary_rm.clear_records()
+        assert binary_rm.get_records_count() == 0
+        assert binary_rm.get_records_by_speaker("Alice") == []
+        binary_rm.add_record(SpeechType.TEST, "Eve", 5)
+        assert [record.speaker_name for record in binary_rm.get_all_records()] == ["Eve"]
+        binary_rm.close()
+        json_rm.close()
+        print("Round trip, append and clear ok")
+
+        # Test 4: a mistyped source is an error, not an empty import
+        print("\n4. Importing from and exporting to missing files...")
+        for convert, source in ((import_json, os.path.join(workdir, "typo.json")),
+                                (export_json, os.path.join(workdir, "typo.tmr"))):
+            try:
+                convert(source, os.path.join(workdir, "target"))
+            except FileNotFoundError:
+                pass
+            else:
+                raise AssertionError(f"{convert.__name__} accepted a missing {source}")
+        assert not [name for name in os.listdir(workdir) if name.startswith(("typo", "target"))], os.listdir(workdir)
+        print("Missing sources refused; nothing created")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("\n✅ Binary store tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_binary_store()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Stress test for concurrent writers sharing one records file
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.record_manager import RecordManager
+from src.speech_types import SpeechType
+
+
+def _writer(filename: str, writer_id: int, records_per_writer: int, start_event):
+    """Add records from one timer process"""
+    rm = RecordManager(filename)
+    start_event.wait()
+    for i in range(records_per_writer):
+        rm.add_record(SpeechType.TEST, f"Room {writer_id}", i)
+    rm.close()
+
+
+def test_concurrent_writers(processes: int = 8, records_per_process: int = 200):
+    """Spawn N processes each adding M records and check N x M survive"""
+    print("Testing Concurrent Record Writers")
+    print("=" * 50)
+
+    test_filename = "test_concurrent_records.json"
+    for suffix in ("", ".wal", ".lock", ".summary.json"):
+        if os.path.exists(test_filename + suffix):
+            os.remove(test_filename + suffix)
+
+    RecordManager(test_filename).close()
+    start_event = multiprocessing.Event()
+    workers = [
+        multiprocessing.Process(target=_writer, args=(test_filename, n, records_per_process, start_event))
+        for n in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+
+    started = time.perf_counter()
+    start_event.set()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    expected = processes * records_per_process
+    rm = RecordManager(test_filename)
+    count = rm.get_records_count()
+    print(f"{processes} processes x {records_per_process} records: {count}/{expected} records survived")
+    print(f"Throughput: {expected / elapsed:,.0f} records/s ({elapsed:.2f}s)")
+
+    assert all(worker.exitcode == 0 for worker in workers), "a writer process failed"
+    assert count == expected, f"expected {expected} records, found {count}"
+    for n in range(processes):
+        durations = sorted(r.duration_seconds for r in rm.get_records_by_speaker(f"Room {n}"))
+        assert durations == list(range(records_per_process)), f"Room {n} lost or duplicated records"
+
+    # Clean up
+    rm.close()
+    for suffix in ("", ".wal", ".lock", ".summary.json"):
+        if os.path.exists(test_filename + suffix):
+            os.remove(test_filename + suffix)
+
+    print("\n✅ Concurrent writer test completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        n = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+        m = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+        test_concurrent_writers(n, m)
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
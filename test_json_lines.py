@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the append-only JSON Lines records file and legacy array migration
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.record_manager import RecordManager
+from src.record_storage import JsonLinesStorage
+from src.speech_types import SpeechType
+
+LEGACY_RECORDS = [
+    {"timestamp": "2024-05-01T19:05:00", "speech_type": "prepared", "speaker_name": "Alice",
+     "duration_seconds": 410, "duration_formatted": "06:50"},
+    {"timestamp": "2024-05-01T19:20:00", "speech_type": "evaluation", "speaker_name": "Zoë \"Z\" Ng",
+     "duration_seconds": 175, "duration_formatted": "02:55"},
+]
+
+
+def _lines(filename):
+    with open(filename, encoding='utf-8') as f:
+        return f.read().splitlines()
+
+
+def test_json_lines():
+    """Legacy array files are migrated once; every save appends exactly one line"""
+    print("Testing JSON Lines Records")
+    print("=" * 50)
+
+    workdir = tempfile.mkdtemp(prefix="toastmaster-jsonl-")
+    try:
+        filename = os.path.join(workdir, "records.json")
+
+        # Test 1: an indented JSON array from older versions becomes JSON Lines
+        print("\n1. Migrating a legacy JSON array file...")
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(LEGACY_RECORDS + ["not a record", 42], f, indent=2, ensure_ascii=False)
+        rm = RecordManager(filename)
+        records = rm.get_all_records()
+        assert [record.to_dict() for record in records] == LEGACY_RECORDS, records
+        lines = _lines(filename)
+        assert len(lines) == 2 and all(json.loads(line) in LEGACY_RECORDS for line in lines), lines
+        assert "Zoë" in lines[1], "non-ASCII names should be stored as UTF-8, not escaped"
+        print(f"Migrated {len(lines)} records; non-record entries dropped")
+
+        # Test 2: saving appends one line and leaves earlier lines untouched
+        print("\n2. Appending records...")
+        before = _lines(filename)
+        rm.add_record(SpeechType.TABLE_TOPIC, "Bob", 95)
+        after = _lines(filename)
+        assert after[:2] == before and len(after) == 3
+        assert json.loads(after[2])["speaker_name"] == "Bob"
+        rm.close()
+        print("One line per save")
+
+        # Test 3: reopening a migrated file does not migrate it again
+        print("\n3. Reopening...")
+        inode = os.stat(filename).st_ino
+        reopened = RecordManager(filename)
+        assert reopened.get_records_count() == 3 and os.stat(filename).st_ino == inode
+        reopened.close()
+        print("Already JSON Lines; file left in place")
+
+        # Test 4: a damaged line is skipped, the rest still load
+        print("\n4. Reading past a damaged line...")
+        with open(filename, 'a', encoding='utf-8') as f:
+            f.write('{"timestamp": "2024-05-02T19:00:00", "speech_ty\n')
+            f.write('\n')
+        rm = RecordManager(filename)
+        rm.add_record(SpeechType.TEST, "Carol", 12)
+        names = [record.speaker_name for record in rm.get_all_records()]
+        assert names == ["Alice", "Zoë \"Z\" Ng", "Bob", "Carol"], names
+        rm.close()
+        print("Damaged line skipped")
+
+        # Test 5: the fast encoder matches json.dumps byte for byte
+        print("\n5. Encoding records...")
+        for record in LEGACY_RECORDS:
+            expected = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n"
+            assert JsonLinesStorage.encode(record) == expected
+            assert JsonLinesStorage.decode(expected) == record
+        unusual = {"speaker_name": "Dee", "duration_seconds": 60.5}
+        assert JsonLinesStorage.decode(JsonLinesStorage.encode(unusual)) == unusual
+        assert JsonLinesStorage.decode("[1, 2]") is None and JsonLinesStorage.decode("  ") is None
+        print("Encoder and decoder round-trip")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("\n✅ JSON Lines tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_json_lines()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
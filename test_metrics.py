@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for hot-path metrics and their Prometheus text output
+"""
+
+import os
+import re
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.metrics import DEFAULT_BUCKETS, MetricsRegistry
+
+NAME = r"[a-zA-Z_:][a-zA-Z0-9_:]*"
+SAMPLE = re.compile(rf'^({NAME})(?:\{{le="([^"]+)"\}})? (\S+)$')
+COMMENT = re.compile(rf"^# (HELP|TYPE) ({NAME}) (.+)$")
+
+
+def _parse(text):
+    """Parse Prometheus text format into {family: {"type", "help", "samples"}}, checking each line"""
+    assert text.endswith("\n") and "\n\n" not in text, repr(text[-20:])
+    families = {}
+    current = None
+    for line in text.splitlines():
+        comment = COMMENT.match(line)
+        if comment:
+            kind, name, value = comment.groups()
+            family = families.setdefault(name, {"samples": []})
+            assert kind.lower() not in family, f"second {kind} for {name}"
+            family[kind.lower()] = value
+            current = name
+            continue
+        sample = SAMPLE.match(line)
+        assert sample, f"not a sample line: {line!r}"
+        name, le, value = sample.groups()
+        assert current and (name == current or name.startswith(current + "_")), f"{name} outside its family"
+        float(value)
+        families[current]["samples"].append((name, le, value))
+    return families
+
+
+def test_metrics():
+    """Counters and histograms render as valid Prometheus text"""
+    print("Testing Metrics")
+    print("=" * 50)
+
+    # Test 1: disabled metrics record nothing
+    print("\n1. Recording while disabled...")
+    registry = MetricsRegistry()
+    registry.inc("toastmaster_test_total")
+    registry.observe("toastmaster_test_seconds", 0.1)
+    with registry.timer("toastmaster_test_seconds"):
+        pass
+    assert registry.snapshot() == {"counters": {}, "histograms": {}}
+    assert registry.to_prometheus() == "\n"
+    print("Nothing recorded")
+
+    # Test 2: counters and histograms in the exposition format
+    print("\n2. Rendering Prometheus text...")
+    registry.enable()
+    registry.inc("toastmaster_saves_total", help_text="Records saved")
+    registry.inc("toastmaster_saves_total", 2)
+    registry.inc("toastmaster_drops_total")
+    values = [0.000005, 0.0001, 0.0003, 0.002, 0.002, 0.7, 42.0]
+    for value in values:
+        registry.observe("toastmaster_render_seconds", value, "Render duration")
+    text = registry.to_prometheus()
+    families = _parse(text)
+    assert list(families) == ["toastmaster_drops_total", "toastmaster_saves_total", "toastmaster_render_seconds"]
+    saves = families["toastmaster_saves_total"]
+    assert saves == {"help": "Records saved", "type": "counter", "samples": [("toastmaster_saves_total", None, "3")]}
+    assert "help" not in families["toastmaster_drops_total"]
+
+    render = families["toastmaster_render_seconds"]
+    assert render["type"] == "histogram" and render["help"] == "Render duration"
+    buckets = [(le, int(value)) for name, le, value in render["samples"] if name.endswith("_bucket")]
+    assert [float(le) for le, _ in buckets[:-1]] == list(DEFAULT_BUCKETS) and buckets[-1][0] == "+Inf"
+    counts = [count for _, count in buckets]
+    assert counts == sorted(counts), "bucket counts must be cumulative"
+    # Buckets count values less than or equal to their bound
+    expected = [sum(1 for value in values if value <= float(le)) for le, _ in buckets]
+    assert counts == expected, (counts, expected)
+    samples = {name: value for name, le, value in render["samples"] if le is None}
+    assert int(samples["toastmaster_render_seconds_count"]) == len(values) == counts[-1]
+    assert abs(float(samples["toastmaster_render_seconds_sum"]) - sum(values)) < 1e-9
+    print(text.splitlines()[-1])
+
+    # Test 3: snapshots and timers
+    print("\n3. Snapshots and timers...")
+    with registry.timer("toastmaster_block_seconds"):
+        pass
+    snapshot = registry.snapshot()
+    assert snapshot["counters"]["toastmaster_saves_total"] == 3
+    render = snapshot["histograms"]["toastmaster_render_seconds"]
+    assert render["count"] == len(values) and render["max"] == 42.0
+    assert abs(render["mean"] - sum(values) / len(values)) < 1e-9
+    assert snapshot["histograms"]["toastmaster_block_seconds"]["count"] == 1
+    registry.reset()
+    assert registry.snapshot() == {"counters": {}, "histograms": {}}
+    print("Snapshot matches the recorded values")
+
+    # Test 4: the text file is replaced atomically
+    print("\n4. Writing the metrics file...")
+    workdir = tempfile.mkdtemp(prefix="toastmaster-metrics-")
+    try:
+        filename = os.path.join(workdir, "metrics.prom")
+        registry.inc("toastmaster_saves_total")
+        registry.write_prometheus(filename)
+        registry.inc("toastmaster_saves_total")
+        registry.write_prometheus(filename)
+        with open(filename, encoding='utf-8') as f:
+            assert _parse(f.read())["toastmaster_saves_total"]["samples"][0][2] == "2"
+        assert os.listdir(workdir) == ["metrics.prom"], os.listdir(workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    print("Metrics file rewritten, no temporary files left")
+
+    print("\n✅ Metrics tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_metrics()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
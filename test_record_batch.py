@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for columnar record batches
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.metrics import metrics
+from src.record_batch import MISSING_TIMESTAMP, RecordBatch, micros_to_timestamp, timestamp_to_micros
+from src.record_manager import RecordManager
+from src.speech_types import SpeechType
+
+
+def _record(speaker, speech_type="prepared", duration=400, timestamp="2024-05-01T19:05:00"):
+    formatted = f"{duration // 60:02d}:{duration % 60:02d}" if isinstance(duration, int) else str(duration)
+    return {"timestamp": timestamp, "speech_type": speech_type, "speaker_name": speaker,
+            "duration_seconds": duration, "duration_formatted": formatted}
+
+
+def test_record_batch():
+    """Records round-trip through the columns; unusable ones are skipped, not fatal"""
+    print("Testing Record Batch")
+    print("=" * 50)
+
+    # Test 1: every field reads back as it was written
+    print("\n1. Round-tripping records...")
+    records = [_record("Alice"), _record("Zoë", "evaluation", 175, "2024-05-01T19:20:00.250000"),
+               _record("Bob", "table_topic", 0, "1969-12-31T23:59:59"), _record("Alice", "prepared", 2 ** 31 - 1)]
+    batch = RecordBatch.from_dicts(records)
+    assert len(batch) == 4 and batch.skipped == 0
+    assert [record.to_dict() for record in batch] == records
+    assert batch[-1].to_dict() == records[-1] and batch[1].speaker_name == "Zoë"
+    assert [r.speaker_name for r in batch.rows([2, 0])] == ["Bob", "Alice"]
+    assert batch.epoch_seconds(2) == -1.0
+    assert batch.nbytes() == 4 * 20, "expected 8 + 4 + 4 + 4 bytes per record"
+    print("Timestamps, types, names and durations preserved")
+
+    # Test 2: repeated names and types are stored once
+    print("\n2. Interning strings...")
+    many = RecordBatch.from_dicts(_record(f"Speaker {n % 7}", ("prepared", "evaluation")[n % 2])
+                                  for n in range(1000))
+    assert len(many.speakers) == 7 and many.types == ["prepared", "evaluation"]
+    assert many[5].speaker_name is many[12].speaker_name
+    print(f"{len(many)} records share {len(many.speakers)} names and {len(many.types)} types")
+    assert many.speaker_id("Speaker 3") == 3 and many.speaker_id("New") == 7
+    # Type ids are not limited to 16 bits
+    wide = RecordBatch.from_dicts(_record("Alice", f"type {n}") for n in range(70000))
+    assert len(wide) == 70000 and wide[-1].speech_type == "type 69999"
+
+    # Test 3: records with a non-numeric duration are skipped and counted
+    print("\n3. Skipping unusable records...")
+    metrics.enable()
+    metrics.reset()
+    try:
+        mixed = RecordBatch()
+        outcomes = [mixed.append(item) for item in (
+            _record("Alice"), _record("Bob", duration="6:40"), _record("Carol", duration=None),
+            _record("Dee", duration=float("nan")), _record("Eve", duration=2 ** 40),
+            _record("Fay", duration="95"), _record("Gus", duration=60.7))]
+        skipped = metrics.snapshot()["counters"]["toastmaster_records_skipped_total"]
+    finally:
+        metrics.disable()
+        metrics.reset()
+    assert outcomes == [True, False, False, False, False, True, True]
+    assert mixed.skipped == skipped == 4
+    assert [(r.speaker_name, r.duration_seconds) for r in mixed] == [("Alice", 400), ("Fay", 95), ("Gus", 60)]
+    print(f"{mixed.skipped} records skipped")
+
+    # Test 4: a bad record in the file no longer hides all the others
+    print("\n4. Reading a file with a bad record...")
+    workdir = tempfile.mkdtemp(prefix="toastmaster-batch-")
+    try:
+        filename = os.path.join(workdir, "records.json")
+        rm = RecordManager(filename)
+        rm.add_record(SpeechType.PREPARED, "Alice", 410)
+        with open(filename, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(_record("Bob", duration="abc")) + "\n")
+        rm.add_record(SpeechType.TEST, "Carol", 12)
+        assert [r.speaker_name for r in rm.get_all_records()] == ["Alice", "Carol"]
+        assert rm.get_records_count() == 2 and rm.get_summary().records == 2
+        assert [r.speaker_name for r in rm.get_records_by_type(SpeechType.TEST)] == ["Carol"]
+        rm.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    print("Other records still read; summary agrees")
+
+    # Test 5: timestamps the column cannot reproduce keep their text
+    print("\n5. Timestamps with offsets and unreadable timestamps...")
+    aware = "2024-05-01T21:05:00+02:00"
+    assert timestamp_to_micros(aware) == timestamp_to_micros("2024-05-01T19:05:00")
+    assert timestamp_to_micros("2024-05-01T19:05:00Z") == timestamp_to_micros("2024-05-01T19:05:00")
+    odd = RecordBatch.from_dicts([_record("Alice"), _record("Bob", timestamp=aware),
+                                  _record("Carol", timestamp="last Tuesday"), _record("Dee", timestamp="")])
+    assert [r.timestamp for r in odd] == ["2024-05-01T19:05:00", aware, "last Tuesday", ""]
+    assert odd.timestamps[1] == odd.timestamps[0], "offset timestamps are stored as UTC for sorting"
+    assert odd.timestamps[2] == odd.timestamps[3] == MISSING_TIMESTAMP
+    assert sorted(odd.original_timestamps) == [1, 2] and odd[-3].timestamp == aware
+    assert micros_to_timestamp(MISSING_TIMESTAMP) == ""
+    print("Original text kept for 2 of 4 rows")
+
+    print("\n✅ Record batch tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_record_batch()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for the parsed-records cache and its invalidation
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.metrics import metrics
+from src.record_manager import RecordManager
+from src.record_storage import JsonLinesStorage
+from src.speech_types import SpeechType
+
+
+def _refreshes():
+    return metrics.snapshot()["counters"].get("toastmaster_records_cache_refreshes_total", 0)
+
+
+def test_record_cache():
+    """The cache is reused while the file is unchanged and refreshed when it changes"""
+    print("Testing Record Cache")
+    print("=" * 50)
+
+    workdir = tempfile.mkdtemp(prefix="toastmaster-cache-")
+    metrics.enable()
+    try:
+        filename = os.path.join(workdir, "records.json")
+        rm = RecordManager(filename)
+        rm.add_records([(SpeechType.PREPARED, "Alice", 400), (SpeechType.TEST, "Bob", 12)])
+
+        # Test 1: repeated reads of an unchanged file reuse the parsed batch
+        print("\n1. Reading an unchanged file...")
+        first = rm.get_record_batch()
+        refreshes = _refreshes()
+        assert rm.get_record_batch() is first and len(first) == 2
+        assert rm.get_records_by_speaker("alice")[0].speaker_name == "Alice"
+        assert _refreshes() == refreshes, "unchanged file was parsed again"
+        assert refreshes >= 1
+        print("Cache hit")
+
+        # Test 2: an append (here by another writer) is read incrementally
+        print("\n2. Appending from another writer...")
+        index = rm._cached().speaker_index()
+        other = RecordManager(filename)
+        other.add_record(SpeechType.TEST, "alice", 15)
+        other.close()
+        batch = rm.get_record_batch()
+        assert batch is first and len(batch) == 3, "append should extend the cached batch"
+        assert len(index["alice"]) == 2, "built speaker index was not kept up to date"
+        assert [r.duration_seconds for r in rm.get_records_by_type(SpeechType.TEST)] == [12, 15]
+        print("Only the new line was parsed; indexes updated")
+
+        # Test 3: a rewrite with a new inode invalidates the cache
+        print("\n3. Replacing the file...")
+        rm.clear_records()
+        assert os.path.getsize(filename) == 0
+        assert len(rm.get_record_batch()) == 0 and rm.get_records_by_speaker("alice") == []
+        print("Cleared file reloaded")
+
+        # Test 4: an in-place rewrite of the same size and inode is caught by mtime and tail bytes
+        print("\n4. Rewriting in place...")
+        rm.add_record(SpeechType.TEST, "Carol", 20)
+        assert rm.get_record_batch()[0].speaker_name == "Carol"
+        with open(filename, 'r+', encoding='utf-8') as f:
+            line = f.read()
+            f.seek(0)
+            f.write(line.replace("Carol", "Chris"))
+        stat = os.stat(filename)
+        os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert rm.get_record_batch()[0].speaker_name == "Chris"
+        assert rm.get_records_by_speaker("carol") == []
+        print("Same-size rewrite detected")
+
+        # Test 5: a shrunken file is reloaded from the start
+        print("\n5. Truncating the file...")
+        rm.add_records([(SpeechType.TEST, "Dee", 30)] * 3)
+        storage = JsonLinesStorage(filename)
+        lines = list(storage.iter_records())[:2]
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.writelines(JsonLinesStorage.encode(record) for record in lines)
+        assert [r.speaker_name for r in rm.get_all_records()] == ["Chris", "Dee"]
+        rm.close()
+        print("Truncated file reloaded")
+    finally:
+        metrics.disable()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("\n✅ Record cache tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_record_cache()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for bulk record import and export
+"""
+
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.record_batch import timestamp_to_micros
+from src.record_io import existing_keys, import_records, record_key
+from src.record_manager import RecordManager
+from src.speech_types import SpeechType
+
+
+def test_record_io():
+    """Import CSV and gzipped JSON Lines with duplicates and bad rows, then export"""
+    print("Testing Bulk Import/Export")
+    print("=" * 50)
+
+    workdir = tempfile.mkdtemp(prefix="toastmaster-io-")
+    try:
+        rm = RecordManager(os.path.join(workdir, "records.json"))
+        existing = rm.add_record(SpeechType.PREPARED, "Alice", 330)
+
+        # Test 1: CSV import with a duplicate of a stored record, a repeat and bad rows
+        print("\n1. Importing CSV...")
+        csv_file = os.path.join(workdir, "laptop1.csv")
+        with open(csv_file, 'w', encoding='utf-8') as f:
+            f.write("timestamp,speech_type,speaker_name,duration_seconds\n")
+            f.write(f"{existing.timestamp},prepared,ALICE,330\n")
+            f.write("2024-03-01T19:05:00,evaluation,Bob,150\n")
+            f.write("2024-03-01T19:05:00.000000,evaluation,bob,150\n")
+            f.write("2024-03-01T19:10:00,table_topic,\"Carol, Jr.\",95\n")
+            f.write("not a date,prepared,Dave,300\n")
+            f.write("2024-03-01T19:20:00,prepared,Eve,abc\n")
+        updates = []
+        stats = rm.import_records(csv_file, progress=updates.append)
+        print(stats.to_dict())
+        assert (stats.read, stats.written, stats.duplicates, stats.invalid) == (6, 2, 2, 2)
+        assert updates and rm.get_records_count() == 3
+        assert rm.get_records_by_speaker("Carol, Jr.")[0].duration_formatted == "01:35"
+
+        # Test 2: importing the same file again adds nothing
+        print("\n2. Re-importing...")
+        stats = rm.import_records(csv_file)
+        assert stats.written == 0 and stats.duplicates == 4
+        print(stats.to_dict())
+
+        # Test 3: gzipped JSON Lines round trip into a second archive
+        print("\n3. Exporting and importing gzipped JSON Lines...")
+        exported = os.path.join(workdir, "export.jsonl.gz")
+        assert rm.export_records(exported).written == 3
+        with gzip.open(exported, 'rt', encoding='utf-8') as f:
+            assert len(f.readlines()) == 3
+        other = RecordManager(os.path.join(workdir, "other.json"))
+        assert other.import_records(exported, batch_size=2).written == 3
+        assert [r.to_dict() for r in other.get_all_records()] == [r.to_dict() for r in rm.get_all_records()]
+
+        # Test 4: CSV export
+        csv_export = os.path.join(workdir, "district.csv.gz")
+        rm.export_records(csv_export)
+        with gzip.open(csv_export, 'rt', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        assert lines[0] == "timestamp,speech_type,speaker_name,duration_seconds,duration_formatted"
+        assert len(lines) == 4 and '"Carol, Jr."' in lines[3]
+        print("Round trips ok")
+
+        # Test 5: a stored key whose hash matches a new record does not hide it
+        print("\n5. Telling apart records with colliding hashes...")
+        seen = existing_keys(other.get_record_batch())
+        new_file = os.path.join(workdir, "new.csv")
+        with open(new_file, 'w', encoding='utf-8') as f:
+            f.write("timestamp,speech_type,speaker_name,duration_seconds\n")
+            f.write("2024-03-02T19:00:00,prepared,Frank,400\n")
+        new_key = record_key(timestamp_to_micros("2024-03-02T19:00:00"), "Frank", "prepared")
+        # Stands in for a distinct stored record whose key hashes the same
+        seen.add(hash(new_key))
+        stats = import_records(other.storage, new_file, seen)
+        assert (stats.written, stats.duplicates) == (1, 0), stats.to_dict()
+        assert new_key in seen and record_key(new_key[0], "FRANK", "prepared") in seen
+        rm.close()
+        other.close()
+        print("Imported despite a matching hash")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("\n✅ Bulk import/export tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_record_io()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
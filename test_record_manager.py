@@ -5,8 +5,11 @@ Test script for the file-based record management system
 
 import os
 import sys
-from record_manager import RecordManager
-from speech_types import SpeechType
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.record_manager import RecordManager
+from src.speech_types import SpeechType
 
 def test_file_based_records():
     """Test the file-based record management system"""
@@ -69,10 +72,13 @@ def test_file_based_records():
     final_count_after_clear = rm2.get_records_count()
     print(f"Records after clear: {final_count_after_clear}")
     
-    # Remove test file
-    if os.path.exists(test_filename):
-        os.remove(test_filename)
-        print("Test file removed")
+    # Remove test file and its lock and log files
+    rm.close()
+    rm2.close()
+    for filename in (test_filename, test_filename + ".lock", test_filename + ".wal"):
+        if os.path.exists(filename):
+            os.remove(filename)
+    print("Test file removed")
     
     print("\n✅ All tests completed successfully!")
     print("\nKey Benefits of File-Based Approach:")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Tests for the persisted, incrementally updated records summary
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.record_manager import RecordManager
+from src.record_storage import JsonLinesStorage
+from src.record_summary import RecordSummary, build_summary
+from src.speech_types import SpeechType
+
+ENTRIES = [(SpeechType.PREPARED, "Alice", 400), (SpeechType.PREPARED, "alice", 440),
+           (SpeechType.EVALUATION, "Bob", 170), (SpeechType.TABLE_TOPIC, "Alice", 95),
+           (SpeechType.PREPARED, "Bob", 355)]
+
+
+def test_record_summary():
+    """Summary statistics stay correct across appends, processes, clears and repairs"""
+    print("Testing Records Summary")
+    print("=" * 50)
+
+    workdir = tempfile.mkdtemp(prefix="toastmaster-summary-")
+    try:
+        filename = os.path.join(workdir, "records.json")
+
+        # Test 1: statistics per speaker and type
+        print("\n1. Summarizing records...")
+        rm = RecordManager(filename)
+        rm.add_records(ENTRIES)
+        summary = rm.get_summary()
+        assert summary.records == rm.get_records_count() == 5
+        prepared = summary.totals(speech_type="prepared")
+        assert (prepared.count, prepared.total, prepared.minimum, prepared.maximum) == (3, 1195, 355, 440)
+        assert prepared.squares == 400 ** 2 + 440 ** 2 + 355 ** 2
+        alice = summary.totals(speaker="ALICE")
+        assert alice.count == 3 and summary.by_speaker()["Alice"].count == 3
+        assert abs(summary.totals(speaker="bob").mean - 262.5) < 1e-9
+        assert sum(summary.by_type()["prepared"].histogram.values()) == 3
+        print(f"Prepared: mean {prepared.mean:.1f}s, std dev {prepared.stddev:.1f}s")
+
+        # Test 2: add_record folds in only the new record; the summary is persisted
+        print("\n2. Updating incrementally...")
+        rm.add_record(SpeechType.PREPARED, "Carol", 420)
+        assert rm.get_summary().totals(speech_type="prepared").count == 4
+        rm.close()
+        with open(rm.summary_filename, encoding='utf-8') as f:
+            saved = json.load(f)
+        assert saved["records"] == 6, saved
+        print(f"Saved {os.path.basename(rm.summary_filename)} covering {saved['records']} records")
+
+        # Test 3: appends by another process are picked up from the saved position
+        print("\n3. Catching up with another writer...")
+        other = RecordManager(filename)
+        other.add_record(SpeechType.EVALUATION, "Dave", 180)
+        other.close()
+        reopened = RecordManager(filename)
+        assert reopened.get_records_count() == 7
+        assert reopened.get_summary().totals(speaker="dave").count == 1
+        print("Other writer's record counted")
+
+        # Test 4: clearing resets the summary
+        print("\n4. Clearing records...")
+        reopened.clear_records()
+        assert reopened.get_records_count() == 0 and not reopened.get_summary().groups
+        reopened.add_record(SpeechType.TEST, "Eve", 12)
+        assert reopened.get_summary().totals().count == 1
+        reopened.close()
+        print("Summary reset with the records")
+
+        # Test 5: verify detects a damaged summary, rebuild repairs it
+        print("\n5. Verifying and rebuilding...")
+        rm = RecordManager(filename)
+        assert rm.rebuild_summary(repair=False) == []
+        with open(rm.summary_filename, encoding='utf-8') as f:
+            saved = json.load(f)
+        saved["groups"][0][2] += 5
+        with open(rm.summary_filename, 'w', encoding='utf-8') as f:
+            json.dump(saved, f)
+        problems = rm.rebuild_summary(repair=False)
+        assert problems and "Eve" in problems[-1], problems
+        assert rm.rebuild_summary(repair=True) == problems
+        assert rm.rebuild_summary(repair=False) == []
+        rm.close()
+        print(f"Detected: {problems[-1]}")
+
+        # Test 6: indexed backends, including records added behind the summary's back
+        print("\n6. Binary and SQLite backends...")
+        for backend, name in (("binary", "records.tmr"), ("sqlite", "records.db")):
+            rm = RecordManager(os.path.join(workdir, name), backend=backend)
+            rm.add_records(ENTRIES)
+            assert rm.get_records_count() == 5
+            rm.storage.append_many([{"timestamp": "2024-05-01T19:00:00", "speech_type": "test",
+                                     "speaker_name": "Zed", "duration_seconds": 9}])
+            assert rm.get_summary().differences(build_summary(rm.storage)) == []
+            assert rm.get_records_count() == 6
+            rm.clear_records()
+            assert rm.get_records_count() == 0
+            rm.close()
+        print("Binary and SQLite summaries match their records")
+
+        # Test 7: counting a large archive reads the summary, not the records
+        print("\n7. Counting 100000 records...")
+        big = os.path.join(workdir, "big.json")
+        rm = RecordManager(big)
+        rm.add_records(ENTRIES * 20000)
+        started = time.perf_counter()
+        assert rm.get_records_count() == 100000
+        first = time.perf_counter() - started
+        rm.close()
+        rm = RecordManager(big)
+        started = time.perf_counter()
+        assert rm.get_records_count() == 100000
+        reopened_time = time.perf_counter() - started
+        rm.add_record(SpeechType.TEST, "Fay", 14)
+        started = time.perf_counter()
+        assert rm.get_records_count() == 100001
+        after_add = time.perf_counter() - started
+        rm.close()
+        print(f"First count (builds summary): {first * 1e3:.1f} ms")
+        print(f"After reopening: {reopened_time * 1e3:.2f} ms; after one more record: {after_add * 1e3:.3f} ms")
+
+        # Test 8: odd speakers are counted under their text; only records actually added are reported
+        print("\n8. Summarizing records with odd fields...")
+        odd = os.path.join(workdir, "odd.json")
+        with open(odd, 'w', encoding='utf-8') as f:
+            for speaker, speech_type, duration in (("Alice", "test", 10), (None, "test", 20), (42, "test", 30),
+                                                   ("Bob", 7, 40), ("Bob", "test", "abc")):
+                f.write(json.dumps({"timestamp": "2024-05-01T19:00:00", "speech_type": speech_type,
+                                    "speaker_name": speaker, "duration_seconds": duration}) + "\n")
+        storage = JsonLinesStorage(odd)
+        storage.ensure_exists()
+        summary = RecordSummary()
+        assert summary.catch_up(storage) == 4 and summary.records == 4
+        assert sorted(summary.by_speaker()) == ["", "42", "Alice", "Bob"]
+        assert summary.by_type()["7"].count == 1 and summary.totals(speech_type="test").count == 3
+        storage.append({"timestamp": "2024-05-01T19:01:00", "speech_type": "test",
+                        "speaker_name": "Bob", "duration_seconds": None})
+        assert summary.catch_up(storage) == 0 and summary.records == 4
+        storage.close()
+        print(f"{summary.records} of 6 records summarized; null and numeric speakers kept")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("\n✅ Records summary tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_record_summary()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Tests for the records write-ahead log, crash recovery and atomic rewrites
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src import record_wal
+from src.record_manager import RecordManager
+from src.record_storage import JsonLinesStorage
+from src.record_wal import WriteAheadLog, atomic_write_lines
+from src.speech_types import SpeechType
+
+
+def _record(name, seconds=60):
+    return {"timestamp": f"2024-05-01T19:{seconds % 60:02d}:00", "speech_type": "test",
+            "speaker_name": name, "duration_seconds": seconds,
+            "duration_formatted": f"{seconds // 60:02d}:{seconds % 60:02d}"}
+
+
+def test_record_wal():
+    """Torn log tails are ignored, lost lines are replayed once, rewrites are atomic"""
+    print("Testing Write-Ahead Log")
+    print("=" * 50)
+
+    workdir = tempfile.mkdtemp(prefix="toastmaster-wal-")
+    try:
+        # Test 1: a log cut off mid-entry keeps the entries before the cut
+        print("\n1. Reading a log with a torn tail...")
+        wal_path = os.path.join(workdir, "log.wal")
+        wal = WriteAheadLog(wal_path)
+        for name in ("alice", "bob", "carol"):
+            wal.sync(wal.write(JsonLinesStorage.encode(_record(name))))
+        wal.close()
+        size = os.path.getsize(wal_path)
+        with open(wal_path, 'rb+') as f:
+            f.truncate(size - 7)
+        entries = WriteAheadLog(wal_path).read_entries()
+        assert [JsonLinesStorage.decode(entry)["speaker_name"] for entry in entries] == ["alice", "bob"]
+
+        # A flipped byte fails the checksum; nothing after it is trusted
+        with open(wal_path, 'rb+') as f:
+            f.seek(20)
+            byte = f.read(1)
+            f.seek(20)
+            f.write(bytes([byte[0] ^ 0x01]))
+        assert WriteAheadLog(wal_path).read_entries() == []
+        print("Torn and corrupted entries rejected")
+
+        # Test 2: lines that never reached the records file are replayed, exactly once
+        print("\n2. Recovering after a crash...")
+        filename = os.path.join(workdir, "records.json")
+        rm = RecordManager(filename)
+        for name in ("alice", "bob", "carol"):
+            rm.add_record(SpeechType.TEST, name, 30)
+        # Crash: the records file lost its last line and a half, the log was cut mid-entry
+        with open(filename, 'rb') as f:
+            data = f.read()
+        lines = data.splitlines(keepends=True)
+        with open(filename, 'wb') as f:
+            f.write(b"".join(lines[:1]) + lines[1][:15])
+        wal_size = os.path.getsize(filename + ".wal")
+        with open(filename + ".wal", 'ab') as f:
+            f.write(b"0badc0de {\"speaker_na")
+        recovered = RecordManager(filename)
+        names = [record.speaker_name for record in recovered.get_all_records()]
+        assert names == ["alice", "bob", "carol"], names
+        recovered.close()
+        assert os.path.getsize(filename + ".wal") == 0 and wal_size > 0
+        assert [r.speaker_name for r in RecordManager(filename).get_all_records()] == names
+        print(f"Recovered {names}; log checkpointed")
+
+        # Test 3: atomic rewrites leave the old file intact when writing fails
+        print("\n3. Rewriting a file atomically...")
+        target = os.path.join(workdir, "atomic.txt")
+        atomic_write_lines(target, ["one\n", "two\n"])
+
+        def failing_lines():
+            yield "partial\n"
+            raise OSError("disk full")
+        try:
+            atomic_write_lines(target, failing_lines())
+            raise AssertionError("write error was swallowed")
+        except OSError:
+            pass
+        with open(target, encoding='utf-8') as f:
+            assert f.read() == "one\ntwo\n"
+        assert os.listdir(workdir).count("atomic.txt") == 1
+        assert not [name for name in os.listdir(workdir) if ".tmp." in name]
+        print("Old contents kept, temporary file removed")
+
+        # Test 4: group commit only waits when other writers are in flight
+        print("\n4. Group commit...")
+        wal = WriteAheadLog(os.path.join(workdir, "group.wal"), commit_window=0.2)
+        started = time.perf_counter()
+        for n in range(5):
+            wal.sync(wal.write(f"lone {n}\n"))
+        lone = time.perf_counter() - started
+        assert lone < 0.2, f"a lone writer waited for the commit window ({lone:.3f}s)"
+
+        fsyncs = []
+        real_fsync = os.fsync
+        record_wal.os.fsync = lambda fd: (fsyncs.append(fd), real_fsync(fd))
+        try:
+            wal.commit_window = 0.01
+            barrier = threading.Barrier(8)
+
+            def writer(number):
+                barrier.wait()
+                for n in range(10):
+                    wal.sync(wal.write(f"writer {number} entry {n}\n"))
+            threads = [threading.Thread(target=writer, args=(number,)) for number in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            record_wal.os.fsync = real_fsync
+        wal.close()
+        assert len(WriteAheadLog(wal.filename).read_entries()) == 85
+        assert len(fsyncs) < 80, f"{len(fsyncs)} fsyncs for 80 concurrent entries"
+        print(f"Lone writer: {lone / 5 * 1e3:.2f} ms per sync; 80 concurrent entries: {len(fsyncs)} fsyncs")
+
+        # Test 5: single and bulk appends mixed, then a crash
+        print("\n5. Recovering after mixed single and bulk appends...")
+        filename = os.path.join(workdir, "mixed.json")
+        rm = RecordManager(filename)
+        rm.add_record(SpeechType.TEST, "alice", 30)
+        rm.add_records([(SpeechType.TEST, "bob", 31)] * 3)
+        assert os.path.getsize(filename + ".wal") == 0, "bulk append left logged lines behind"
+        # Crash without close(): reopening must not replay alice again
+        names = [record.speaker_name for record in RecordManager(filename).get_all_records()]
+        assert names == ["alice", "bob", "bob", "bob"], names
+
+        # Logged lines followed by lines another writer added without the log
+        rm = RecordManager(filename)
+        rm.add_record(SpeechType.TEST, "carol", 32)
+        with open(filename, 'a', encoding='utf-8') as f:
+            f.write(JsonLinesStorage.encode(_record("dee")))
+        rm.add_record(SpeechType.TEST, "erin", 33)
+        with open(filename, 'a', encoding='utf-8') as f:
+            f.write(JsonLinesStorage.encode(_record("fay")))
+        names = [record.speaker_name for record in RecordManager(filename).get_all_records()]
+        assert names == ["alice", "bob", "bob", "bob", "carol", "dee", "erin", "fay"], names
+        print(f"Recovered {len(names)} records, none twice")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("\n✅ Write-ahead log tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_record_wal()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the paged records viewer
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.record_manager import RecordManager
+from src.records_viewer import RecordPager, RecordFilter
+from src.speech_types import SpeechType
+
+
+def _all_pages(pager):
+    page = pager.first_page()
+    records = list(page.records)
+    while page.has_next:
+        page = pager.next_page()
+        records.extend(page.records)
+    return records
+
+
+def test_records_viewer():
+    """Page through filtered, sorted records and compare with a full sort"""
+    print("Testing Records Viewer")
+    print("=" * 50)
+
+    workdir = tempfile.mkdtemp(prefix="toastmaster-viewer-")
+    try:
+        rm = RecordManager(os.path.join(workdir, "records.json"))
+        types = list(SpeechType)
+        rm.add_records((types[n % len(types)], ["Alice", "Bob"][n % 2], (n * 37) % 300) for n in range(53))
+        everything = rm.get_all_records()
+
+        # Test 1: pages cover every record exactly once, in order
+        print("\n1. Sorting by duration, longest first...")
+        pager = RecordPager(rm, sort="duration", descending=True, page_size=10)
+        paged = _all_pages(pager)
+        expected = sorted(everything, key=lambda record: -record.duration_seconds)
+        assert [r.duration_seconds for r in paged] == [r.duration_seconds for r in expected]
+        assert len(paged) == 53 and pager.page().number == 6
+        print(f"{len(paged)} records over {pager.page().number} pages")
+
+        # Test 2: filters
+        print("\n2. Filtering by speaker and type...")
+        pager = RecordPager(rm, RecordFilter(speaker="alice", speech_type="test"), page_size=4)
+        paged = _all_pages(pager)
+        assert paged and all(r.speaker_name == "Alice" and r.speech_type == "test" for r in paged)
+        assert len(paged) == len([r for r in everything if r.speaker_name == "Alice" and r.speech_type == "test"])
+        empty = RecordPager(rm, RecordFilter(end=datetime(2000, 1, 1))).first_page()
+        assert empty.records == [] and empty.matches == 0 and not empty.has_next
+
+        # Test 3: moving back, and new records do not shift pages already seen
+        print("\n3. Navigating back and forth...")
+        pager = RecordPager(rm, sort="date", descending=False, page_size=10)
+        first = pager.first_page().records
+        second = pager.next_page().records
+        rm.add_record(SpeechType.TEST, "Carol", 1)
+        assert pager.previous_page().records[0].timestamp == first[0].timestamp
+        assert pager.next_page().records[0].timestamp == second[0].timestamp
+        assert pager.previous_page().number == 1 and pager.previous_page().number == 1
+        print("Keyset pagination ok")
+
+        # Test 4: indexed backends page in the store, without loading the whole archive
+        print("\n4. Paging SQLite and binary stores...")
+        from src.binary_store import BinaryRecordStorage
+        entries = [(types[n % len(types)], ["Alice", "Bob", "ALICE"][n % 3], (n * 37) % 300) for n in range(53)]
+        # Small segments so most rows are answered from sealed segment indexes
+        BinaryRecordStorage(os.path.join(workdir, "records.tmr"), segment_size=8).ensure_exists()
+        managers = {"jsonl": RecordManager(os.path.join(workdir, "paged.json"))}
+        for backend, name in (("sqlite", "records.db"), ("binary", "records.tmr")):
+            managers[backend] = RecordManager(os.path.join(workdir, name), backend=backend)
+        for manager in managers.values():
+            manager.add_records(entries)
+        for backend in ("sqlite", "binary"):
+            storage = managers[backend].storage
+
+            def no_batch():
+                raise AssertionError("loaded the whole archive")
+            storage.load_batch = no_batch
+        fields = lambda records: [(r.speaker_name, r.speech_type, r.duration_seconds) for r in records]
+        for record_filter in (RecordFilter(), RecordFilter(speaker="alice"), RecordFilter(speech_type="test"),
+                              RecordFilter(start=datetime(2000, 1, 1)), RecordFilter(end=datetime(2000, 1, 1))):
+            for sort in ("date", "duration"):
+                for descending in (True, False):
+                    pages = {backend: RecordPager(manager, record_filter, sort, descending, page_size=7)
+                             for backend, manager in managers.items()}
+                    expected = _all_pages(pages["jsonl"])
+                    matches = pages["jsonl"].first_page().matches
+                    for backend in ("sqlite", "binary"):
+                        paged = _all_pages(pages[backend])
+                        assert fields(paged) == fields(expected), (backend, record_filter, sort, descending)
+                        assert pages[backend].first_page().matches == matches, (backend, record_filter)
+                        assert pages[backend].previous_page().number == 1
+        for manager in managers.values():
+            manager.close()
+        rm.close()
+        print("Pages from SQLite and binary stores match the JSON lines pages")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("\n✅ Records viewer tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_records_viewer()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests for differential timer screen rendering
+"""
+
+import io
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.screen_frame import FrameRenderer
+from src.speech_types import TimerColor
+from src.terminal import AnsiTerminal, TerminalBackend
+
+CONTROL = re.compile(r"\033\[(?:(\d+);(\d+)H|K|H\033\[2J|\d+(?:;\d+)*m)")
+
+
+def _apply(screen, text):
+    """Play ANSI output onto a screen of rows (lists of characters)"""
+    row = column = 0
+    position = 0
+    for match in list(CONTROL.finditer(text)) + [None]:
+        end = match.start() if match else len(text)
+        for char in text[position:end]:
+            if char == "\n":
+                row, column = row + 1, 0
+                continue
+            while len(screen) <= row:
+                screen.append([])
+            line = screen[row]
+            while len(line) < column:
+                line.append(" ")
+            if column < len(line):
+                line[column] = char
+            else:
+                line.append(char)
+            column += 1
+        if match is None:
+            break
+        code = match.group(0)
+        if match.group(1):
+            row, column = int(match.group(1)) - 1, int(match.group(2)) - 1
+        elif code == "\033[K":
+            if row < len(screen):
+                del screen[row][column:]
+        elif code.endswith("2J"):
+            screen.clear()
+            row = column = 0
+        position = match.end()
+    return screen
+
+
+def _text(screen):
+    rows = ["".join(line) for line in screen]
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+
+class FullRedrawTerminal(TerminalBackend):
+    """A backend without cursor positioning that records what it was sent"""
+
+    def __init__(self):
+        self.clears = 0
+        self.output = []
+
+    def write(self, text):
+        self.output.append(text)
+
+    def clear_screen(self):
+        self.clears += 1
+
+    def set_background_color(self, color: TimerColor):
+        pass
+
+
+def test_screen_frame():
+    """Diffs touch only changed rows and reproduce the new frame exactly"""
+    print("Testing Frame Renderer")
+    print("=" * 50)
+
+    # Test 1: the first frame is a full redraw, an identical frame sends nothing
+    print("\n1. Drawing the first frame...")
+    stream = io.StringIO()
+    renderer = FrameRenderer(AnsiTerminal(stream))
+    frame = ["TIMER", "  Elapsed: 00:01", "  Green at 05:00"]
+    renderer.render(frame)
+    assert stream.getvalue() == AnsiTerminal.CLEAR + "\n".join(frame) + "\n"
+    written = len(stream.getvalue())
+    renderer.render(list(frame))
+    assert stream.getvalue()[written:] == ""
+    print("Full first frame; unchanged frame costs nothing")
+
+    # Test 2: only the changed row is rewritten, from the first changed column
+    print("\n2. Updating one row...")
+    diff = FrameRenderer.diff(frame, ["TIMER", "  Elapsed: 00:02", "  Green at 05:00"])
+    assert diff == "\033[2;16H2\033[K\033[4;1H", repr(diff)
+    print(f"Diff: {diff!r}")
+
+    # Test 3: a non-ASCII or escape-coded prefix is rewritten from column 1
+    print("\n3. Rows with emoji and color codes...")
+    red = AnsiTerminal.COLOR_CODES[TimerColor.RED]
+    reset = AnsiTerminal.COLOR_CODES[TimerColor.BLANK]
+    emoji = FrameRenderer.diff(["🎤 Elapsed: 00:01"], ["🎤 Elapsed: 00:02"])
+    assert emoji.startswith("\033[1;1H🎤 Elapsed: 00:02"), repr(emoji)
+    colored = FrameRenderer.diff([f"{red}RED{reset} 00:01"], [f"{red}RED{reset} 00:02"])
+    assert colored.startswith(f"\033[1;1H{red}RED"), repr(colored)
+    # An ASCII prefix followed by a changed emoji still skips the prefix
+    later = FrameRenderer.diff(["Status: 🟢"], ["Status: 🔴"])
+    assert later.startswith("\033[1;9H🔴"), repr(later)
+    print("Unpredictable column widths fall back to the start of the row")
+
+    # Test 4: applying the diffs gives the same screen as drawing each frame in full
+    print("\n4. Replaying a sequence of frames...")
+    frames = [
+        ["TIMER", "  Elapsed: 00:09", "  Next: green", "  - 05:00 - GREEN"],
+        ["TIMER", "  Elapsed: 00:10", "  Next: green", "  - 05:00 - GREEN"],
+        ["TIMER", "  Elapsed: 05:00", "  🟢 GREEN", "  - 05:00 - GREEN ✓"],
+        ["TIMER", "  Elapsed: 5:01"],
+        ["TIMER", "  Elapsed: 05:02", "", f"  {red}OVERTIME{reset}", "  extra row"],
+        ["TIMER"],
+    ]
+    stream = io.StringIO()
+    renderer = FrameRenderer(AnsiTerminal(stream))
+    screen = []
+    for lines in frames:
+        start = len(stream.getvalue())
+        renderer.render(lines)
+        _apply(screen, stream.getvalue()[start:])
+        assert _text(screen) == _text(_apply([], "\n".join(lines))), (lines, _text(screen))
+    print(f"{len(frames)} frames replayed onto a virtual screen")
+
+    # Test 5: backends without cursor support and invalidated frames get a full redraw
+    print("\n5. Falling back to full redraws...")
+    plain = FullRedrawTerminal()
+    renderer = FrameRenderer(plain)
+    for lines in frames[:3]:
+        renderer.render(lines)
+    assert plain.clears == 3 and plain.output[-1] == "\n".join(frames[2]) + "\n"
+    stream = io.StringIO()
+    renderer = FrameRenderer(AnsiTerminal(stream))
+    renderer.render(frames[0])
+    renderer.invalidate()
+    renderer.render(frames[1])
+    assert stream.getvalue().count(AnsiTerminal.CLEAR) == 2
+    print("Full redraws where a diff cannot be used")
+
+    print("\n✅ Frame renderer tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_screen_frame()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for the network timer signal server
+"""
+
+import json
+import os
+import queue
+import socket
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.clock import VirtualClock
+from src.signal_server import SIGNAL_PAGE, SignalServer, parse_address, subscribe
+from src.speech_types import SpeechType, TimerColor
+from src.timer_engine import TimerEngine, TimerUpdate
+
+
+def _listen(port, room=None):
+    """Subscribe on a background thread; returns a queue of received updates"""
+    received = queue.Queue()
+
+    def run():
+        try:
+            for update in subscribe("127.0.0.1", port, room, timeout=5):
+                received.put(update)
+        except OSError:
+            pass
+
+    threading.Thread(target=run, daemon=True).start()
+    return received
+
+
+def _wait_for_subscribers(server, count):
+    for _ in range(500):
+        if server.subscriber_count >= count:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError(f"only {server.subscriber_count} of {count} subscribers connected")
+
+
+def test_signal_server():
+    """Publish timer updates to line-protocol and SSE subscribers"""
+    print("Testing Signal Server")
+    print("=" * 50)
+
+    server = SignalServer("127.0.0.1", 0)
+    port = server.start()
+    try:
+        # Test 1: line protocol, every update of an attached engine in order
+        print("\n1. Streaming a simulated speech over the line protocol...")
+        everything = _listen(port)
+        _wait_for_subscribers(server, 1)
+        engine = TimerEngine(headless=True, clock=VirtualClock())
+        server.attach(engine)
+        engine.run_for(SpeechType.TEST, 40)
+        updates = [everything.get(timeout=5) for _ in range(server._seq)]
+        assert [update["seq"] for update in updates] == list(range(1, server._seq + 1))
+        transitions = [(u["elapsed"], u["event"]) for u in updates if u["kind"] == "transition"]
+        assert transitions[0] == (5, "green"), transitions
+        assert updates[-1]["kind"] == "stopped" and updates[-1]["color"] == "red"
+        print(f"{len(updates)} updates received, transitions {transitions}")
+
+        # Test 2: Server-Sent Events, starting with a replay of the latest state
+        print("\n2. Subscribing over Server-Sent Events...")
+        with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+            sock.sendall(b"GET /events?room=Hall HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            _wait_for_subscribers(server, 2)
+            server.publish(TimerUpdate("tick", SpeechType.TEST, 3, TimerColor.BLANK), "Other")
+            server.publish(TimerUpdate("transition", SpeechType.TEST, 10, TimerColor.GREEN), "Hall")
+            data = b""
+            while b"\n\n" not in data.split(b"\r\n\r\n", 1)[-1]:
+                data += sock.recv(4096)
+        headers, body = data.split(b"\r\n\r\n", 1)
+        assert b"text/event-stream" in headers
+        assert body.startswith(b"data: ")
+        update = json.loads(body[len(b"data: "):body.index(b"\n\n")])
+        assert update["room"] == "Hall" and update["color"] == "green", update
+        print("SSE frame received; other rooms filtered out")
+
+        late = _listen(port, "Hall")
+        replayed = late.get(timeout=5)
+        assert replayed["seq"] == update["seq"], "latest state was not replayed"
+        print("Latest state replayed to a new subscriber")
+
+        # Test 3: the signal page and unknown paths
+        print("\n3. Serving the signal page...")
+        for path, expected in (("/", b"200 OK"), ("/missing", b"404")):
+            with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+                sock.sendall(f"GET {path} HTTP/1.1\r\n\r\n".encode())
+                response = b""
+                while chunk := sock.recv(65536):
+                    response += chunk
+            assert expected in response.split(b"\r\n", 1)[0], response[:80]
+        assert b"setInterval(show" in SIGNAL_PAGE, "page should count on between updates"
+        print("Page and 404 ok")
+
+        # Test 4: a headless engine with ticks, as the daemon runs it, streams every second
+        print("\n4. Streaming ticks from a headless engine...")
+        ticking = _listen(port)
+        _wait_for_subscribers(server, 3)
+        engine = TimerEngine(headless=True, clock=VirtualClock(), ticks=True)
+        server.attach(engine)
+        first = server._seq + 1
+        engine.run_for(SpeechType.TEST, 12)
+        updates = []
+        while not updates or updates[-1]["kind"] != "stopped":
+            update = ticking.get(timeout=5)
+            # Skip the replayed latest state
+            if update["seq"] >= first:
+                updates.append(update)
+        ticks = [update["elapsed"] for update in updates if update["kind"] == "tick"]
+        assert ticks == list(range(12)), ticks
+        print(f"{len(ticks)} ticks received")
+    finally:
+        server.stop()
+
+    # Test 5: only an explicit address exposes the stream to the network
+    print("\n5. Choosing the listening address...")
+    assert parse_address("8765") == ("127.0.0.1", 8765) and parse_address(":8765") == ("127.0.0.1", 8765)
+    assert parse_address("0.0.0.0:8765") == ("0.0.0.0", 8765)
+    assert SignalServer().host == "127.0.0.1"
+    try:
+        parse_address("localhost:http")
+        raise AssertionError("accepted a port that is not a number")
+    except ValueError:
+        pass
+    print("Loopback unless a host is given")
+
+    print("\n✅ Signal server tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_signal_server()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Tests for speech types loaded from TOML and JSON definition files
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src import speech_registry
+from src.analytics import outcome_bounds
+from src.clock import VirtualClock
+from src.speech_registry import (CustomSpeechType, compile_registry, get_registry, load_registry,
+                                 set_definitions_file)
+from src.speech_types import SpeechConfig, SpeechType, TimerColor
+from src.timer_engine import TimerEngine
+from src.timing_schedule import get_schedule
+
+KEYNOTE_TOML = """
+[[speech_types]]
+key = "keynote"
+name = "Keynote Speech"
+green = "10:00"
+yellow = "11:00"
+red = "12:00"
+grace_period = 30
+
+[[speech_types]]
+key = "table_topic"
+name = "Table Topic Speech"
+green = 60
+yellow = 90
+red = 120
+grace_period = 15
+"""
+
+
+def _write(path, text):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def _expect_error(data, fragment):
+    try:
+        compile_registry(data, "test")
+    except ValueError as e:
+        assert fragment in str(e), f"{fragment!r} not in {e}"
+    else:
+        raise AssertionError(f"accepted invalid definitions: {data}")
+
+
+def test_speech_registry():
+    """Load, validate, override and hot-reload speech types"""
+    print("Testing Speech Registry")
+    print("=" * 50)
+
+    workdir = tempfile.mkdtemp(prefix="toastmaster-types-")
+    try:
+        # Test 1: built-ins are compiled with their precomputed times
+        print("\n1. Compiling the built-in speech types...")
+        builtins = compile_registry({})
+        assert builtins.speech_types() == tuple(SpeechConfig.SPEECH_CONFIGS)
+        prepared = builtins.get(SpeechType.PREPARED)
+        assert (prepared.green_time, prepared.yellow_time, prepared.red_time) == (300, 360, 420)
+        assert prepared.grace_end_time == 450 and prepared.disqualify_time == 450
+        table_topic = builtins.get("table_topic")
+        assert table_topic.grace_end_time == 0 and table_topic.disqualify_time is None
+        assert builtins.get("prepared") is prepared and "sonnet" not in builtins
+        print(f"{len(builtins)} built-in types")
+
+        # Test 2: a TOML file adds a custom type and overrides one in place
+        print("\n2. Loading a TOML file...")
+        toml_path = os.path.join(workdir, "speech_types.toml")
+        _write(toml_path, KEYNOTE_TOML)
+        registry = load_registry(toml_path)
+        keys = [definition.key for definition in registry]
+        assert keys == [t.value for t in SpeechConfig.SPEECH_CONFIGS] + ["keynote"], keys
+        keynote = registry.get("keynote")
+        assert keynote.speech_type == CustomSpeechType("keynote") and keynote.speech_type.name == "KEYNOTE"
+        assert (keynote.red_time, keynote.grace_end_time, keynote.duration_range) == (720, 750, "10-12 minutes")
+        assert registry.get(SpeechType.TABLE_TOPIC).grace_period == 15
+        assert registry.menu()[str(len(keys))] == keynote.speech_type
+        print(f"Menu: {', '.join(definition.name for definition in registry)}")
+
+        # Test 3: the same definitions as JSON, without the built-ins
+        print("\n3. Loading a JSON file...")
+        json_path = os.path.join(workdir, "speech_types.json")
+        _write(json_path, json.dumps({"include_builtins": False, "speech_types": [
+            {"key": "intro", "name": "Humorous Introduction", "green": 20, "yellow": 25, "red": 30}]}))
+        only = load_registry(json_path)
+        assert [definition.key for definition in only] == ["intro"]
+        assert only.get("intro").duration_range == "0:20-0:30" and only.get("intro").grace_end_time == 0
+        print("JSON definitions loaded")
+
+        # Test 4: invalid definitions are rejected with the reason
+        print("\n4. Validating definitions...")
+        _expect_error({"speech_types": [{"key": "Keynote", "name": "K", "red": 60}]}, "'key'")
+        _expect_error({"speech_types": [{"key": "k", "red": 60}]}, "'name' is required")
+        _expect_error({"speech_types": [{"key": "k", "name": "K", "green": 30}]}, "'red' is required")
+        _expect_error({"speech_types": [{"key": "k", "name": "K", "green": 60, "red": "0:30"}]},
+                      "red must come after green")
+        _expect_error({"speech_types": [{"key": "k", "name": "K", "red": "1:75"}]}, "M:SS")
+        _expect_error({"speech_types": [{"key": "k", "name": "K", "red": 60, "colour": "blue"}]}, "colour")
+        _expect_error({"speech_types": [{"key": "k", "name": "K", "red": 60, "grace_period": -1}]}, "grace_period")
+        _expect_error({"speech_types": [{"key": "k", "name": "K", "red": 60}] * 2}, "defined twice")
+        _expect_error({"include_builtins": False}, "no speech types")
+        bad_toml = os.path.join(workdir, "bad.toml")
+        _write(bad_toml, "[[speech_types]\n")
+        try:
+            load_registry(bad_toml)
+            raise AssertionError("accepted malformed TOML")
+        except ValueError:
+            pass
+        print("Invalid definitions rejected")
+
+        # Test 5: the app follows the file, reloading when it changes
+        print("\n5. Hot-reloading the definitions file...")
+        speech_registry.RELOAD_CHECK_SECONDS = 0
+        set_definitions_file(toml_path)
+        assert get_registry() is get_registry(), "unchanged file was recompiled"
+        keynote_type = get_registry().speech_type("keynote")
+        assert SpeechConfig.get_red_time(keynote_type) == 720
+        schedule = get_schedule(keynote_type)
+        assert sorted({event.at for event in schedule.events}) == [600, 660, 720, 750]
+        assert outcome_bounds("keynote") is not None
+
+        engine = TimerEngine(headless=True, clock=VirtualClock())
+        colors = []
+        engine.add_listener(lambda update: colors.append((update.elapsed, update.color)))
+        engine.run_for(keynote_type, 700)
+        assert (600, TimerColor.GREEN) in colors and (660, TimerColor.YELLOW) in colors, colors
+
+        _write(toml_path, KEYNOTE_TOML.replace('red = "12:00"', 'red = "12:30"'))
+        os.utime(toml_path, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+        assert SpeechConfig.get_red_time(keynote_type) == 750
+        print("Edit picked up without a restart")
+
+        before = get_registry()
+        _write(toml_path, "[[speech_types]]\nkey = 'keynote'\n")
+        os.utime(toml_path, ns=(time.time_ns(), time.time_ns() + 2 * 10 ** 9))
+        assert get_registry() is before, "invalid edit replaced the last good definitions"
+        print("Invalid edit ignored; previous definitions kept")
+
+        set_definitions_file(None)
+        assert get_registry().speech_types() == tuple(SpeechConfig.SPEECH_CONFIGS), "file outlived the reset"
+        assert get_registry().get("keynote") is None
+        print("Reset back to the built-in types")
+
+        # Test 6: lookups between file checks are cheap
+        speech_registry.RELOAD_CHECK_SECONDS = 1.0
+        started = time.perf_counter()
+        for _ in range(100000):
+            SpeechConfig.get_red_time(SpeechType.PREPARED)
+        print(f"\n6. get_red_time: {(time.perf_counter() - started) * 10:.3f} µs per lookup")
+    finally:
+        set_definitions_file(None)
+        speech_registry.RELOAD_CHECK_SECONDS = 1.0
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("\n✅ Speech registry tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_speech_registry()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite record backend
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.record_manager import RecordManager
+from src.record_storage import JsonLinesStorage
+from src.speech_types import SpeechType
+from src.sqlite_store import import_json, export_json
+
+
+def test_sqlite_store():
+    """Compare the SQLite backend with the JSON Lines backend on the same records"""
+    print("Testing SQLite Record Backend")
+    print("=" * 50)
+
+    workdir = tempfile.mkdtemp(prefix="toastmaster-sqlite-")
+    try:
+        json_file = os.path.join(workdir, "records.json")
+        db_file = os.path.join(workdir, "records.db")
+
+        # Test 1: migration from JSON
+        print("\n1. Migrating JSON records...")
+        json_rm = RecordManager(json_file)
+        speakers = ["Alice", "Bob", "Carol Brown"]
+        types = list(SpeechType)
+        json_rm.add_records((types[n % len(types)], speakers[n % len(speakers)], 60 + n) for n in range(120))
+        assert import_json(json_file, db_file) == 120
+        print("Migrated 120 records")
+
+        # Test 2: indexed queries agree with the JSON backend
+        print("\n2. Comparing queries...")
+        sqlite_rm = RecordManager(db_file, backend="sqlite")
+        as_dicts = lambda records: [record.to_dict() for record in records]
+        assert sqlite_rm.get_records_count() == 120
+        assert as_dicts(sqlite_rm.get_all_records()) == as_dicts(json_rm.get_all_records())
+        for speaker in speakers + ["ALICE", "nobody"]:
+            assert as_dicts(sqlite_rm.get_records_by_speaker(speaker)) == \
+                as_dicts(json_rm.get_records_by_speaker(speaker)), speaker
+        for speech_type in types:
+            assert as_dicts(sqlite_rm.get_records_by_type(speech_type)) == \
+                as_dicts(json_rm.get_records_by_type(speech_type))
+        start = datetime.fromisoformat(json_rm.get_all_records()[30].timestamp)
+        end = datetime.fromisoformat(json_rm.get_all_records()[90].timestamp)
+        assert as_dicts(sqlite_rm.get_records_between(start, end)) == \
+            as_dicts(json_rm.get_records_between(start, end))
+        print("Speaker, type and time range queries match")
+
+        # Test 3: batch insert, export and clear
+        print("\n3. Batch inserting, exporting and clearing...")
+        sqlite_rm.add_records([(SpeechType.TEST, "Dave", n) for n in range(10)])
+        assert len(sqlite_rm.get_records_by_speaker("dave")) == 10
+        assert len(sqlite_rm.get_record_batch()) == 130
+        exported = os.path.join(workdir, "exported.json")
+        assert export_json(db_file, exported) == 130
+        assert RecordManager(exported).get_records_count() == 130
+        sqlite_rm.clear_records()
+        assert sqlite_rm.get_records_count() == 0 and len(sqlite_rm.get_record_batch()) == 0
+        sqlite_rm.close()
+        json_rm.close()
+        print("Batch insert, export and clear ok")
+
+        # Test 4: timestamps with UTC offsets compare by the time they name
+        print("\n4. Ranges over timestamps with UTC offsets...")
+        offsets_file = os.path.join(workdir, "offsets.json")
+        with open(offsets_file, 'w', encoding='utf-8') as f:
+            for name, timestamp in (("Early", "2024-05-01T19:05:00"), ("Abroad", "2024-05-01T21:10:00+02:00"),
+                                    ("Late", "2024-05-01T20:00:00")):
+                f.write(JsonLinesStorage.encode({"timestamp": timestamp, "speech_type": "test",
+                                                 "speaker_name": name, "duration_seconds": 60}))
+        offsets_db = os.path.join(workdir, "offsets.db")
+        assert import_json(offsets_file, offsets_db) == 3
+        start, end = datetime(2024, 5, 1, 19, 0), datetime(2024, 5, 1, 19, 30)
+        offsets_rm = RecordManager(offsets_db, backend="sqlite")
+        assert [r.speaker_name for r in offsets_rm.get_records_between(start, end)] == ["Early", "Abroad"]
+        assert [r.speaker_name for r in RecordManager(offsets_file).get_records_between(start, end)] == \
+            ["Early", "Abroad"]
+        offsets_rm.close()
+
+        # A database written before the micros column is upgraded when opened
+        old_db = os.path.join(workdir, "old.db")
+        connection = sqlite3.connect(old_db)
+        connection.execute("CREATE TABLE speech_records (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                           "timestamp TEXT NOT NULL, speech_type TEXT NOT NULL, speaker_name TEXT NOT NULL, "
+                           "duration_seconds INTEGER NOT NULL)")
+        connection.execute("CREATE INDEX idx_records_timestamp ON speech_records (timestamp)")
+        connection.execute("INSERT INTO speech_records (timestamp, speech_type, speaker_name, duration_seconds) "
+                           "VALUES ('2024-05-01T21:10:00+02:00', 'test', 'Abroad', 60)")
+        connection.commit()
+        connection.close()
+        old_rm = RecordManager(old_db, backend="sqlite")
+        assert [r.speaker_name for r in old_rm.get_records_between(start, end)] == ["Abroad"]
+        assert old_rm.get_all_records()[0].timestamp == "2024-05-01T21:10:00+02:00"
+        old_rm.close()
+        print("Offset timestamps found in UTC ranges; old database upgraded")
+
+        # Test 5: a mistyped source is an error, not an empty import
+        print("\n5. Importing from and exporting to missing files...")
+        for convert, source in ((import_json, os.path.join(workdir, "typo.json")),
+                                (export_json, os.path.join(workdir, "typo.db"))):
+            try:
+                convert(source, os.path.join(workdir, "target"))
+            except FileNotFoundError:
+                pass
+            else:
+                raise AssertionError(f"{convert.__name__} accepted a missing {source}")
+        assert not [name for name in os.listdir(workdir) if name.startswith(("typo", "target"))], os.listdir(workdir)
+        print("Missing sources refused; nothing created")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("\n✅ SQLite backend tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_sqlite_store()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for lazy start-up and terminal color de-duplication
+"""
+
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.record_manager import RecordManager
+from src.speech_types import SpeechType, TimerColor
+from src.terminal import AnsiTerminal
+
+
+def test_startup():
+    """Nothing slow or file-touching happens before it is needed"""
+    print("Testing Start-up")
+    print("=" * 50)
+
+    # Test 1: importing main leaves the optional heavy modules unloaded
+    print("\n1. Checking modules loaded by main.py...")
+    here = os.path.dirname(os.path.abspath(__file__))
+    loaded = subprocess.run(
+        [sys.executable, "-c", "import sys, main; print(' '.join(sorted(sys.modules)))"],
+        cwd=here, capture_output=True, text=True, check=True).stdout.split()
+    for module in ("asyncio", "sqlite3", "gzip", "csv", "src.signal_server", "src.timer_daemon",
+                   "src.timer_registry", "src.records_viewer", "src.record_summary"):
+        assert module not in loaded, f"{module} is imported at start-up"
+    print(f"{len(loaded)} modules; asyncio, sqlite3, gzip, csv, contest timers, viewer and summary deferred")
+
+    # Test 2: RecordManager opens its storage on first use
+    print("\n2. Creating a RecordManager...")
+    workdir = tempfile.mkdtemp(prefix="toastmaster-startup-")
+    try:
+        filename = os.path.join(workdir, "records.json")
+        rm = RecordManager(filename)
+        assert not os.path.exists(filename), "records file created before first use"
+        assert rm.get_records_count() == 0 and os.path.exists(filename)
+        rm.add_record(SpeechType.TEST, "Alice", 42)
+        assert rm.get_records_count() == 1
+        rm.close()
+        RecordManager(os.path.join(workdir, "never-used.json")).close()
+        assert not os.path.exists(os.path.join(workdir, "never-used.json"))
+        try:
+            RecordManager(filename, backend="paper")
+            raise AssertionError("unknown backend accepted")
+        except ValueError:
+            pass
+        print("Storage opened lazily; unknown backends still rejected up front")
+
+        # Test 3: each backend has its own default, and a store it cannot read stops the app
+        print("\n3. Opening records with the wrong backend...")
+        assert [RecordManager(backend=backend).filename for backend in ("jsonl", "binary", "sqlite")] == [
+            "speech_records.json", "speech_records.tmr", "speech_records.db"]
+        for backend in ("binary", "sqlite"):
+            try:
+                RecordManager(filename, backend=backend).open()
+            except Exception as e:
+                print(f"{backend}: {e}")
+            else:
+                raise AssertionError(f"{backend} backend opened a JSON Lines file")
+            result = subprocess.run(
+                [sys.executable, os.path.join(here, "main.py"), "--records-backend", backend, "--records-file", filename],
+                cwd=workdir, stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=30)
+            assert result.returncode == 1 and "Could not open" in result.stdout, (result.stdout, result.stderr)
+        assert RecordManager(filename).get_records_count() == 1
+        print("Exited before the menu instead of losing saves")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    # Test 4: repeated color resets write nothing
+    print("\n4. De-duplicating terminal color changes...")
+    stream = io.StringIO()
+    terminal = AnsiTerminal(stream)
+    for color in (TimerColor.BLANK, TimerColor.BLANK, TimerColor.GREEN, TimerColor.GREEN, TimerColor.BLANK):
+        terminal.set_background_color(color)
+    codes = AnsiTerminal.COLOR_CODES
+    assert stream.getvalue() == codes[TimerColor.BLANK] + codes[TimerColor.GREEN] + codes[TimerColor.BLANK]
+    # Colored text ends with a reset, so the next change is always written
+    terminal.set_background_color(TimerColor.RED)
+    terminal.write(terminal.color_text("RED", TimerColor.RED))
+    before = len(stream.getvalue())
+    terminal.set_background_color(TimerColor.RED)
+    assert len(stream.getvalue()) > before, "color after colored text was skipped"
+    print("Repeated resets skipped")
+
+    print("\n✅ Start-up tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_startup()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
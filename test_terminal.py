@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the terminal output backends
+"""
+
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src import terminal as terminal_module
+from src.display_manager import DisplayManager
+from src.metrics import metrics
+from src.speech_types import SpeechType, TimerColor
+from src.terminal import AnsiTerminal, NullTerminal, create_terminal, get_terminal, set_terminal
+
+
+def test_terminal():
+    """ANSI output, color de-duplication, the null backend and backend selection"""
+    print("Testing Terminal Backends")
+    print("=" * 50)
+
+    # Test 1: ANSI backend writes escape sequences, never starts a process
+    print("\n1. Writing ANSI sequences...")
+    stream = io.StringIO()
+    ansi = AnsiTerminal(stream)
+    ansi.clear_screen()
+    ansi.set_background_color(TimerColor.GREEN)
+    ansi.write("05:00")
+    assert stream.getvalue() == AnsiTerminal.CLEAR + AnsiTerminal.COLOR_CODES[TimerColor.GREEN] + "05:00"
+    assert ansi.color_text("RED", TimerColor.RED) == (
+        AnsiTerminal.COLOR_CODES[TimerColor.RED] + "RED" + AnsiTerminal.COLOR_CODES[TimerColor.BLANK])
+    assert ansi.color_text("plain", TimerColor.BLANK) == "plain"
+    print("Clear, color and colored text written as escape codes")
+
+    # Test 2: a color that is already set is not written again
+    print("\n2. De-duplicating color changes...")
+    stream = io.StringIO()
+    ansi = AnsiTerminal(stream)
+    for color in (TimerColor.YELLOW, TimerColor.YELLOW, TimerColor.YELLOW, TimerColor.RED, TimerColor.RED):
+        ansi.set_background_color(color)
+    codes = AnsiTerminal.COLOR_CODES
+    assert stream.getvalue() == codes[TimerColor.YELLOW] + codes[TimerColor.RED]
+    # Colored text ends with a reset, so the current color is unknown afterwards
+    ansi.write(ansi.color_text("x", TimerColor.GREEN))
+    written = len(stream.getvalue())
+    ansi.set_background_color(TimerColor.RED)
+    assert stream.getvalue()[written:] == codes[TimerColor.RED]
+    print("Repeated colors skipped")
+
+    # Test 3: the null backend discards everything, so the display code runs headless
+    print("\n3. Drawing on the null terminal...")
+    previous = get_terminal()
+    metrics.enable()
+    metrics.reset()
+    stdout = sys.stdout
+    sys.stdout = captured = io.StringIO()
+    try:
+        null = NullTerminal()
+        set_terminal(null)
+        assert get_terminal() is null and null.supports_cursor
+        for second in range(0, 420, 7):
+            DisplayManager.show_timer_info(SpeechType.PREPARED, second, TimerColor.GREEN)
+        DisplayManager.set_background_color(TimerColor.RED)
+        DisplayManager.clear_screen()
+    finally:
+        sys.stdout = stdout
+        set_terminal(previous)
+        spawns = metrics.snapshot()["counters"].get("toastmaster_display_subprocess_spawns_total", 0)
+        metrics.disable()
+        metrics.reset()
+    assert spawns == 0, f"{spawns} shell processes started"
+    assert "\033[" not in captured.getvalue(), "null terminal output reached stdout"
+    print("Timer screens drawn with no output and no processes")
+
+    # Test 4: selecting a backend by name or environment variable
+    print("\n4. Choosing a backend...")
+    assert isinstance(create_terminal("null"), NullTerminal)
+    assert isinstance(create_terminal("ansi"), AnsiTerminal)
+    saved = os.environ.get("TOASTMASTER_TERMINAL")
+    os.environ["TOASTMASTER_TERMINAL"] = "null"
+    try:
+        assert isinstance(create_terminal(), NullTerminal)
+    finally:
+        if saved is None:
+            del os.environ["TOASTMASTER_TERMINAL"]
+        else:
+            os.environ["TOASTMASTER_TERMINAL"] = saved
+    try:
+        create_terminal("teletype")
+        raise AssertionError("unknown backend accepted")
+    except ValueError:
+        pass
+    assert set(terminal_module.BACKENDS) == {"ansi", "windows", "null"}
+    print("Backends chosen by name and TOASTMASTER_TERMINAL")
+
+    print("\n✅ Terminal backend tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_terminal()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
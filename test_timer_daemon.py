@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for the headless timer daemon and its control socket
+"""
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.record_manager import RecordManager
+from src.timer_daemon import DaemonClient, TimerDaemon, encode_frame
+
+
+def test_timer_daemon():
+    """Drive a daemon through its socket: timer commands, records, errors, concurrency"""
+    print("Testing Timer Daemon")
+    print("=" * 50)
+
+    workdir = tempfile.mkdtemp(prefix="toastmaster-daemon-")
+    socket_path = os.path.join(workdir, "timer.sock")
+    daemon = TimerDaemon(socket_path, RecordManager(os.path.join(workdir, "records.json")))
+    ready = threading.Event()
+    thread = threading.Thread(target=lambda: asyncio.run(daemon.serve(ready.set)), daemon=True)
+    thread.start()
+    assert ready.wait(5), "daemon did not start"
+    try:
+        assert os.stat(socket_path).st_mode & 0o077 == 0, "control socket is readable by others"
+
+        # Test 1: start, status, stop with a speaker records the speech
+        print("\n1. Running a speech through the daemon...")
+        with DaemonClient(socket_path) as client:
+            assert client.request("ping")["ok"]
+            assert client.request("start", type="test")["speech_type"] == "test"
+            status = client.request("status")
+            assert status["running"] and status["speech_type"] == "test", status
+            time.sleep(1.1)
+            stopped = client.request("stop", speaker="Alice")
+            assert stopped["ok"] and stopped["elapsed"] >= 1, stopped
+            assert stopped["record"]["speaker_name"] == "Alice"
+            records = client.request("records", speaker="alice")
+            assert records["matches"] == 1 and records["records"][0]["speech_type"] == "test"
+            print(f"Recorded {stopped['record']['duration_formatted']} for Alice")
+
+            # Test 2: refused commands come back as errors, with the request id
+            print("\n2. Checking errors...")
+            assert "No timer" in client.request("stop")["error"]
+            assert "Unknown speech type" in client.request("start", type="sonnet")["error"]
+            assert "Unknown command" in client.request("dance")["error"]
+            client.request("start", type="prepared")
+            assert "already running" in client.request("start", type="test", id=7)["error"]
+            assert client.request("status", id=8)["id"] == 8
+            # Malformed fields are refused before the timer is touched
+            assert "'speaker' must be a string" in client.request("stop", speaker=5)["error"]
+            assert client.request("status")["running"], "refused stop still stopped the timer"
+            assert "'speaker' must be a string" in client.request("records", speaker=5)["error"]
+            assert "'limit' must be an integer" in client.request("records", limit="5")["error"]
+            assert "'type' must be a string" in client.request("start", type=["test"])["error"]
+            assert "Unknown command" in client.request(["stop"])["error"]
+            assert client.request("stop")["record"] is None
+            ping = daemon._handlers["ping"]
+            daemon._handlers["ping"] = lambda request: {}["pid"]
+            try:
+                assert client.request("ping", id=9) == {"ok": False, "error": "KeyError: 'pid'", "id": 9}
+            finally:
+                daemon._handlers["ping"] = ping
+            print("Errors reported")
+
+        # Test 3: pipelined requests on one connection answer in order
+        print("\n3. Pipelining requests...")
+        with DaemonClient(socket_path) as client:
+            client._sock.sendall(b"".join(encode_frame({"cmd": "status", "id": n}) for n in range(100)))
+            ids = []
+            for _ in range(100):
+                length = int.from_bytes(client._read(4), 'big')
+                ids.append(json.loads(client._read(length))["id"])
+            assert ids == list(range(100)), ids[:10]
+            print("100 pipelined responses in order")
+
+        # Test 4: many clients at once
+        print("\n4. Serving concurrent clients...")
+        latencies = []
+
+        def worker():
+            with DaemonClient(socket_path) as client:
+                for _ in range(50):
+                    started = time.perf_counter()
+                    assert client.request("status")["ok"]
+                    latencies.append(time.perf_counter() - started)
+
+        workers = [threading.Thread(target=worker) for _ in range(20)]
+        for thread_ in workers:
+            thread_.start()
+        for thread_ in workers:
+            thread_.join()
+        assert len(latencies) == 1000
+        latencies.sort()
+        print(f"1000 status requests from 20 clients: median {latencies[500] * 1e3:.3f} ms")
+
+        with DaemonClient(socket_path) as client:
+            started = time.perf_counter()
+            for _ in range(200):
+                client.request("status")
+            print(f"Sequential status round trip: {(time.perf_counter() - started) / 200 * 1e3:.3f} ms")
+
+        # Test 5: shutdown hangs up on idle clients and removes the socket
+        print("\n5. Shutting down...")
+        errors = []
+        handler = logging.Handler(logging.ERROR)
+        handler.emit = errors.append
+        logging.getLogger("asyncio").addHandler(handler)
+        try:
+            with DaemonClient(socket_path) as idle, DaemonClient(socket_path) as client:
+                assert idle.request("ping")["ok"]
+                assert client.request("shutdown")["ok"]
+                thread.join(5)
+                assert idle._sock.recv(1) == b"", "idle client was not disconnected"
+        finally:
+            logging.getLogger("asyncio").removeHandler(handler)
+        assert not thread.is_alive() and not os.path.exists(socket_path)
+        assert not errors, [record.getMessage() for record in errors]
+        print("Daemon stopped, clients disconnected and socket removed")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("\n✅ Timer daemon tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_timer_daemon()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
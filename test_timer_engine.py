@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Tests for timer engine scheduling and stopping
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.clock import ScaledClock, VirtualClock
+from src.display_manager import DisplayManager
+from src.speech_types import SpeechType
+from src.terminal import NullTerminal
+from src.timer_engine import TimerController, TimerEngine
+
+
+def _run_with_slow_render(clock, render, seconds, speech_type=SpeechType.TEST):
+    """Run a displayed timer whose every frame takes ``render()``; returns (clock time, update) pairs"""
+    engine = TimerEngine(clock=clock)
+    updates = []
+    engine.add_listener(lambda update: updates.append((clock.monotonic(), update)))
+    show_timer_info = DisplayManager.show_timer_info
+    DisplayManager.show_timer_info = lambda *args: render()
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        engine.run_for(speech_type, seconds)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+        DisplayManager.show_timer_info = show_timer_info
+    return engine, updates
+
+
+def test_timer_engine():
+    """Ticks stay on whole-second deadlines however long rendering takes; stops are immediate"""
+    print("Testing Timer Engine Scheduling")
+    print("=" * 50)
+    DisplayManager.set_terminal(NullTerminal())
+
+    # Test 1: a render taking 0.4 s of every second does not push later ticks back
+    print("\n1. Rendering slowly...")
+    clock = VirtualClock(start=1000.0)
+    engine, updates = _run_with_slow_render(clock, lambda: clock.advance(0.4), 60)
+    ticks = [(at - 1000.0, update.elapsed) for at, update in updates if update.kind == "tick"]
+    assert [elapsed for _, elapsed in ticks] == list(range(60)), "ticks were skipped or repeated"
+    # Each tick is published after its render, 0.4 s past its whole-second deadline
+    # (or right on it while a grace notification is shown instead of the timer)
+    offsets = [round(at - elapsed, 6) for at, elapsed in ticks]
+    assert set(offsets) == {0.0, 0.4} and offsets.count(0.4) > 50, offsets
+    assert engine.tick_stats.max < 1e-6, engine.tick_stats.to_dict()
+    print(f"{len(ticks)} ticks, no drift after a minute")
+
+    # Test 2: a render slower than a second skips the missed ticks and realigns
+    print("\n2. Rendering slower than the tick interval...")
+    clock = VirtualClock()
+    engine, updates = _run_with_slow_render(clock, lambda: clock.advance(1.5), 30)
+    elapsed = [update.elapsed for _, update in updates if update.kind == "tick"]
+    # Ticks follow a 1.5 s render two seconds later (one second during grace notifications)
+    gaps = [after - before for before, after in zip(elapsed, elapsed[1:])]
+    assert elapsed[0] == 0 and set(gaps) == {1, 2} and gaps.count(2) > 10, elapsed
+    assert engine.tick_stats.max < 1e-6, "woke up late instead of skipping to the next second"
+    # Schedule transitions still carry their scheduled second
+    transitions = [update for _, update in updates if update.kind == "transition"]
+    assert [t.elapsed for t in transitions] == [event.at for event in engine.schedule.events]
+    print(f"Ticks at {elapsed[:4]}...; transitions at their scheduled seconds")
+
+    # Test 3: real sleeping with a slow render, accelerated 10x
+    print("\n3. Rendering slowly in real time...")
+    clock = ScaledClock(10)
+    started = time.perf_counter()
+    engine, updates = _run_with_slow_render(clock, lambda: time.sleep(0.03), 20)
+    wall = time.perf_counter() - started
+    ticks = [(at, update.elapsed) for at, update in updates if update.kind == "tick"]
+    start_time = engine.start_time
+    offsets = [at - start_time - elapsed for at, elapsed in ticks]
+    assert [elapsed for _, elapsed in ticks] == list(range(20)), [elapsed for _, elapsed in ticks]
+    # 0.3 clock seconds of render plus scheduler jitter, never accumulating
+    assert max(offsets) < 0.8 and abs(offsets[-1] - offsets[1]) < 0.5, offsets
+    assert wall < 3.0, f"20 clock seconds took {wall:.2f}s at 10x"
+    print(f"Tick offsets {min(offsets):.2f}-{max(offsets):.2f} clock seconds; run took {wall:.2f}s")
+
+    # Test 4: stopping wakes the worker and any waiter at once, not at the next tick
+    print("\n4. Stopping a running timer...")
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        for headless in (True, False):
+            controller = TimerController(headless=headless)
+            assert controller.start_speech_timer(SpeechType.PREPARED)
+            assert controller.engine.wait_until_started(1.0)
+            assert not controller.wait_for_timer_completion(timeout=0.05), "returned while still running"
+            woke = []
+
+            def waiter():
+                controller.wait_for_timer_completion()
+                woke.append(time.perf_counter())
+            thread = threading.Thread(target=waiter)
+            thread.start()
+            time.sleep(0.3)
+            stopped = time.perf_counter()
+            controller.stop_speech_timer()
+            thread.join(1.0)
+            worker = controller.engine.timer_thread
+            worker.join(1.0)
+            joined = time.perf_counter()
+            assert woke and not worker.is_alive(), "stop did not wake the timer"
+            assert woke[0] - stopped < 0.05, f"waiter woke {(woke[0] - stopped) * 1000:.1f} ms after stop"
+            assert joined - stopped < 0.1, f"worker exited {(joined - stopped) * 1000:.1f} ms after stop"
+            assert controller.wait_for_timer_completion(timeout=0) and controller.stop_speech_timer() == 0
+            print(f"{'Headless' if headless else 'Displayed'}: waiter woke after "
+                  f"{(woke[0] - stopped) * 1000:.2f} ms, worker exited after {(joined - stopped) * 1000:.2f} ms",
+                  file=stdout)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    # Test 5: deadlines whose elapsed time rounds just below the second
+    print("\n5. Waking on rounded deadlines...")
+    for start in (0.1, 4093.832606159153):
+        for ticks in (True, False):
+            engine = TimerEngine(headless=True, clock=VirtualClock(start), ticks=ticks)
+            updates = []
+            engine.add_listener(lambda update: updates.append(update))
+            result = []
+            # A worker republishing the same second never returns; give up on it
+            thread = threading.Thread(target=lambda: result.append(engine.run_for(SpeechType.TEST, 30)), daemon=True)
+            thread.start()
+            thread.join(5)
+            assert result == [30], f"run from {start} stuck after {len(updates)} updates"
+            ticks_seen = [update.elapsed for update in updates if update.kind == "tick"]
+            assert ticks_seen == (list(range(30)) if ticks else []), ticks_seen
+            transitions = [(update.event_type, update.elapsed) for update in updates if update.kind == "transition"]
+            assert transitions == [(event.event_type, event.at) for event in engine.schedule.events], transitions
+    print("Every second and transition published once")
+
+    # Test 6: a wake-up that oversleeps the stop still ends a timed run on its last second
+    print("\n6. Oversleeping the stop...")
+
+    class LateClock(VirtualClock):
+        def wait(self, event, timeout=None):
+            woken = super().wait(event, timeout)
+            self.now += 2.5
+            return woken
+    for ticks in (True, False):
+        engine = TimerEngine(headless=True, clock=LateClock(), ticks=ticks)
+        updates = []
+        engine.add_listener(lambda update: updates.append(update))
+        assert engine.run_for(SpeechType.TEST, 26) == 26
+        assert updates[-1].kind == "stopped" and updates[-1].elapsed == 26, updates[-1]
+        assert all(update.elapsed <= 26 for update in updates), [update.elapsed for update in updates]
+    print("Stopped at 26s")
+
+    print("\n✅ Timer engine scheduling tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_timer_engine()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-room timer registry scheduler
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src import timer_registry
+from src.speech_types import SpeechType, TimerColor
+from src.timer_registry import TimerRegistry
+from src.timing_schedule import TimingEventType, get_schedule
+
+# A start time for which (start + n) - start rounds to just under n for every
+# TEST event second, so elapsed time computed from the deadline falls short
+ROUNDING_START = 4093.832606159153
+
+
+class FakeTime:
+    """Stands in for the time module; monotonic() only moves when told to"""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def test_timer_registry():
+    """Events fire on their deadlines for many rooms, whatever the float rounding"""
+    print("Testing Timer Registry")
+    print("=" * 50)
+
+    # Test 1: a deadline whose elapsed time rounds below the event second still fires it
+    print("\n1. Waking exactly on a rounded deadline...")
+    schedule = get_schedule(SpeechType.TEST)
+    assert all(int((ROUNDING_START + at) - ROUNDING_START) < at for at in schedule.times)
+    fake = FakeTime(ROUNDING_START)
+    real_time = timer_registry.time
+    timer_registry.time = fake
+    registry = TimerRegistry()
+    received = []
+    changed = threading.Condition()
+
+    def listener(name, update):
+        with changed:
+            received.append(update)
+            changed.notify_all()
+    registry.add_listener(listener)
+    try:
+        registry.start("room", SpeechType.TEST)
+        expected = 0
+        for at in sorted(set(schedule.times)):
+            # A scheduler spinning on the previous deadline never releases the lock
+            assert registry._condition.acquire(timeout=2), f"scheduler stuck before {at}s"
+            try:
+                fake.now = ROUNDING_START + at
+                registry._condition.notify()
+            finally:
+                registry._condition.release()
+            expected += schedule.times.count(at)
+            with changed:
+                assert changed.wait_for(lambda: len(received) == expected, 2), \
+                    f"scheduler stuck at {at}s with {len(received)} updates"
+        assert [(update.event_type, update.elapsed) for update in received] == [
+            (event.event_type, event.at) for event in schedule.events]
+        status = registry.get_status("room")
+        assert status["current_color"] == TimerColor.RED and status["grace_period_ended"]
+        assert not registry._heap, "finished timer left a wake-up queued"
+        registry.stop("room")
+    finally:
+        timer_registry.time = real_time
+        if registry._condition.acquire(timeout=0.1):
+            registry._condition.release()
+            registry.close()
+    print(f"{len(received)} transitions fired at their scheduled seconds")
+
+    # Test 2: restarts and stops discard stale wake-ups
+    print("\n2. Restarting and stopping rooms...")
+    registry = TimerRegistry()
+    updates = []
+    registry.add_listener(lambda name, update: updates.append((name, update)))
+    try:
+        for number in range(200):
+            registry.start(f"room {number}", SpeechType.PREPARED)
+        registry.start("room 0", SpeechType.TEST)
+        for number in range(1, 200):
+            registry.stop(f"room {number}")
+        assert [status["running"] for status in registry.get_all_status()].count(True) == 1
+        time.sleep(0.2)
+        assert registry.get_status("room 0")["speech_type"] == SpeechType.TEST
+        assert all(update.kind == "stopped" for _, update in updates) and len(updates) == 199
+        assert registry.remove_timer("room 0") == 0 and "room 0" not in registry.names()
+    finally:
+        registry.close()
+    print("Stale wake-ups ignored")
+
+    print("\n✅ Timer registry tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_timer_registry()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)
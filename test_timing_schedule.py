@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for precompiled timing schedules
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.speech_types import SpeechConfig, SpeechType, TimerColor
+from src.timing_schedule import TimingEventType, TimingSchedule, get_schedule
+
+
+def _linear_color(config, elapsed):
+    """The color by scanning the configured timings, as the timer did before schedules"""
+    color = TimerColor.BLANK
+    for timing_seconds, timing_color in config['timings']:
+        if elapsed >= timing_seconds:
+            color = timing_color
+    return color
+
+
+def test_timing_schedule():
+    """Colors and events change exactly on their scheduled seconds"""
+    print("Testing Timing Schedules")
+    print("=" * 50)
+
+    # Test 1: colors change on the second, not before
+    print("\n1. Colors at the boundaries...")
+    schedule = get_schedule(SpeechType.PREPARED)
+    expected = {0: TimerColor.BLANK, 299: TimerColor.BLANK, 299.999: TimerColor.BLANK,
+                300: TimerColor.GREEN, 359.5: TimerColor.GREEN, 360: TimerColor.YELLOW,
+                419: TimerColor.YELLOW, 420: TimerColor.RED, 10 ** 6: TimerColor.RED,
+                -1: TimerColor.BLANK}
+    for elapsed, color in expected.items():
+        assert schedule.color_at(elapsed) == color, (elapsed, schedule.color_at(elapsed))
+    print("Blank until 300 s, green, yellow at 360 s, red from 420 s")
+
+    # Test 2: events are reached on their second, grace events after the red color event
+    print("\n2. Events reached at the boundaries...")
+    assert [(event.at, event.event_type) for event in schedule.events] == [
+        (300, TimingEventType.GREEN), (360, TimingEventType.YELLOW), (420, TimingEventType.RED),
+        (420, TimingEventType.GRACE_START), (450, TimingEventType.GRACE_END),
+        (450, TimingEventType.DISQUALIFY)]
+    reached = {0: 0, 299: 0, 300: 1, 359: 1, 360: 2, 419.9: 2, 420: 4, 449: 4, 450: 6, 5000: 6}
+    for elapsed, count in reached.items():
+        assert schedule.events_reached(elapsed) == count, (elapsed, schedule.events_reached(elapsed))
+    assert schedule.next_event_time(0) == 300 and schedule.next_event_time(300) == 360
+    assert schedule.next_event_time(419) == 420 and schedule.next_event_time(420) == 450
+    assert schedule.next_event_time(450) is None
+    print("Events counted on their scheduled seconds")
+
+    # Test 3: a speech type without a grace period has only color events
+    print("\n3. No grace period...")
+    table_topic = get_schedule(SpeechType.TABLE_TOPIC)
+    assert [event.event_type for event in table_topic.events] == [
+        TimingEventType.GREEN, TimingEventType.YELLOW, TimingEventType.RED]
+    assert table_topic.grace_end_time == 0 and table_topic.events_reached(table_topic.red_time) == 3
+    assert table_topic.next_event_time(table_topic.red_time) is None
+    print("Color events only")
+
+    # Test 4: the binary search agrees with a linear scan of every configured type
+    print("\n4. Comparing with a linear scan...")
+    for speech_type, config in SpeechConfig.SPEECH_CONFIGS.items():
+        schedule = get_schedule(speech_type)
+        for elapsed in range(max(schedule.grace_end_time, schedule.red_time) + 5):
+            assert schedule.color_at(elapsed) == _linear_color(config, elapsed), (speech_type, elapsed)
+    print(f"{len(SpeechConfig.SPEECH_CONFIGS)} speech types agree second by second")
+
+    # Test 5: unsorted, empty and unknown schedules
+    print("\n5. Unusual configurations...")
+    unsorted = TimingSchedule(SpeechType.TEST, {
+        "timings": [(20, TimerColor.RED), (5, TimerColor.GREEN), (10, TimerColor.YELLOW)]})
+    assert unsorted.red_time == 20 and unsorted.color_at(9) == TimerColor.GREEN
+    empty = TimingSchedule(SpeechType.TEST, {})
+    assert empty.events == () and empty.color_at(100) == TimerColor.BLANK
+    assert empty.events_reached(100) == 0 and empty.next_event_time(0) is None
+    assert get_schedule("not a speech type").events == ()
+    print("Timings sorted; empty schedules stay blank")
+
+    print("\n✅ Timing schedule tests completed successfully!")
+
+
+if __name__ == "__main__":
+    try:
+        test_timing_schedule()
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        sys.exit(1)